@@ -1,30 +1,32 @@
 import os
-import PyPDF2
-import re
+import sys
 import shutil
 
+# Permite importar o pacote compartilhado "leitor" que fica na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leitor.cache import CacheExtracao
+from leitor.extracao import extract_cnpjs, extrair_dados, iterar_cnpjs
+
+# Cache de extração compartilhado com os outros scripts: PDFs já lidos não são processados de novo
+cache = CacheExtracao()
+
 def extract_all_cnpjs(text):
-    cnpj_pattern = re.compile(r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}')
-    return cnpj_pattern.findall(text)
+    return extract_cnpjs(text)
 
 def process_pdf(file_path):
-    with open(file_path, "rb") as pdf_file:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        all_text = ""
-        
-        for page in pdf_reader.pages:
-            all_text += page.extract_text() + " "
+    paginas = extrair_dados(file_path, cache)['paginas']
+    # Percorre as páginas uma a uma (cada página seguida de um espaço), sem concatenar o texto todo
+    cnpjs = iterar_cnpjs(pagina + " " for pagina in paginas)
+    
+    unique_cnpjs = []
+    seen = set()
+    for cnpj in cnpjs:
+        if cnpj not in seen:
+            seen.add(cnpj)
+            unique_cnpjs.append(cnpj)
             
-        cnpjs = extract_all_cnpjs(all_text)
-        
-        unique_cnpjs = []
-        seen = set()
-        for cnpj in cnpjs:
-            if cnpj not in seen:
-                seen.add(cnpj)
-                unique_cnpjs.append(cnpj)
-                
-        return unique_cnpjs
+    return unique_cnpjs
 
 print("Processando primeiro arquivo...")
 arquivo1 = "06-05-2025_-_SINGULAR_FACILITIES_SERVICE_S.A_-_ROOFTOP_CANUTO_1000_-_10325325.pdf"
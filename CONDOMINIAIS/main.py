@@ -1,165 +1,536 @@
+import argparse
+import csv
 import os
-import PyPDF2
-import re
-import shutil
+import sys
+from collections import Counter, defaultdict
+from functools import partial
+from typing import NamedTuple, Optional
 from tqdm import tqdm
 from colorama import init, Fore, Style
 
+# Permite importar o pacote compartilhado "leitor" que fica na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leitor.cache import CACHE_PADRAO, cache_do_processo
+from leitor.cnpj import INVALIDO, chave as chave_cnpj, pasta as pasta_cnpj
+from leitor.colocacao import MODO_PADRAO, MODOS, Colocador
+from leitor.duplicados import ACOES, ColocadorDuplicatas, detectar, escrever_relatorio, mapa_originais
+from leitor.diario import DIARIO_PADRAO, ColocadorDiario, Diario
+from leitor.distribuido import LOTE_PADRAO, PRAZO_PADRAO, FilaCompartilhada
+from leitor.documentos import Documento, TabelaDocumentos, agrupar_por_segundo_cnpj, documento_de_dict, status_de
+from leitor.empacotamento import FORMATOS, ColocadorPacotes
+from leitor.extracao import MEMORIA_PADRAO_MB, n_esimo_cnpj, normalizar_workers, resumir_pdfs, resumir_pedido
+from leitor.fluxo import ColocacaoEmFundo, em_segundo_plano, mapear_em_processos
+from leitor.lote import THREADS_PADRAO
+from leitor.manifesto import MANIFESTO_PADRAO, ColocadorIncremental, Manifesto
+from leitor.metricas import LENTOS_PADRAO, METRICAS
+from leitor.pacotes import existe, listar_pdfs, tamanho
+from leitor.pareamento import parear
+from leitor.perfil import Perfilador
+from leitor import resultados as res
+
 # Inicializa o colorama para suporte a cores no terminal
 init()
 
-def extract_cnpjs(text):
-    """Extrai todos os CNPJs de um texto"""
-    pattern = re.compile(r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}')
-    return pattern.findall(text)
+def get_second_cnpj(pdf_path, cache=None):
+    """Obtém o segundo CNPJ encontrado no arquivo PDF ou None se não houver
 
-def get_second_cnpj(pdf_path):
-    """Obtém o segundo CNPJ encontrado no arquivo PDF ou None se não houver"""
+    As páginas são lidas em sequência e a leitura para assim que o segundo CNPJ aparece.
+    """
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ''.join([page.extract_text() or '' for page in reader.pages])
-            cnpjs = extract_cnpjs(text)
-            return cnpjs[1] if len(cnpjs) > 1 else None
+        return n_esimo_cnpj(pdf_path, 2, cache)
     except Exception as e:
+        METRICAS.contar('erros')
         print(f"\nErro ao processar '{pdf_path}': {str(e)}")
         return None
 
-def get_third_cnpj(pdf_path):
-    """Obtém o terceiro CNPJ encontrado no arquivo PDF ou None se não houver"""
-    try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ''.join([page.extract_text() or '' for page in reader.pages])
-            cnpjs = extract_cnpjs(text)
-            return cnpjs[2] if len(cnpjs) > 2 else None
-    except Exception as e:
-        print(f"\nErro ao processar '{pdf_path}': {str(e)}")
-        return None
+def scan_documents(folder_path, file_type, workers=1, cache_path=None, limite_cnpjs=2, manifesto=None,
+                   duplicados=None):
+    """Lê cada PDF da pasta uma única vez e retorna a lista de registros (Documento) da execução
 
-def process_files(folder_path, file_type):
-    """Processa todos os arquivos PDF de uma pasta e retorna dicionário {cnpj: [arquivos]}"""
-    cnpj_dict = {}
-    pdf_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.pdf')]
-    
-    with tqdm(pdf_files, desc=f"{Fore.GREEN}Processando {file_type}{Style.RESET_ALL}", unit="arquivo") as pbar:
-        for filename in pbar:
-            filepath = os.path.join(folder_path, filename)
-            try:
-                cnpj = get_second_cnpj(filepath)
-                if cnpj:
-                    if cnpj not in cnpj_dict:
-                        cnpj_dict[cnpj] = []
-                    cnpj_dict[cnpj].append(filename)
-                else:
-                    print(f"\nAviso: {file_type} '{filename}' não contém um segundo CNPJ válido")
-            except Exception as e:
-                print(f'\nErro ao processar {filename}: {str(e)}')
+    Com workers > 1 a leitura dos PDFs é feita em paralelo por processos; a ordem dos
+    registros é sempre a mesma do processamento sequencial. Com cache_path, PDFs já
+    lidos em execuções anteriores (mesmo conteúdo) não são processados de novo.
+    Por padrão a leitura de cada PDF para no segundo CNPJ, o único usado na organização;
+    limite_cnpjs=None lê o documento inteiro (necessário para o pareamento exato).
+    Com um manifesto (modo incremental), arquivos inalterados desde a execução anterior
+    reaproveitam o registro gravado e só os novos ou alterados são lidos.
+    duplicados ({duplicata: original}) lista arquivos que não são lidos: o registro do
+    original da mesma pasta é reaproveitado com o nome da duplicata.
+    """
+    documentos = []
+    with METRICAS.etapa('listagem'):
+        listagem = listar_pdfs(folder_path)
+    pdf_files = [nome for nome, _ in listagem]
+    filepaths = [caminho for _, caminho in listagem]
+    
+    duplicados = duplicados or {}
+    reaproveitados = {}
+    if manifesto is not None:
+        for filepath in filepaths:
+            if manifesto.alterado(filepath):
+                continue
+            registro = manifesto.registro(filepath)
+            if 'documento' in registro and (registro.get('leitura_completa') or limite_cnpjs is not None):
+                reaproveitados[filepath] = documento_de_dict(registro['documento'])
+    a_ler = [filepath for filepath in filepaths
+             if filepath not in reaproveitados and os.path.abspath(filepath) not in duplicados]
+    por_caminho = {}
+    pendentes = []
+    resumos = resumir_pdfs(a_ler, workers, cache_path, limite_cnpjs)
     
-    return cnpj_dict
+    with tqdm(zip(pdf_files, filepaths), total=len(pdf_files),
+              desc=f"{Fore.GREEN}Processando {file_type}{Style.RESET_ALL}", unit="arquivo") as pbar:
+        for filename, filepath in pbar:
+            doc = reaproveitados.get(filepath)
+            if doc is None and os.path.abspath(filepath) in duplicados:
+                # Preenchido no fim, quando o registro do original já existe
+                pendentes.append((len(documentos), filepath, filename))
+                documentos.append(None)
+                continue
+            if doc is None:
+                resumo = next(resumos)
+                METRICAS.registrar_arquivo(filepath, resumo.segundos, resumo.cpu_segundos, resumo.tempos)
+                METRICAS.contar(f'leitura_{resumo.leitura}')
+                if resumo.erro:
+                    METRICAS.contar('erros')
+                    print(f"\nErro ao processar '{filepath}': {resumo.erro}")
+                doc = Documento(filepath, filename, tamanho(filepath), resumo.cnpjs,
+                                status_de(resumo.cnpjs, resumo.erro), resumo.erro,
+                                resumo.valores, resumo.linhas_digitaveis)
+                if manifesto is not None:
+                    manifesto.atualizar(filepath, documento=doc._asdict(), leitura_completa=limite_cnpjs is None)
+            if chave_cnpj(doc.segundo_cnpj) == INVALIDO:
+                print(f"\nAviso: {file_type} '{filename}' não contém um segundo CNPJ válido")
+            documentos.append(doc)
+            por_caminho[os.path.abspath(filepath)] = doc
+    # Termina o gerador (encerra o pool de processos e poda o cache)
+    for _ in resumos:
+        pass
+    for posicao, filepath, filename in pendentes:
+        original = por_caminho[duplicados[os.path.abspath(filepath)]]
+        documentos[posicao] = original._replace(caminho=filepath, nome=filename)
+    
+    return documentos
+
+def process_files(folder_path, file_type, workers=1, cache_path=None):
+    """Processa todos os arquivos PDF de uma pasta e retorna dicionário {chave do CNPJ: [arquivos]}"""
+    return agrupar_por_segundo_cnpj(scan_documents(folder_path, file_type, workers, cache_path))
 
-def organize_files_by_second_cnpj(boletos_dict, nfs_dict, output_folder, boletos_dir, nfs_dir):
-    """Organiza boletos e notas fiscais nas pastas conforme os requisitos"""
+def organize_files_by_second_cnpj(boletos_dict, nfs_dict, output_folder, boletos_dir, nfs_dir, nfs_without_cnpj=(),
+                                  colocador=None, origens=None, criar_pastas=True):
+    """Organiza boletos e notas fiscais nas pastas conforme os requisitos
+
+    boletos_dict e nfs_dict vêm de agrupar_por_segundo_cnpj ({chave inteira do CNPJ:
+    [arquivos]}, ver leitor.cnpj). nfs_without_cnpj são os nomes das NFs sem segundo CNPJ
+    válido, já conhecidos pela leitura feita em scan_documents (os PDFs não são lidos
+    novamente aqui). O colocador define
+    se os arquivos são copiados, ligados (hardlink/reflink/symlink) ou movidos.
+    origens ({pasta: {nome: caminho}}) dá o caminho dos PDFs que não estão soltos na
+    pasta, como os membros de pacotes ZIP/TAR. Com criar_pastas=False as pastas não são
+    criadas (o colocador grava cada pasta como um pacote, ver leitor.empacotamento).
+    """
+    if colocador is None:
+        colocador = Colocador()
+    origens = origens or {}
+    
+    def source(folder, name):
+        return origens.get(folder, {}).get(name) or os.path.join(folder, name)
     os.makedirs(output_folder, exist_ok=True)
     
     # Processar CNPJs com boletos e NFs correspondentes
     common_cnpjs = set(boletos_dict.keys()) & set(nfs_dict.keys())
     with tqdm(common_cnpjs, desc=f"{Fore.YELLOW}Arquivos com boletos correspondentes{Style.RESET_ALL}", unit="CNPJ") as pbar:
         for cnpj in pbar:
-            folder_name = cnpj.replace('.', '').replace('/', '').replace('-', '')
-            folder_path = os.path.join(output_folder, folder_name)
-            os.makedirs(folder_path, exist_ok=True)
+            folder_path = os.path.join(output_folder, pasta_cnpj(cnpj))
+            if criar_pastas:
+                with METRICAS.etapa('mkdir'):
+                    os.makedirs(folder_path, exist_ok=True)
             
             for boleto in boletos_dict[cnpj]:
-                src_path = os.path.join(boletos_dir, boleto)
+                src_path = source(boletos_dir, boleto)
                 dst_path = os.path.join(folder_path, boleto)
-                if os.path.exists(src_path):
-                    shutil.copy2(src_path, dst_path)
+                if existe(src_path):
+                    with METRICAS.etapa('colocacao'):
+                        colocador.colocar(src_path, dst_path)
                 else:
+                    METRICAS.contar('arquivos_nao_encontrados')
                     print(f"\nAviso: Boleto '{src_path}' não encontrado. Pulando...")
             
             for nf in nfs_dict[cnpj]:
-                src_path = os.path.join(nfs_dir, nf)
+                src_path = source(nfs_dir, nf)
                 dst_path = os.path.join(folder_path, nf)
-                if os.path.exists(src_path):
-                    shutil.copy2(src_path, dst_path)
+                if existe(src_path):
+                    with METRICAS.etapa('colocacao'):
+                        colocador.colocar(src_path, dst_path)
                 else:
+                    METRICAS.contar('arquivos_nao_encontrados')
                     print(f"\nAviso: NF '{src_path}' não encontrado. Pulando...")
     
     # Processar NFs sem boletos correspondentes
     nfs_only_cnpjs = set(nfs_dict.keys()) - set(boletos_dict.keys())
     with tqdm(nfs_only_cnpjs, desc=f"{Fore.BLUE}NFs sem boletos correspondentes{Style.RESET_ALL}", unit="CNPJ") as pbar:
         for cnpj in pbar:
-            if cnpj:  # Ignora None
-                folder_name = f"NF_{cnpj.replace('.', '').replace('/', '').replace('-', '')}"
-                folder_path = os.path.join(output_folder, folder_name)
-                os.makedirs(folder_path, exist_ok=True)
-                
-                for nf in nfs_dict[cnpj]:
-                    src_path = os.path.join(nfs_dir, nf)
-                    dst_path = os.path.join(folder_path, nf)
-                    if os.path.exists(src_path):
-                        shutil.copy2(src_path, dst_path)
-                    else:
-                        print(f"\nAviso: NF '{src_path}' não encontrado. Pulando...")
+            folder_path = os.path.join(output_folder, f"NF_{pasta_cnpj(cnpj)}")
+            if criar_pastas:
+                with METRICAS.etapa('mkdir'):
+                    os.makedirs(folder_path, exist_ok=True)
+            
+            for nf in nfs_dict[cnpj]:
+                src_path = source(nfs_dir, nf)
+                dst_path = os.path.join(folder_path, nf)
+                if existe(src_path):
+                    with METRICAS.etapa('colocacao'):
+                        colocador.colocar(src_path, dst_path)
+                else:
+                    METRICAS.contar('arquivos_nao_encontrados')
+                    print(f"\nAviso: NF '{src_path}' não encontrado. Pulando...")
     
     # Processar NFs sem CNPJ identificável
-    nfs_without_cnpj = []
-    for nf_list in nfs_dict.values():
-        for nf in nf_list:
-            filepath = os.path.join(nfs_dir, nf)
-            if get_second_cnpj(filepath) is None:
-                nfs_without_cnpj.append(nf)
-    
     if nfs_without_cnpj:
         folder_path = os.path.join(output_folder, "NFs_SEM_CNPJ_IDENTIFICADO")
-        os.makedirs(folder_path, exist_ok=True)
+        if criar_pastas:
+            with METRICAS.etapa('mkdir'):
+                os.makedirs(folder_path, exist_ok=True)
         print("\nOrganizando NFs sem CNPJ identificável...")
         for nf in nfs_without_cnpj:
-            src_path = os.path.join(nfs_dir, nf)
+            src_path = source(nfs_dir, nf)
             dst_path = os.path.join(folder_path, nf)
-            if os.path.exists(src_path):
-                shutil.copy2(src_path, dst_path)
+            if existe(src_path):
+                with METRICAS.etapa('colocacao'):
+                    colocador.colocar(src_path, dst_path)
             else:
+                METRICAS.contar('arquivos_nao_encontrados')
                 print(f"\nAviso: NF '{src_path}' não encontrado. Pulando...")
 
-def organize_files_by_third_cnpj(current_dir, exclude_folders=None):
-    """Organiza PDFs no diretório atual em subpastas baseadas no terceiro CNPJ"""
-    if exclude_folders is None:
-        exclude_folders = set()
-    
-    # Lista de arquivos PDF no diretório atual, excluindo os das pastas BOLETOS, NOTA_FISCAL e ORGANIZADOS
-    pdf_files = [
-        f for f in os.listdir(current_dir) 
-        if f.lower().endswith('.pdf') and f not in exclude_folders
-        and not os.path.isdir(os.path.join(current_dir, f))
-    ]
-    
-    if not pdf_files:
-        print(f"\n{Fore.CYAN}Nenhum arquivo PDF adicional encontrado no diretório atual para organizar pelo terceiro CNPJ!{Style.RESET_ALL}")
-        return
-    
-    # Processar cada PDF e organizar em subpastas
-    with tqdm(pdf_files, desc=f"{Fore.MAGENTA}Organizando PDFs pelo terceiro CNPJ{Style.RESET_ALL}", unit="arquivo") as pbar:
-        for filename in pbar:
-            filepath = os.path.join(current_dir, filename)
-            third_cnpj = get_third_cnpj(filepath)
-            
-            # Define o nome da subpasta com base no terceiro CNPJ
-            subfolder_name = third_cnpj.replace('.', '').replace('/', '').replace('-', '') if third_cnpj else "SEM_TERCER_CNPJ"
-            subfolder_path = os.path.join(current_dir, subfolder_name)
-            
-            # Cria a subpasta se não existir
-            os.makedirs(subfolder_path, exist_ok=True)
-            
-            # Move o arquivo para a subpasta correspondente
-            dest_path = os.path.join(subfolder_path, filename)
-            if os.path.exists(filepath):
-                shutil.move(filepath, dest_path)
-            else:
-                print(f"\nAviso: Arquivo '{filepath}' não encontrado. Pulando...")
+def write_pairing_report(pareamento, output_folder):
+    """Grava pareamento.csv com os pares boleto <-> NF e as pendências"""
+    os.makedirs(output_folder, exist_ok=True)
+    csv_path = os.path.join(output_folder, "pareamento.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["situacao", "boleto", "nf", "cnpj", "valor", "vencimento", "nosso_numero"])
+        for par in pareamento.pares:
+            valor = f"{par.valor_centavos // 100},{par.valor_centavos % 100:02d}"
+            vencimento = par.vencimento.strftime("%d/%m/%Y") if par.vencimento else ""
+            writer.writerow(["pareado", par.boleto, par.nf, par.cnpj, valor, vencimento, par.nosso_numero or ""])
+        for boleto in pareamento.ambiguos:
+            writer.writerow(["ambiguo", boleto, "", "", "", "", ""])
+        for boleto in pareamento.boletos_sem_nf:
+            writer.writerow(["boleto_sem_nf", boleto, "", "", "", "", ""])
+        for nf in pareamento.nfs_sem_boleto:
+            writer.writerow(["nf_sem_boleto", "", nf, "", "", "", ""])
+    return csv_path
+
+class PipelineItem(NamedTuple):
+    """PDF listado pela etapa de varredura do pipeline"""
+    kind: str                   # "boleto", "nf" ou "avulso" (organizado pelo terceiro CNPJ)
+    path: str
+    name: str
+    limite_cnpjs: Optional[int]
+    doc: Optional[Documento]    # registro reaproveitado do manifesto (não é lido de novo)
+    duplicate: bool             # cópia idêntica de outro PDF (não é lida)
+
+def scan_pipeline_items(boletos_dir, nfs_dir, loose_dir=None, exclude_folders=(), limite_cnpjs=2, manifesto=None,
+                        duplicados=None, diario=None):
+    """Etapa de varredura: boletos, depois NFs, depois PDFs avulsos, um item por PDF
+
+    Os nomes de cada pasta são lidos de uma vez (só os nomes): percorrer a pasta com
+    os.scandir enquanto os arquivos são movidos para fora dela pode pular ou repetir entradas.
+    Boletos e NFs dentro de pacotes ZIP/TAR entram como membros (leitor.pacotes), sem
+    serem descompactados.
+    Com um diario retomado, os PDFs lidos antes da interrupção reaproveitam o registro.
+    """
+    duplicados = duplicados or {}
+
+    def retomado(path, limite):
+        documento = diario.documento(path, limite) if diario is not None else None
+        if documento is None:
+            return None
+        METRICAS.contar('retomados_leitura')
+        return documento_de_dict(documento)
+
+    for kind, folder in (("boleto", boletos_dir), ("nf", nfs_dir)):
+        if folder is None:
+            continue
+        with METRICAS.etapa('listagem'):
+            listagem = listar_pdfs(folder)
+        for name, path in listagem:
+            doc = None
+            if manifesto is not None and not manifesto.alterado(path):
+                registro = manifesto.registro(path)
+                if 'documento' in registro and (registro.get('leitura_completa') or limite_cnpjs is not None):
+                    doc = documento_de_dict(registro['documento'])
+            if doc is None:
+                doc = retomado(path, limite_cnpjs)
+            yield PipelineItem(kind, path, name, limite_cnpjs, doc, os.path.abspath(path) in duplicados)
+    if loose_dir is not None:
+        with METRICAS.etapa('listagem'):
+            names = [f for f in os.listdir(loose_dir)
+                     if f.lower().endswith('.pdf') and f not in exclude_folders
+                     and not os.path.isdir(os.path.join(loose_dir, f))]
+        for name in names:
+            path = os.path.join(loose_dir, name)
+            yield PipelineItem("avulso", path, name, 3, retomado(path, 3), False)
+
+def organize_pipeline(boletos_dir, nfs_dir, output_folder, loose_dir=None, exclude_folders=(), workers=1,
+                      cache_path=None, limite_cnpjs=2, colocador=None, manifesto=None, duplicados=None,
+                      skip_duplicates=False, keep_documents=False, threads=THREADS_PADRAO, memoria_mb=None,
+                      diario=None, criar_pastas=True):
+    """Organiza tudo em fluxo: varredura -> extração -> classificação -> colocação -> relatório
+
+    A varredura roda numa thread, a extração em processos (workers) e a colocação num pool
+    de threads; as etapas se comunicam por filas limitadas, então a cópia começa enquanto
+    os PDFs ainda estão sendo lidos e a memória não cresce com a quantidade de arquivos.
+    Os boletos vêm antes das NFs: quando uma NF é classificada, já se sabe se o CNPJ dela
+    tem boletos, e a pasta final (CNPJ ou NF_CNPJ) é decidida na hora. Dos boletos só
+    ficam em memória os nomes dos que ainda esperam uma NF do mesmo CNPJ.
+
+    memoria_mb é o teto de memória de cada PDF na leitura (padrão: LEITOR_MEMORIA_MB).
+    Com um diario, cada leitura e cada movimentação de PDF avulso ficam anotadas nele
+    (a colocação de boletos e NFs é anotada por quem montou o colocador).
+    Com criar_pastas=False as pastas de boletos e NFs não são criadas: o colocador grava
+    cada uma como um pacote (leitor.empacotamento).
 
-def main():
+    Retorna as contagens usadas no relatório e, em "relatorio", os resultados por pasta e
+    as pendências (leitor.resultados); com keep_documents, também os registros de boletos
+    e NFs (necessários para o pareamento).
+    """
+    duplicados = duplicados or {}
+    originais = set(duplicados.values())
+    colocacao = ColocacaoEmFundo(colocador or Colocador(), threads)
+    movimentacao = None
+    if loose_dir is not None:
+        movedor = Colocador('mover')
+        movimentacao = ColocacaoEmFundo(ColocadorDiario(movedor, diario) if diario is not None else movedor, threads)
+
+    boletos_por_cnpj = defaultdict(list)   # (caminho, nome) dos boletos que esperam uma NF do mesmo CNPJ
+    comuns, apenas_nfs = set(), set()      # chaves inteiras dos CNPJs (leitor.cnpj)
+    nfs_sem_cnpj = 0
+    terceiro_cnpj = Counter()
+    relatorio = res.Resultados()
+    documentos = {"boleto": [], "nf": []}
+    caminhos = []
+    docs_originais = {}                    # registros dos originais de duplicatas
+    aguardando = defaultdict(list)         # duplicatas cujo original ainda não foi lido
+    pastas_criadas = set()
+
+    def ensure_folder(folder_path):
+        if folder_path not in pastas_criadas:
+            with METRICAS.etapa('mkdir'):
+                os.makedirs(folder_path, exist_ok=True)
+            pastas_criadas.add(folder_path)
+
+    def place(src_path, folder_path, name):
+        if criar_pastas:
+            ensure_folder(folder_path)
+        colocacao.colocar(src_path, os.path.join(folder_path, name))
+
+    def classify(kind, doc):
+        nonlocal nfs_sem_cnpj
+        if keep_documents:
+            documentos[kind].append(doc)
+        if manifesto is not None:
+            caminhos.append(doc.caminho)
+        cnpj = chave_cnpj(doc.segundo_cnpj)
+        if cnpj == INVALIDO:
+            tipo = "boleto" if kind == "boleto" else "nota fiscal"
+            print(f"\nAviso: {tipo} '{doc.nome}' não contém um segundo CNPJ válido")
+            relatorio.pendente(kind, doc.nome, res.ERRO_LEITURA if doc.erro else
+                               res.SEM_SEGUNDO_CNPJ if doc.segundo_cnpj is None else res.CNPJ_INVALIDO)
+        if kind == "boleto":
+            if cnpj != INVALIDO:
+                boletos_por_cnpj[cnpj].append((doc.caminho, doc.nome))
+            return
+        if cnpj == INVALIDO:
+            nfs_sem_cnpj += 1
+            relatorio.colocado("NFs_SEM_CNPJ_IDENTIFICADO", res.SEM_CNPJ, 'nfs')
+            place(doc.caminho, os.path.join(output_folder, "NFs_SEM_CNPJ_IDENTIFICADO"), doc.nome)
+            return
+        digits = pasta_cnpj(cnpj)
+        if cnpj in comuns or cnpj in boletos_por_cnpj:
+            folder_path = os.path.join(output_folder, digits)
+            if cnpj not in comuns:
+                # Primeira NF do CNPJ: os boletos que esperavam por ela vão junto
+                comuns.add(cnpj)
+                boletos = boletos_por_cnpj.pop(cnpj)
+                relatorio.colocado(digits, res.CNPJ, 'boletos', len(boletos))
+                for boleto_path, boleto in boletos:
+                    place(boleto_path, folder_path, boleto)
+            relatorio.colocado(digits, res.CNPJ, 'nfs')
+        else:
+            apenas_nfs.add(cnpj)
+            folder_path = os.path.join(output_folder, f"NF_{digits}")
+            relatorio.colocado(f"NF_{digits}", res.APENAS_NF, 'nfs')
+        place(doc.caminho, folder_path, doc.nome)
+
+    def place_loose(item, resumo):
+        if item.doc is not None:
+            cnpjs = item.doc.cnpjs
+        else:
+            METRICAS.registrar_arquivo(item.path, resumo.segundos, resumo.cpu_segundos, resumo.tempos,
+                                       etapa='terceiro_cnpj')
+            METRICAS.contar(f'leitura_{resumo.leitura}')
+            if resumo.erro:
+                METRICAS.contar('erros')
+                print(f"\nErro ao processar '{item.path}': {resumo.erro}")
+            cnpjs = resumo.cnpjs
+            if diario is not None:
+                doc = Documento(item.path, item.name, os.path.getsize(item.path), resumo.cnpjs,
+                                status_de(resumo.cnpjs, resumo.erro), resumo.erro)
+                diario.lido(item.path, doc._asdict(), item.limite_cnpjs)
+        third_cnpj = chave_cnpj(cnpjs[2] if len(cnpjs) >= 3 else None)
+        subfolder_name = pasta_cnpj(third_cnpj) if third_cnpj != INVALIDO else "SEM_TERCER_CNPJ"
+        subfolder_path = os.path.join(loose_dir, subfolder_name)
+        ensure_folder(subfolder_path)
+        movimentacao.colocar(item.path, os.path.join(subfolder_path, item.name))
+        terceiro_cnpj[subfolder_name] += 1
+        relatorio.colocado(subfolder_name, res.TERCEIRO_CNPJ, 'avulsos')
+        if third_cnpj == INVALIDO:
+            relatorio.pendente("avulso", item.name, res.ERRO_LEITURA if resumo is not None and resumo.erro
+                               else res.SEM_TERCEIRO_CNPJ)
+
+    os.makedirs(output_folder, exist_ok=True)
+    itens = em_segundo_plano(scan_pipeline_items(boletos_dir, nfs_dir, loose_dir, exclude_folders, limite_cnpjs,
+                                                 manifesto, duplicados, diario), nome='varredura')
+    resumos = mapear_em_processos(partial(resumir_pedido, cache_path=cache_path, memoria_mb=memoria_mb), itens, workers,
+                                  pular=lambda item: item.doc is not None or item.duplicate,
+                                  entrada=lambda item: (item.path, item.limite_cnpjs))
+    with tqdm(resumos, desc=f"{Fore.GREEN}Processando PDFs{Style.RESET_ALL}", unit="arquivo") as pbar:
+        for item, resumo in pbar:
+            if item.kind == "avulso":
+                place_loose(item, resumo)
+                continue
+            caminho = os.path.abspath(item.path)
+            if item.duplicate:
+                if skip_duplicates:
+                    continue
+                original = docs_originais.get(duplicados[caminho])
+                if original is None:
+                    aguardando[duplicados[caminho]].append(item)
+                else:
+                    classify(item.kind, original._replace(caminho=item.path, nome=item.name))
+                continue
+            doc = item.doc
+            if doc is None:
+                METRICAS.registrar_arquivo(item.path, resumo.segundos, resumo.cpu_segundos, resumo.tempos)
+                METRICAS.contar(f'leitura_{resumo.leitura}')
+                if resumo.erro:
+                    METRICAS.contar('erros')
+                    print(f"\nErro ao processar '{item.path}': {resumo.erro}")
+                doc = Documento(item.path, item.name, tamanho(item.path), resumo.cnpjs,
+                                status_de(resumo.cnpjs, resumo.erro), resumo.erro,
+                                resumo.valores, resumo.linhas_digitaveis)
+                if manifesto is not None:
+                    manifesto.atualizar(item.path, documento=doc._asdict(), leitura_completa=limite_cnpjs is None)
+                if diario is not None:
+                    diario.lido(item.path, doc._asdict(), limite_cnpjs)
+            classify(item.kind, doc)
+            if caminho in originais:
+                docs_originais[caminho] = doc
+                for duplicata in aguardando.pop(caminho, ()):
+                    classify(duplicata.kind, doc._replace(caminho=duplicata.path, nome=duplicata.name))
+    if cache_path:
+        cache_do_processo(cache_path).podar()
+    for boletos in boletos_por_cnpj.values():
+        for _, boleto in boletos:
+            relatorio.pendente("boleto", boleto, res.BOLETO_SEM_NF)
+
+    resultado = {
+        "com_boletos": len(comuns),
+        "apenas_nfs": len(apenas_nfs),
+        "nfs_sem_cnpj": nfs_sem_cnpj,
+        "boletos_sem_nf": sum(len(nomes) for nomes in boletos_por_cnpj.values()),
+        "terceiro_cnpj": dict(terceiro_cnpj),
+        "colocacao": colocacao.concluir(),
+        "movimentacao": movimentacao.concluir() if movimentacao is not None else None,
+        "boletos": documentos["boleto"],
+        "nfs": documentos["nf"],
+        "caminhos": caminhos,
+        "relatorio": relatorio,
+    }
+    for resumo in (resultado["colocacao"], resultado["movimentacao"]):
+        if resumo is not None:
+            METRICAS.contar('colocacao_retentativas', resumo.retentativas)
+            METRICAS.contar('erros', len(resumo.falhas))
+            for origem, erro in resumo.falhas:
+                print(f"\nErro ao colocar '{origem}': {erro}")
+                relatorio.pendente("colocacao", os.path.basename(origem), res.FALHA_COLOCACAO)
+    return resultado
+
+def main(argv=None, prog=None):
+    """Executa pela linha de comando; retorna 1 se algum PDF não pôde ser lido ou colocado"""
+    parser = argparse.ArgumentParser(prog=prog, description="Organiza boletos e notas fiscais pelo CNPJ")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processos usados na leitura dos PDFs (0 = todos os núcleos; padrão: 1)")
+    parser.add_argument("--cache", default=CACHE_PADRAO,
+                        help="arquivo do cache de extração (padrão: %(default)s)")
+    parser.add_argument("--sem-cache", action="store_true",
+                        help="lê todos os PDFs sem consultar nem gravar o cache")
+    parser.add_argument("--modo", choices=MODOS, default=MODO_PADRAO,
+                        help="como colocar os arquivos em ORGANIZADOS (padrão: %(default)s); "
+                             "hardlink/reflink/symlink não duplicam os bytes e recorrem à cópia se não houver suporte")
+    parser.add_argument("--incremental", action="store_true",
+                        help="processa só os PDFs novos ou alterados desde a última execução "
+                             "(manifesto em ORGANIZADOS/" + MANIFESTO_PADRAO + ")")
+    parser.add_argument("--duplicados", choices=ACOES, default="manter",
+                        help="PDFs idênticos (mesmo conteúdo com outro nome) não são lidos de novo; "
+                             "pular = não são colocados, linkar = entram como hardlink do arquivo de "
+                             "entrada (o mesmo arquivo em disco: editar um altera o outro) "
+                             "(relatório em ORGANIZADOS/duplicados.csv; padrão: %(default)s)")
+    parser.add_argument("--duplicados-texto", action="store_true",
+                        help="com --duplicados, considera duplicatas também os PDFs com o mesmo texto")
+    parser.add_argument("--metricas", metavar="ARQUIVO",
+                        help="grava as métricas da execução em JSON (ou no formato do Prometheus se "
+                             "ARQUIVO terminar em .prom)")
+    parser.add_argument("--lentos", type=int, default=LENTOS_PADRAO,
+                        help="quantos PDFs mais lentos listar no relatório (padrão: %(default)s; 0 = nenhum)")
+    parser.add_argument("--perfil", "--profile", nargs="?", const="perfil", metavar="PREFIXO",
+                        help="grava o perfil da execução: PREFIXO.pstats (cProfile), PREFIXO.collapsed "
+                             "(pilhas para flamegraph) e PREFIXO.alocacoes.txt (tracemalloc); padrão: perfil")
+    parser.add_argument("--threads", type=int, default=THREADS_PADRAO,
+                        help="colocações simultâneas (padrão: %(default)s)")
+    parser.add_argument("--memoria-mb", type=int, default=MEMORIA_PADRAO_MB,
+                        help="teto de memória por PDF na leitura; um PDF que passe dele é abandonado "
+                             "com erro sem afetar os outros (padrão: %(default)s; 0 = sem teto; LEITOR_MEMORIA_MB)")
+    parser.add_argument("--parear", action="store_true",
+                        help="pareia cada boleto com sua NF pela linha digitável (CNPJ + valor) "
+                             "e grava ORGANIZADOS/pareamento.csv")
+    parser.add_argument("--pacotes", choices=FORMATOS,
+                        help="grava cada pasta de ORGANIZADOS (CNPJ, NF_CNPJ, NFs_SEM_CNPJ_IDENTIFICADO) como "
+                             "um único pacote ZIP ou TAR, com um indice.json do conteúdo; --modo deixa de valer")
+    parser.add_argument("--retomar", "--resume", action="store_true",
+                        help="retoma a execução interrompida: PDFs já lidos e arquivos já colocados são pulados "
+                             "e movimentações pela metade são concluídas ou desfeitas (diário em ORGANIZADOS/"
+                             + DIARIO_PADRAO + ")")
+    parser.add_argument("--fila", metavar="DIR",
+                        help="modo distribuído: este processo é um dos trabalhadores da fila em DIR (diretório "
+                             "compartilhado entre os processos e máquinas); só boletos e NFs são organizados")
+    parser.add_argument("--lote", type=int, default=LOTE_PADRAO,
+                        help="com --fila, PDFs por lote de trabalho (padrão: %(default)s)")
+    parser.add_argument("--prazo", type=float, default=PRAZO_PADRAO,
+                        help="com --fila, segundos sem sinal de vida até o lote de um trabalhador ser "
+                             "repassado a outro (padrão: %(default)s; LEITOR_PRAZO)")
+    args = parser.parse_args(argv)
+    if args.fila and (args.incremental or args.parear or args.duplicados != "manter"):
+        parser.error("--fila não pode ser usado com --incremental, --parear ou --duplicados")
+    if args.pacotes and (args.incremental or args.duplicados == "linkar"):
+        parser.error("--pacotes não pode ser usado com --incremental nem com --duplicados linkar")
+    executar = run_shared_queue if args.fila else run
+    # METRICAS é do processo: só contam os erros desta execução
+    erros = METRICAS.contadores['erros']
+    if args.perfil:
+        with Perfilador(args.perfil):
+            executar(args)
+    else:
+        executar(args)
+    return 1 if METRICAS.contadores['erros'] > erros else 0
+
+def run(args):
+    """Executa a organização com as opções da linha de comando"""
+    workers = normalizar_workers(args.workers)
+    cache_path = None if args.sem_cache else args.cache
+    
     # Diretório onde o script está localizado
     current_dir = os.path.dirname(os.path.abspath(__file__))
     
@@ -175,15 +546,65 @@ def main():
     elif not os.path.exists(NFS_DIR):
         print(f"Aviso: Pasta '{NFS_DIR}' não encontrada! Pulando organização de boletos e NFs.")
     else:
-        print(f"\n{Fore.GREEN}Iniciando processamento de boletos e notas fiscais...{Style.RESET_ALL}")
-        boletos_dict = process_files(BOLETOS_DIR, "boletos")
-        nfs_dict = process_files(NFS_DIR, "notas fiscais")
-        organize_files_by_second_cnpj(boletos_dict, nfs_dict, OUTPUT_DIR, BOLETOS_DIR, NFS_DIR)
         boletos_nfs_processed = True
     
-    # Organizar outros PDFs no diretório atual pelo terceiro CNPJ
+    # Cada PDF é lido uma única vez; as etapas seguintes usam apenas os registros
+    limite_cnpjs = None if args.parear else 2
+    manifesto = None
+    duplicatas = []
+    empacotador = ColocadorPacotes(args.pacotes) if args.pacotes else None
+    colocador = empacotador or Colocador(args.modo)
+    falhas_pacotes = []
+    if boletos_nfs_processed:
+        print(f"\n{Fore.GREEN}Iniciando processamento de boletos e notas fiscais...{Style.RESET_ALL}")
+        manifesto = Manifesto(os.path.join(OUTPUT_DIR, MANIFESTO_PADRAO)) if args.incremental else None
+        # Duplicatas são detectadas antes de qualquer leitura de PDF ou colocação
+        if args.duplicados != "manter":
+            cache = cache_do_processo(cache_path) if args.duplicados_texto else None
+            for folder in (BOLETOS_DIR, NFS_DIR):
+                # A mesma listagem do fluxo: PDFs soltos e os de dentro de pacotes ZIP/TAR
+                pdfs = sorted(caminho for _, caminho in listar_pdfs(folder))
+                duplicatas += detectar(pdfs, args.duplicados_texto, cache)
+            duplicados_csv = escrever_relatorio(duplicatas, os.path.join(OUTPUT_DIR, "duplicados.csv"))
+    originais = mapa_originais(duplicatas)
+    if originais:
+        colocador = ColocadorDuplicatas(colocador, originais, args.duplicados)
+    if manifesto is not None:
+        colocador = ColocadorIncremental(colocador, manifesto)
+    # Diário das etapas concluídas, para --retomar caso esta execução seja interrompida
+    diario = Diario(os.path.join(OUTPUT_DIR, DIARIO_PADRAO), args.retomar)
+    colocador = ColocadorDiario(colocador, diario)
+    
+    # Boletos, NFs e os outros PDFs do diretório (terceiro CNPJ) passam pelo mesmo fluxo
     exclude_folders = {"BOLETOS", "NOTA_FISCAL", "ORGANIZADOS"}
-    organize_files_by_third_cnpj(current_dir, exclude_folders)
+    try:
+        with METRICAS.etapa('fluxo'):
+            resultado = organize_pipeline(
+                BOLETOS_DIR if boletos_nfs_processed else None, NFS_DIR if boletos_nfs_processed else None,
+                OUTPUT_DIR, current_dir, exclude_folders, workers, cache_path, limite_cnpjs, colocador, manifesto,
+                originais, args.duplicados == "pular", keep_documents=args.parear, threads=args.threads,
+                memoria_mb=args.memoria_mb, diario=diario, criar_pastas=empacotador is None)
+        if empacotador is not None:
+            with METRICAS.etapa('pacotes'):
+                resumo_pacotes, falhas_pacotes = empacotador.fechar()
+            METRICAS.contar('erros', len(falhas_pacotes))
+            for origem, erro in falhas_pacotes:
+                print(f"\nErro ao empacotar '{origem}': {erro}")
+                resultado["relatorio"].pendente("colocacao", os.path.basename(origem), res.FALHA_COLOCACAO)
+    except BaseException:
+        diario.fechar()
+        raise
+    METRICAS.incorporar('colocacao', colocador.estatisticas())
+    if manifesto is not None:
+        manifesto.remover_ausentes(resultado["caminhos"])
+        manifesto.salvar()
+    # Com colocações que falharam o diário fica, para --retomar refazer só o que faltou
+    falhas = [resumo.falhas for resumo in (resultado["colocacao"], resultado["movimentacao"]) if resumo is not None]
+    diario.fechar(concluido=not any(falhas) and not falhas_pacotes)
+    pareamento = None
+    if boletos_nfs_processed and args.parear:
+        with METRICAS.etapa('pareamento'):
+            pareamento = parear(resultado["boletos"], resultado["nfs"])
     
     # Gerar relatório
     print("\n" + "="*50)
@@ -192,24 +613,174 @@ def main():
     # Relatório para boletos e NFs
     if boletos_nfs_processed:
         print(f"\n{Fore.GREEN}Organização de Boletos e Notas Fiscais (baseada no segundo CNPJ):{Style.RESET_ALL}")
-        print(f"- Pastas com boletos e NFs: {len(set(boletos_dict.keys()) & set(nfs_dict.keys()))}")
-        print(f"- Pastas apenas com NFs: {len(set(nfs_dict.keys()) - set(boletos_dict.keys()))}")
-        print(f"- NFs sem CNPJ identificável: {len([nf for nf_list in nfs_dict.values() for nf in nf_list if get_second_cnpj(os.path.join(NFS_DIR, nf)) is None])}")
+        print(f"- Pastas com boletos e NFs: {resultado['com_boletos']}")
+        print(f"- Pastas apenas com NFs: {resultado['apenas_nfs']}")
+        print(f"- NFs sem CNPJ identificável: {resultado['nfs_sem_cnpj']}")
+        print(f"- Colocação: {resultado['colocacao'].texto()}")
+        if empacotador is not None:
+            print(f"- Pacotes ({args.pacotes}): {resumo_pacotes.texto()}")
+        if args.duplicados != "manter":
+            print(f"- PDFs duplicados ({args.duplicados}): {len(duplicatas)} (relatório em {duplicados_csv})")
+        if pareamento is not None:
+            csv_path = write_pairing_report(pareamento, OUTPUT_DIR)
+            print(f"- Boletos pareados com NF (linha digitável): {len(pareamento.pares)}")
+            print(f"- Boletos ambíguos: {len(pareamento.ambiguos)}")
+            print(f"- Boletos sem NF: {len(pareamento.boletos_sem_nf)}")
+            print(f"- NFs sem boleto: {len(pareamento.nfs_sem_boleto)}")
+            print(f"Pareamento em: {csv_path}")
         print(f"Resultado em: {OUTPUT_DIR}")
     
-    # Relatório para PDFs organizados pelo terceiro CNPJ
+    # Relatório para PDFs organizados pelo terceiro CNPJ nesta execução
     print(f"\n{Fore.MAGENTA}Organização de outros PDFs (baseada no terceiro CNPJ):{Style.RESET_ALL}")
-    subfolders = [
-        d for d in os.listdir(current_dir) 
-        if os.path.isdir(os.path.join(current_dir, d)) and d not in exclude_folders
-    ]
-    for subfolder in subfolders:
-        pdf_count = len([f for f in os.listdir(os.path.join(current_dir, subfolder)) if f.lower().endswith('.pdf')])
+    if not resultado["terceiro_cnpj"]:
+        print(f"{Fore.CYAN}Nenhum arquivo PDF adicional encontrado no diretório atual para organizar pelo terceiro CNPJ!{Style.RESET_ALL}")
+    for subfolder, pdf_count in sorted(resultado["terceiro_cnpj"].items()):
         print(f"Pasta '{subfolder}': {pdf_count} PDFs")
     
     print("\n" + "="*50)
-    print(f"Total de subpastas criadas (terceiro CNPJ): {len(subfolders)}")
+    print(f"Total de subpastas usadas (terceiro CNPJ): {len(resultado['terceiro_cnpj'])}")
     print(f"Diretório processado: {current_dir}")
+    if args.retomar:
+        print(f"Retomada: {METRICAS.contadores['retomados_leitura']} PDFs lidos e "
+              f"{colocador.retomados} colocações feitas antes da interrupção; "
+              f"{len(diario.avancados)} movimentações pela metade concluídas e {diario.desfeitos} desfeitas")
+    leituras = {nome: METRICAS.contadores[f'leitura_{nome}'] for nome in ('rapida', 'alternativa', 'pypdf2', 'cache')}
+    print(f"PDFs lidos: {leituras['rapida']} pela leitura rápida, {leituras['alternativa']} pelo PyPDF2 após "
+          f"recusa da rápida, {leituras['pypdf2']} só pelo PyPDF2, {leituras['cache']} do cache")
+    
+    # Métricas da execução
+    print("\n" + METRICAS.resumo(args.lentos))
+    if args.metricas:
+        print(f"Métricas gravadas em: {METRICAS.exportar(args.metricas)}")
+    # Relatório em CSV/JSON, só com o que foi anotado durante a execução
+    relatorio_csv, pendencias_csv, relatorio_json = resultado["relatorio"].exportar(OUTPUT_DIR, METRICAS.para_dict())
+    print(f"Relatório em: {relatorio_csv}, {pendencias_csv} e {relatorio_json}")
+
+def run_shared_queue(args):
+    """Executa como um dos trabalhadores da fila em args.fila (modo distribuído)
+
+    O primeiro trabalhador a chegar divide BOLETOS e NOTA_FISCAL em lotes; todos leem
+    lotes livres até não sobrar nenhum e um único trabalhador junta os resultados em
+    ORGANIZADOS, como organize_files_by_second_cnpj. Os lotes guardam os caminhos
+    relativos ao diretório do script, então cada máquina pode montar o compartilhamento
+    num lugar diferente.
+    """
+    workers = normalizar_workers(args.workers)
+    cache_path = None if args.sem_cache else args.cache
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    pastas = {"boleto": "BOLETOS", "nf": "NOTA_FISCAL"}
+    OUTPUT_DIR = os.path.abspath(os.path.join(current_dir, "ORGANIZADOS"))
+    for pasta in pastas.values():
+        if not os.path.exists(os.path.join(current_dir, pasta)):
+            print(f"Aviso: Pasta '{os.path.join(current_dir, pasta)}' não encontrada! Nada a organizar.")
+            return
+    
+    fila = FilaCompartilhada(args.fila, args.prazo)
+    print(f"\n{Fore.GREEN}Trabalhador {fila.dono} na fila {fila.diretorio}{Style.RESET_ALL}")
+    if fila.concluida():
+        print("A fila já foi concluída; use um diretório novo para outra execução.")
+        return
+    
+    def listar():
+        for tipo, pasta in pastas.items():
+            with METRICAS.etapa('listagem'):
+                listagem = listar_pdfs(os.path.join(current_dir, pasta))
+            for nome, caminho in listagem:
+                yield [tipo, nome, os.path.relpath(caminho, current_dir)]
+    
+    def processar(lote):
+        caminhos = [os.path.join(current_dir, relativo) for _, _, relativo in lote]
+        resultado = []
+        for (tipo, nome, relativo), filepath, resumo in zip(lote, caminhos,
+                                                            resumir_pdfs(caminhos, workers, cache_path, 2,
+                                                                         args.memoria_mb)):
+            METRICAS.registrar_arquivo(filepath, resumo.segundos, resumo.cpu_segundos, resumo.tempos)
+            METRICAS.contar(f'leitura_{resumo.leitura}')
+            if resumo.erro:
+                METRICAS.contar('erros')
+                print(f"\nErro ao processar '{filepath}': {resumo.erro}")
+            doc = Documento(relativo, nome, tamanho(filepath), resumo.cnpjs,
+                            status_de(resumo.cnpjs, resumo.erro), resumo.erro)
+            if chave_cnpj(doc.segundo_cnpj) == INVALIDO:
+                print(f"\nAviso: {tipo} '{nome}' não contém um segundo CNPJ válido")
+            resultado.append([tipo, doc._asdict()])
+        return resultado
+    
+    def juntar(resultados):
+        documentos = {tipo: [] for tipo in pastas}
+        origens = {os.path.join(current_dir, pasta): {} for pasta in pastas.values()}
+        for resultado in resultados:
+            for tipo, doc in resultado:
+                doc = documento_de_dict(doc)
+                documentos[tipo].append(doc)
+                origens[os.path.join(current_dir, pastas[tipo])][doc.nome] = os.path.join(current_dir, doc.caminho)
+        tabelas = {tipo: TabelaDocumentos(docs) for tipo, docs in documentos.items()}
+        grupos = {tipo: {cnpj: [tabela.nomes[linha] for linha in linhas] for cnpj, linhas in tabela.agrupar().items()}
+                  for tipo, tabela in tabelas.items()}
+        boletos_dict, nfs_dict = grupos["boleto"], grupos["nf"]
+        sem_cnpj = {tipo: tabela.sem_cnpj() for tipo, tabela in tabelas.items()}
+        nfs_without_cnpj = [tabelas["nf"].nomes[linha] for linha in sem_cnpj["nf"]]
+        colocador = ColocadorPacotes(args.pacotes) if args.pacotes else Colocador(args.modo)
+        # O relatório sai dos registros juntados, como na execução em um processo só
+        relatorio = res.Resultados()
+        with METRICAS.etapa('juncao'):
+            organize_files_by_second_cnpj(boletos_dict, nfs_dict, OUTPUT_DIR,
+                                          os.path.join(current_dir, pastas["boleto"]),
+                                          os.path.join(current_dir, pastas["nf"]), nfs_without_cnpj, colocador,
+                                          origens, criar_pastas=not args.pacotes)
+            if args.pacotes:
+                _, falhas = colocador.fechar()
+                METRICAS.contar('erros', len(falhas))
+                for origem, erro in falhas:
+                    print(f"\nErro ao empacotar '{origem}': {erro}")
+                    relatorio.pendente("colocacao", os.path.basename(origem), res.FALHA_COLOCACAO)
+        METRICAS.incorporar('colocacao', colocador.estatisticas())
+        for cnpj, nfs in nfs_dict.items():
+            digits = pasta_cnpj(cnpj)
+            if cnpj in boletos_dict:
+                relatorio.colocado(digits, res.CNPJ, 'boletos', len(boletos_dict[cnpj]))
+                relatorio.colocado(digits, res.CNPJ, 'nfs', len(nfs))
+            else:
+                relatorio.colocado(f"NF_{digits}", res.APENAS_NF, 'nfs', len(nfs))
+        if nfs_without_cnpj:
+            relatorio.colocado("NFs_SEM_CNPJ_IDENTIFICADO", res.SEM_CNPJ, 'nfs', len(nfs_without_cnpj))
+        for tipo, linhas in sem_cnpj.items():
+            for linha in linhas:
+                doc = documentos[tipo][linha]
+                relatorio.pendente(tipo, doc.nome, res.ERRO_LEITURA if doc.erro else
+                                   res.SEM_SEGUNDO_CNPJ if doc.segundo_cnpj is None else res.CNPJ_INVALIDO)
+        for cnpj, boletos in boletos_dict.items():
+            if cnpj not in nfs_dict:
+                for boleto in boletos:
+                    relatorio.pendente("boleto", boleto, res.BOLETO_SEM_NF)
+        relatorio.exportar(OUTPUT_DIR, METRICAS.para_dict())
+        return {"com_boletos": len(set(boletos_dict) & set(nfs_dict)),
+                "apenas_nfs": len(set(nfs_dict) - set(boletos_dict)),
+                "nfs_sem_cnpj": len(nfs_without_cnpj),
+                "pdfs": sum(len(docs) for docs in documentos.values())}
+    
+    with METRICAS.etapa('preparo'):
+        total = fila.preparar(listar, max(1, args.lote))
+    with METRICAS.etapa('fluxo'):
+        concluidos = fila.trabalhar(processar)
+    resumo = fila.juntar(juntar)
+    
+    print("\n" + "="*50)
+    print("Relatório do trabalhador:")
+    print(f"- Lotes processados por este trabalhador: {concluidos} de {total}")
+    if resumo is None:
+        print(f"Os resultados foram juntados por outro trabalhador (resumo em {os.path.join(fila.diretorio, 'concluido.json')})")
+    else:
+        print(f"\n{Fore.GREEN}Organização de Boletos e Notas Fiscais (baseada no segundo CNPJ):{Style.RESET_ALL}")
+        print(f"- PDFs lidos por todos os trabalhadores: {resumo['pdfs']}")
+        print(f"- Pastas com boletos e NFs: {resumo['com_boletos']}")
+        print(f"- Pastas apenas com NFs: {resumo['apenas_nfs']}")
+        print(f"- NFs sem CNPJ identificável: {resumo['nfs_sem_cnpj']}")
+        print(f"Resultado em: {OUTPUT_DIR}")
+    
+    print("\n" + METRICAS.resumo(args.lentos))
+    if args.metricas:
+        print(f"Métricas gravadas em: {METRICAS.exportar(args.metricas)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -1,27 +1,18 @@
 import os
-import PyPDF2
-import re
+import sys
 from tqdm import tqdm
 
-def extract_cnpjs(text):
-    """Extrai todos os CNPJs de um texto"""
-    pattern = re.compile(r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}')
-    return pattern.findall(text)
+# Permite importar o pacote compartilhado "leitor" que fica na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def extract_ceps(text):
-    """Extrai todos os CEPs de um texto"""
-    pattern = re.compile(r'\d{5}-\d{3}')
-    return pattern.findall(text)
+from leitor.cache import CacheExtracao
+from leitor.extracao import extrair_dados
 
-def get_cnpjs_and_ceps_from_pdf(pdf_path):
-    """Extrai CNPJs e CEPs de um arquivo PDF"""
+def get_cnpjs_and_ceps_from_pdf(pdf_path, cache=None):
+    """Extrai CNPJs e CEPs de um arquivo PDF (consultando o cache de extração, se houver)"""
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ''.join([page.extract_text() or '' for page in reader.pages])
-            cnpjs = extract_cnpjs(text)
-            ceps = extract_ceps(text)
-            return cnpjs, ceps
+        dados = extrair_dados(pdf_path, cache)
+        return dados['cnpjs'], dados['ceps']
     except Exception as e:
         print(f"\nErro ao processar '{pdf_path}': {str(e)}")
         return [], []
@@ -41,10 +32,10 @@ def main():
     data_by_file = {}
     
     # Processar cada PDF e extrair CNPJs e CEPs
-    with tqdm(pdf_files, desc="Processando PDFs", unit="arquivo") as pbar:
+    with CacheExtracao() as cache, tqdm(pdf_files, desc="Processando PDFs", unit="arquivo") as pbar:
         for filename in pbar:
             filepath = os.path.join(current_dir, filename)
-            cnpjs, ceps = get_cnpjs_and_ceps_from_pdf(filepath)
+            cnpjs, ceps = get_cnpjs_and_ceps_from_pdf(filepath, cache)
             data_by_file[filename] = (cnpjs, ceps)
     
     # Exibir relatório
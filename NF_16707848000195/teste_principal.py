@@ -1,20 +1,16 @@
 import os
-import PyPDF2
-import re
+import sys
 import shutil
 from tqdm import tqdm
 
-def extract_cnpjs(text):
-    pattern = re.compile(r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}')
-    return pattern.findall(text)
+# Permite importar o pacote compartilhado "leitor" que fica na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leitor.extracao import n_esimo_cnpj
 
 def get_third_cnpj(pdf_path):
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ''.join([page.extract_text() or '' for page in reader.pages])
-            cnpjs = extract_cnpjs(text)
-            return cnpjs[2] if len(cnpjs) > 2 else None
+        return n_esimo_cnpj(pdf_path, 3)
     except Exception as e:
         print(f"\nErro ao processar '{pdf_path}': {str(e)}")
         return None
@@ -0,0 +1,6 @@
+"""Medição de desempenho com um corpus sintético de boletos e notas fiscais
+
+Gerar só o corpus:      python -m benchmarks.corpus DESTINO --arquivos 10000
+Rodar as medições:      python -m benchmarks.executar --arquivos 1000
+Gravar como referência: python -m benchmarks.executar --arquivos 1000 --salvar-baseline
+"""
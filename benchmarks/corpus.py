@@ -0,0 +1,157 @@
+"""Gerador de um corpus sintético de boletos e NFS-e no mesmo leiaute do corpus real
+
+Para cada condomínio é gerada uma NF (tomador = condomínio) e, na maioria dos casos, o
+boleto correspondente (sacado = condomínio, valor igual ao da NF, linha digitável
+válida). Alguns boletos aparecem duas vezes, com "_" no lugar dos espaços no nome, como
+acontece na caixa de entrada real. Os PDFs são escritos diretamente (uma página, texto
+em Helvetica, conteúdo comprimido com FlateDecode), sem depender de bibliotecas.
+
+Estrutura gerada:
+    DESTINO/CONDOMINIAIS/BOLETOS/DD-MM-AAAA - SINGULAR FACILITIES SERVICE S.A - NOME - NUMERO.pdf
+    DESTINO/CONDOMINIAIS/NOTA_FISCAL/NOME - NUMERO.pdf
+"""
+import argparse
+import os
+import random
+import zlib
+from datetime import date, timedelta
+from typing import Dict, List
+
+from leitor.boleto import montar_linha
+from leitor.cnpj import digitos_verificadores, formatar
+
+CNPJ_PRESTADOR = '16.707.848/0001-95'
+PRESTADOR = 'SINGULAR FACILITIES SERVICE S.A'
+PREFIXOS = ['CONDOMINIO', 'CONDOMINIO EDIFICIO', 'RESIDENCIAL', 'ASSOCIACAO', 'EDIFICIO', 'CONDOMINIO RESIDENCIAL']
+PALAVRAS = ['AQUARIUS', 'MARINO', 'MARINE', 'GIARDINI', 'RESIDENZA', 'LACQUA', 'FATIMA', 'MORADAS', 'BUQUES',
+            'AGUA', 'FRIA', 'CATAMARA', 'JARDIM', 'BROMELIAS', 'VILLA', 'CARMEL', 'PARC', 'FLEURS', 'ROOFTOP',
+            'CANUTO', 'ARTIZ', 'MEIRELES', 'DUNAS', 'VILLAGE', 'CLUBE', 'SOLAR', 'PRAIA', 'FUTURO', 'GREENLIFE',
+            'TORRE', 'ALFA', 'BETA', 'ATLANTICO', 'ALDEOTA', 'COCO', 'IRACEMA', 'MUCURIPE', 'BEIRA', 'MAR']
+PROPORCAO_BOLETOS = 0.9    # condomínios que têm boleto além da NF
+PROPORCAO_DUPLICADOS = 0.03  # boletos salvos duas vezes (nome com "_")
+
+
+def gerar_cnpj(rng: random.Random) -> str:
+    base = f'{rng.randrange(10 ** 8):08d}0001'
+    return formatar(base + digitos_verificadores(base))
+
+
+def formatar_valor(centavos: int) -> str:
+    """4120022 -> '41.200,22'"""
+    return f'{centavos // 100:,}'.replace(',', '.') + f',{centavos % 100:02d}'
+
+
+def _escapar(linha: str) -> bytes:
+    return linha.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode('latin-1', 'replace')
+
+
+def pdf_texto(linhas: List[str]) -> bytes:
+    """PDF mínimo de uma página com as linhas de texto (uma por linha extraída)"""
+    conteudo = b'BT /F1 9 Tf 11 TL 40 800 Td ' + b' T* '.join(b'(' + _escapar(l) + b') Tj' for l in linhas) + b' ET'
+    stream = zlib.compress(conteudo)
+    objetos = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 4 0 R >> >> '
+        b'/Contents 5 0 R >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+        b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream) + stream + b'\nendstream',
+    ]
+    saida = bytearray(b'%PDF-1.4\n')
+    posicoes = []
+    for numero, objeto in enumerate(objetos, 1):
+        posicoes.append(len(saida))
+        saida += b'%d 0 obj\n' % numero + objeto + b'\nendobj\n'
+    xref = len(saida)
+    saida += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objetos) + 1)
+    saida += b''.join(b'%010d 00000 n \n' % p for p in posicoes)
+    saida += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objetos) + 1, xref)
+    return bytes(saida)
+
+
+def texto_boleto(condominio: str, cnpj: str, linha: str, valor: str, vencimento: date, emissao: date) -> List[str]:
+    return [
+        f'Endereço do Beneficiário 274-7 {linha}',
+        'SINGULAR SERVICOS CONDOMINIAIS LTDA 0001/08110072-9',
+        'FAUSTO CABRAL, 1031, QD 13, VICENTE PINZON, FORTALEZA-CE - CEP: 60175-415',
+        f'R$ 1 {CNPJ_PRESTADOR} {vencimento:%d/%m/%Y} {valor}',
+        f'{condominio} - {cnpj}',
+        'RUA PADRE LEOPOLDO FERNANDES 178, FATIMA, FORTALEZA-CE - CEP: 60411-180',
+        f'274-7 {linha}',
+        f'QUALQUER BANCO ATÉ O VENCIMENTO {vencimento:%d/%m/%Y}',
+        f'{emissao:%d/%m/%Y} DM N {emissao:%d/%m/%Y}',
+        f'1 R$ {valor}',
+        'Após o vencimento cobrar: Multa de 2,00%',
+        f'{condominio} - CPF/CNPJ: {cnpj}',
+    ]
+
+
+def texto_nf(condominio: str, cnpj: str, numero: int, valor: str, emissao: date) -> List[str]:
+    return [
+        'PREFEITURA MUNICIPAL DE FORTALEZA',
+        'SECRETARIA MUNICIPAL DAS FINANÇAS',
+        'NOTA FISCAL ELETRÔNICA DE SERVIÇO - NFS-e',
+        f'Número da NFS-e {numero}',
+        f'Data e Hora da Emissão {emissao:%d/%m/%Y} 16:05:45',
+        f'DADOS DO PRESTADOR DE SERVIÇOS {PRESTADOR}. CPF/CNPJ {CNPJ_PRESTADOR}',
+        'FAUSTO CABRAL, 1031, VICENTE PINZON, FORTALEZA - CE CEP 60175-415',
+        f'DADOS DO TOMADOR DE SERVIÇOS {condominio} CPF/CNPJ {cnpj}',
+        'Endereço e CEP RUA PADRE LEOPOLDO FERNANDES 178 FORTALEZA - CE 60411-180',
+        'DISCRIMINAÇÃO DOS SERVIÇOS LOCACAO DE MAO DE OBRA',
+        f'Valor dos Serviços R$ {valor}',
+        f'(=) Valor Líquido R$ {valor}',
+    ]
+
+
+def gerar(destino: str, arquivos: int = 1000, semente: int = 42) -> Dict[str, int]:
+    """Gera aproximadamente `arquivos` PDFs em destino e retorna as contagens"""
+    rng = random.Random(semente)
+    boletos_dir = os.path.join(destino, 'CONDOMINIAIS', 'BOLETOS')
+    nfs_dir = os.path.join(destino, 'CONDOMINIAIS', 'NOTA_FISCAL')
+    os.makedirs(boletos_dir, exist_ok=True)
+    os.makedirs(nfs_dir, exist_ok=True)
+
+    contagem = {'boletos': 0, 'nfs': 0, 'duplicados': 0}
+    numero_nf = 20000
+    numero_boleto = 10200000
+    while sum(contagem.values()) < arquivos:
+        condominio = f'{rng.choice(PREFIXOS)} {rng.choice(PALAVRAS)} {rng.choice(PALAVRAS)}'
+        cnpj = gerar_cnpj(rng)
+        centavos = rng.randrange(100000, 10000000)
+        valor = formatar_valor(centavos)
+        emissao = date(2025, 4, 1) + timedelta(days=rng.randrange(60))
+        vencimento = emissao + timedelta(days=rng.randrange(1, 30))
+
+        numero_nf += 1
+        with open(os.path.join(nfs_dir, f'{condominio} - {numero_nf}.pdf'), 'wb') as f:
+            f.write(pdf_texto(texto_nf(condominio, cnpj, numero_nf, valor, emissao)))
+        contagem['nfs'] += 1
+
+        if rng.random() < PROPORCAO_BOLETOS:
+            numero_boleto += 1
+            campo_livre = f'0001{rng.randrange(10 ** 21):021d}'
+            linha = montar_linha('274', centavos, vencimento, campo_livre)
+            conteudo = pdf_texto(texto_boleto(condominio, cnpj, linha, valor, vencimento, emissao))
+            nome = f'{emissao:%d-%m-%Y} - {PRESTADOR} - {condominio} - {numero_boleto}.pdf'
+            with open(os.path.join(boletos_dir, nome), 'wb') as f:
+                f.write(conteudo)
+            contagem['boletos'] += 1
+            if rng.random() < PROPORCAO_DUPLICADOS:
+                with open(os.path.join(boletos_dir, nome.replace(' ', '_')), 'wb') as f:
+                    f.write(conteudo)
+                contagem['duplicados'] += 1
+    return contagem
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera um corpus sintético de boletos e notas fiscais")
+    parser.add_argument("destino")
+    parser.add_argument("--arquivos", type=int, default=1000, help="quantidade aproximada de PDFs (padrão: %(default)s)")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+    contagem = gerar(args.destino, args.arquivos, args.semente)
+    print(f"{contagem['boletos']} boletos ({contagem['duplicados']} duplicados) e {contagem['nfs']} NFs em {args.destino}")
+
+
+if __name__ == "__main__":
+    main()
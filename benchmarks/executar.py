@@ -0,0 +1,270 @@
+"""Mede cada etapa da organização sobre um corpus sintético e compara com a referência
+
+Etapas medidas (na ordem em que rodam):
+    process_files                    leitura dos boletos e NFs (CONDOMINIAIS/main.py)
+    organize_files_by_second_cnpj    colocação em ORGANIZADOS
+    organize_pipeline                leitura e colocação em fluxo (CONDOMINIAIS/main.py), em outra
+                                     pasta; com --cache os PDFs já estão no cache
+    Aut.processa_boletos             pastas por nome de boleto (leitor.organizadores)
+    OrganizadorDocumentos            pastas por empresa das NFs (leitor.organizadores)
+    OrganizadorDocumentosPorRelacao  relação boletos <-> NFs por nome (leitor.organizadores)
+    memoria_documentos               memória de um milhão (--documentos) de registros lidos, como
+                                     lista de Documento e como TabelaDocumentos (leitor.documentos)
+
+Para cada etapa são registrados tempo real e de CPU, arquivos por segundo e o pico de
+memória residente (RSS) do processo e dos processos filhos até o fim da etapa. A
+referência fica em benchmarks/baseline.json, separada pelo tamanho do corpus.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from benchmarks import corpus  # noqa: E402
+from leitor import organizadores  # noqa: E402
+from leitor.documentos import STATUS_OK, Documento, TabelaDocumentos  # noqa: E402
+
+BASELINE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def carregar_modulo(nome: str, caminho: str):
+    """Importa um script pelo caminho (há dois main.py no repositório)"""
+    spec = importlib.util.spec_from_file_location(nome, caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def pico_rss_mb() -> Optional[float]:
+    """Pico de memória residente do processo e dos filhos, em MB"""
+    if resource is None:
+        return None
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    escala = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    proprio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    filhos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(proprio, filhos) / escala, 1)
+
+
+def medir(arquivos: int, funcao: Callable[[], None], silencioso: bool = True) -> Dict:
+    """Executa uma etapa e devolve as medições (ou o erro, se a etapa falhar)"""
+    saida = io.StringIO()
+    redirecionar = contextlib.ExitStack()
+    if silencioso:
+        redirecionar.enter_context(contextlib.redirect_stdout(saida))
+        redirecionar.enter_context(contextlib.redirect_stderr(saida))
+    inicio, inicio_cpu = time.perf_counter(), time.process_time()
+    try:
+        with redirecionar:
+            funcao()
+    except Exception as e:
+        return {'erro': f'{type(e).__name__}: {e}'}
+    segundos = time.perf_counter() - inicio
+    return {
+        'segundos': round(segundos, 4),
+        'cpu_segundos': round(time.process_time() - inicio_cpu, 4),
+        'arquivos': arquivos,
+        'arquivos_por_segundo': round(arquivos / segundos, 1) if segundos else None,
+        'pico_rss_mb': pico_rss_mb(),
+    }
+
+
+def documentos_sinteticos(quantidade: int, semente: int = 42):
+    """Registros como os de uma leitura real (prestador + tomador), sem gerar os PDFs
+
+    Os CNPJs saem de um conjunto sorteado uma vez, mas cada registro recebe cópias próprias
+    dos textos, como os que a regex devolve na leitura.
+    """
+    rng = random.Random(semente)
+    tomadores = [corpus.gerar_cnpj(rng) for _ in range(4096)]
+    for i in range(quantidade):
+        nome = f'{corpus.PREFIXOS[i % len(corpus.PREFIXOS)]} {corpus.PALAVRAS[i % len(corpus.PALAVRAS)]} {i} - {20000 + i}.pdf'
+        tomador = tomadores[i % len(tomadores)]
+        cnpjs = (corpus.CNPJ_PRESTADOR[:2] + corpus.CNPJ_PRESTADOR[2:], tomador[:2] + tomador[2:])
+        yield Documento(f'/corpus/CONDOMINIAIS/NOTA_FISCAL/{nome}', nome, 20000 + i % 70000, cnpjs, STATUS_OK)
+
+
+def tamanho_documento(doc: Documento) -> int:
+    """Bytes de um Documento e dos objetos só dele (o status é um texto compartilhado)"""
+    return (sys.getsizeof(doc) + sys.getsizeof(doc.caminho) + sys.getsizeof(doc.nome) + sys.getsizeof(doc.tamanho)
+            + sys.getsizeof(doc.cnpjs) + sum(map(sys.getsizeof, doc.cnpjs)))
+
+
+def memoria_documentos(quantidade: int) -> Dict:
+    """MB ocupados por quantidade registros como lista de Documento e como TabelaDocumentos
+
+    Contado com sys.getsizeof (TabelaDocumentos.memoria, tamanho_documento) e normalizado
+    para um milhão de documentos; o tempo medido é o da entrada na tabela, com a
+    conferência dos CNPJs.
+    """
+    por_milhao = 1_000_000 / quantidade / 2 ** 20
+    lista = list(documentos_sinteticos(quantidade))
+    lista_bytes = sys.getsizeof(lista) + sum(map(tamanho_documento, lista))
+    inicio = time.perf_counter()
+    tabela = TabelaDocumentos(lista)
+    segundos = time.perf_counter() - inicio
+    return {
+        'segundos': round(segundos, 4),
+        'arquivos': quantidade,
+        'arquivos_por_segundo': round(quantidade / segundos, 1) if segundos else None,
+        'pico_rss_mb': pico_rss_mb(),
+        'mb_por_milhao_tabela': round(tabela.memoria() * por_milhao, 1),
+        'mb_por_milhao_lista': round(lista_bytes * por_milhao, 1),
+    }
+
+
+def executar(destino: str, arquivos: int, workers: int = 1, cache_path: Optional[str] = None,
+             modo: str = 'copia', silencioso: bool = True, documentos: int = 1_000_000) -> Dict:
+    """Gera o corpus em destino e mede todas as etapas"""
+    resultados: Dict[str, Dict] = {}
+    inicio = time.perf_counter()
+    resultados['gerar_corpus'] = medir(arquivos, lambda: corpus.gerar(destino, arquivos))
+
+    base = os.path.join(destino, 'CONDOMINIAIS')
+    boletos_dir = os.path.join(base, 'BOLETOS')
+    nfs_dir = os.path.join(base, 'NOTA_FISCAL')
+    n_boletos, n_nfs = len(os.listdir(boletos_dir)), len(os.listdir(nfs_dir))
+    estado = {}
+
+    condominiais = carregar_modulo('condominiais_main', os.path.join(RAIZ, 'CONDOMINIAIS', 'main.py'))
+
+    def process_files():
+        estado['boletos'] = condominiais.scan_documents(boletos_dir, 'boletos', workers, cache_path)
+        estado['nfs'] = condominiais.scan_documents(nfs_dir, 'notas fiscais', workers, cache_path)
+
+    def organize_files_by_second_cnpj():
+        from leitor.colocacao import Colocador
+        from leitor.documentos import agrupar_por_segundo_cnpj, sem_segundo_cnpj
+
+        condominiais.organize_files_by_second_cnpj(
+            agrupar_por_segundo_cnpj(estado['boletos']), agrupar_por_segundo_cnpj(estado['nfs']),
+            os.path.join(base, 'ORGANIZADOS'), boletos_dir, nfs_dir, sem_segundo_cnpj(estado['nfs']), Colocador(modo))
+
+    def organize_pipeline():
+        from leitor.colocacao import Colocador
+
+        condominiais.organize_pipeline(boletos_dir, nfs_dir, os.path.join(base, 'ORGANIZADOS_FLUXO'), workers=workers,
+                                       cache_path=cache_path, colocador=Colocador(modo))
+
+    resultados['process_files'] = medir(n_boletos + n_nfs, process_files, silencioso)
+    if 'erro' not in resultados['process_files']:
+        resultados['organize_files_by_second_cnpj'] = medir(n_boletos + n_nfs, organize_files_by_second_cnpj, silencioso)
+    resultados['organize_pipeline'] = medir(n_boletos + n_nfs, organize_pipeline, silencioso)
+
+    arquivos_dir = os.path.join(destino, 'Arquivos')
+
+    def aut():
+        organizador = organizadores.Aut(boletos_dir, arquivos_dir, modo)
+        organizador.init_dir()
+        organizador.processa_boletos()
+
+    def organizador_documentos():
+        organizadores.OrganizadorDocumentos(nfs_dir, os.path.join(arquivos_dir, 'NOTA_FISCAL'), modo).processar_notas_fiscais()
+
+    def organizador_por_relacao():
+        organizadores.OrganizadorDocumentosPorRelacao(
+            os.path.join(arquivos_dir, 'BOLETOS'), os.path.join(arquivos_dir, 'NOTA_FISCAL'),
+            os.path.join(arquivos_dir, 'ORGANIZADOS'), modo).organizar()
+
+    resultados['Aut.processa_boletos'] = medir(n_boletos, aut, silencioso)
+    resultados['OrganizadorDocumentos'] = medir(n_nfs, organizador_documentos, silencioso)
+    resultados['OrganizadorDocumentosPorRelacao'] = medir(n_boletos + n_nfs, organizador_por_relacao, silencioso)
+    if documentos:
+        resultados['memoria_documentos'] = memoria_documentos(documentos)
+
+    total = time.perf_counter() - inicio
+    resultados['total'] = {
+        'segundos': round(total, 4),
+        'arquivos': n_boletos + n_nfs,
+        'arquivos_por_segundo': round((n_boletos + n_nfs) / total, 1),
+        'pico_rss_mb': pico_rss_mb(),
+    }
+    return resultados
+
+
+def imprimir(resultados: Dict, referencia: Optional[Dict]) -> None:
+    print(f"\n{'etapa':<34}{'s':>10}{'arq/s':>12}{'RSS MB':>10}{'ref arq/s':>12}{'variação':>10}")
+    for etapa, medicao in resultados.items():
+        if 'erro' in medicao:
+            print(f"{etapa:<34}  {medicao['erro'][:70]}")
+            continue
+        linha = f"{etapa:<34}{medicao['segundos']:>10.3f}{medicao['arquivos_por_segundo'] or 0:>12.1f}"
+        linha += f"{medicao['pico_rss_mb'] or 0:>10.1f}"
+        anterior = (referencia or {}).get(etapa, {})
+        if anterior.get('arquivos_por_segundo') and medicao['arquivos_por_segundo']:
+            variacao = medicao['arquivos_por_segundo'] / anterior['arquivos_por_segundo'] - 1
+            linha += f"{anterior['arquivos_por_segundo']:>12.1f}{variacao:>+10.1%}"
+        print(linha)
+    memoria = resultados.get('memoria_documentos')
+    if memoria and 'erro' not in memoria:
+        print(f"\nMemória por milhão de documentos: {memoria['mb_por_milhao_tabela']:.1f} MB em TabelaDocumentos, "
+              f"{memoria['mb_por_milhao_lista']:.1f} MB em lista de Documento")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark das etapas de organização com um corpus sintético")
+    parser.add_argument("--arquivos", type=int, default=1000, help="tamanho do corpus (padrão: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1, help="processos na leitura dos PDFs (padrão: %(default)s)")
+    parser.add_argument("--cache", default=None, help="cache de extração (padrão: sem cache, leitura a frio)")
+    parser.add_argument("--modo", default="copia", help="modo de colocação dos arquivos (padrão: %(default)s)")
+    parser.add_argument("--documentos", type=int, default=1_000_000,
+                        help="registros na medição de memória dos documentos, 0 para pular (padrão: %(default)s)")
+    parser.add_argument("--dir", default=None, help="onde gerar o corpus (padrão: diretório temporário, apagado no fim)")
+    parser.add_argument("--baseline", default=BASELINE_PADRAO, help="arquivo de referência (padrão: %(default)s)")
+    parser.add_argument("--salvar-baseline", action="store_true", help="grava este resultado como referência")
+    parser.add_argument("--json", default=None, help="grava os resultados completos neste arquivo")
+    parser.add_argument("--verboso", action="store_true", help="mostra a saída das etapas")
+    args = parser.parse_args()
+
+    destino = args.dir or tempfile.mkdtemp(prefix='benchmark-leitor-')
+    try:
+        resultados = executar(destino, args.arquivos, args.workers, args.cache, args.modo, not args.verboso,
+                              args.documentos)
+    finally:
+        if args.dir is None:
+            shutil.rmtree(destino, ignore_errors=True)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baselines = json.load(f)
+    imprimir(resultados, baselines.get(str(args.arquivos), {}).get('etapas'))
+
+    registro = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'workers': args.workers,
+        'modo': args.modo,
+        'etapas': resultados,
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(registro, f, ensure_ascii=False, indent=2)
+    if args.salvar_baseline:
+        baselines[str(args.arquivos)] = registro
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2)
+        print(f"\nReferência gravada em {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
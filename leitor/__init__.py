@@ -0,0 +1 @@
+"""Rotinas compartilhadas de leitura e organização de boletos e notas fiscais"""
@@ -0,0 +1,5 @@
+import sys
+
+from leitor.cli import main
+
+sys.exit(main())
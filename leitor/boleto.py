@@ -0,0 +1,125 @@
+"""Decodificação e validação da linha digitável de boletos bancários (padrão FEBRABAN, 47 dígitos)"""
+import re
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+# Fator de vencimento: dias desde 07/10/1997. Ao chegar em 9999 (21/02/2025) o fator
+# recomeçou em 1000 (22/02/2025), então cada fator corresponde a duas datas possíveis.
+DATA_BASE = date(1997, 10, 7)
+DATA_BASE_NOVO_CICLO = date(2025, 2, 22)
+
+# Posição do nosso número dentro do campo livre (25 dígitos) nos leiautes conhecidos
+NOSSO_NUMERO_POR_BANCO = {
+    '033': (8, 21),   # Santander
+    '237': (6, 17),   # Bradesco
+    '274': (6, 17),   # BMP (leiaute Bradesco)
+    '341': (3, 11),   # Itaú
+}
+
+
+class LinhaDigitavelInvalida(ValueError):
+    """Linha digitável com formato ou dígito verificador inválido"""
+
+
+class Boleto(NamedTuple):
+    """Dados estruturados extraídos da linha digitável"""
+    banco: str
+    moeda: str
+    valor_centavos: int
+    fator_vencimento: int
+    vencimento: Optional[date]
+    campo_livre: str
+    nosso_numero: Optional[str]
+    codigo_barras: str
+
+    @property
+    def valor(self) -> Decimal:
+        return Decimal(self.valor_centavos) / 100
+
+
+def modulo10(numero: str) -> int:
+    """Dígito verificador módulo 10 dos campos 1 a 3 da linha digitável"""
+    soma = 0
+    for i, digito in enumerate(reversed(numero)):
+        produto = int(digito) * (2 if i % 2 == 0 else 1)
+        soma += produto // 10 + produto % 10
+    return (10 - soma % 10) % 10
+
+
+def modulo11(numero: str) -> int:
+    """Dígito verificador geral (módulo 11) do código de barras"""
+    soma = sum(int(digito) * (2 + i % 8) for i, digito in enumerate(reversed(numero)))
+    dv = 11 - soma % 11
+    return 1 if dv in (0, 10, 11) else dv
+
+
+def vencimento_do_fator(fator: int, referencia: Optional[date] = None) -> Optional[date]:
+    """Converte o fator de vencimento na data mais próxima da referência (padrão: hoje)"""
+    if fator == 0:
+        return None
+    referencia = referencia or date.today()
+    candidatas = [DATA_BASE + timedelta(days=fator)]
+    if fator >= 1000:
+        candidatas.append(DATA_BASE_NOVO_CICLO + timedelta(days=fator - 1000))
+    return min(candidatas, key=lambda d: abs((d - referencia).days))
+
+
+def fator_do_vencimento(vencimento: date) -> int:
+    """Fator de vencimento (1000 a 9999) correspondente à data"""
+    if vencimento >= DATA_BASE_NOVO_CICLO:
+        return 1000 + (vencimento - DATA_BASE_NOVO_CICLO).days % 9000
+    return (vencimento - DATA_BASE).days
+
+
+def montar_linha(banco: str, valor_centavos: int, vencimento: date, campo_livre: str, moeda: str = '9') -> str:
+    """Monta a linha digitável formatada (com todos os dígitos verificadores); inverso de decodificar_linha"""
+    fator_valor = f'{fator_do_vencimento(vencimento):04d}{valor_centavos:010d}'
+    sem_dv = banco + moeda + fator_valor + campo_livre
+    dv_geral = modulo11(sem_dv)
+    campos = [banco + moeda + campo_livre[:5], campo_livre[5:15], campo_livre[15:25]]
+    campos = [campo + str(modulo10(campo)) for campo in campos]
+    return ' '.join([f'{campo[:5]}.{campo[5:]}' for campo in campos] + [str(dv_geral), fator_valor])
+
+
+def decodificar_linha(linha: str, referencia: Optional[date] = None) -> Boleto:
+    """Valida a linha digitável (dígitos dos campos e dígito geral) e devolve o Boleto"""
+    digitos = re.sub(r'\D', '', linha)
+    if len(digitos) != 47:
+        raise LinhaDigitavelInvalida(f"Linha digitável deve ter 47 dígitos: {linha!r}")
+
+    campo1, dv1 = digitos[0:9], int(digitos[9])
+    campo2, dv2 = digitos[10:20], int(digitos[20])
+    campo3, dv3 = digitos[21:31], int(digitos[31])
+    dv_geral = digitos[32]
+    fator_valor = digitos[33:47]
+    for numero, campo, dv in ((1, campo1, dv1), (2, campo2, dv2), (3, campo3, dv3)):
+        if modulo10(campo) != dv:
+            raise LinhaDigitavelInvalida(f"Dígito verificador do campo {numero} inválido: {linha!r}")
+
+    campo_livre = campo1[4:] + campo2 + campo3
+    codigo_barras = campo1[:4] + dv_geral + fator_valor + campo_livre
+    if modulo11(codigo_barras[:4] + codigo_barras[5:]) != int(dv_geral):
+        raise LinhaDigitavelInvalida(f"Dígito verificador geral inválido: {linha!r}")
+
+    banco = campo1[:3]
+    fator = int(fator_valor[:4])
+    posicao = NOSSO_NUMERO_POR_BANCO.get(banco)
+    return Boleto(
+        banco=banco,
+        moeda=campo1[3],
+        valor_centavos=int(fator_valor[4:]),
+        fator_vencimento=fator,
+        vencimento=vencimento_do_fator(fator, referencia),
+        campo_livre=campo_livre,
+        nosso_numero=campo_livre[posicao[0]:posicao[1]] if posicao else None,
+        codigo_barras=codigo_barras,
+    )
+
+
+def tentar_decodificar(linha: str, referencia: Optional[date] = None) -> Optional[Boleto]:
+    """Como decodificar_linha, mas retorna None em vez de levantar erro"""
+    try:
+        return decodificar_linha(linha, referencia)
+    except LinhaDigitavelInvalida:
+        return None
@@ -0,0 +1,207 @@
+"""Cache persistente (SQLite) da extração de PDFs, indexado pelo hash do conteúdo do arquivo
+
+Uso pela linha de comando:
+    python -m leitor.cache estatisticas
+    python -m leitor.cache invalidar arquivo1.pdf arquivo2.pdf
+    python -m leitor.cache invalidar --tudo
+    python -m leitor.cache podar --limite-mb 256
+
+O horário de acesso de cada entrada só serve para a poda (as menos usadas saem primeiro),
+então uma leitura do cache não grava nada na hora: os acessos ficam em memória e vão
+para o banco juntos, numa só transação, na próxima gravação, poda ou no fechamento. Um
+acesso a uma entrada usada há menos de ATUALIZAR_ACESSO segundos nem é anotado.
+"""
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Dict, Iterable, Optional, Tuple
+
+from leitor import pacotes
+
+CACHE_PADRAO = os.environ.get('LEITOR_CACHE') or os.path.join(
+    os.path.expanduser('~'), '.cache', 'leitor-nfs', 'extracao.sqlite3')
+LIMITE_PADRAO = 512 * 1024 * 1024  # 512 MB
+PODAR_A_CADA = 64  # gravações entre verificações do tamanho do cache
+ATUALIZAR_ACESSO = 3600.0  # segundos; um acesso mais recente que isso não é regravado
+LOTE_ACESSOS = 256  # acessos guardados em memória antes de irem para o banco
+
+
+def hash_arquivo(caminho: str, bloco: int = 1024 * 1024) -> str:
+    """Calcula o SHA-256 do conteúdo do arquivo (ou do membro de pacote) lendo em blocos"""
+    h = hashlib.sha256()
+    with pacotes.abrir(caminho) as f:
+        for parte in iter(lambda: f.read(bloco), b''):
+            h.update(parte)
+    return h.hexdigest()
+
+
+class CacheExtracao:
+    def __init__(self, caminho: str = CACHE_PADRAO, limite_bytes: int = LIMITE_PADRAO) -> None:
+        self.caminho = os.path.abspath(caminho)
+        self.limite_bytes = limite_bytes
+        self._pid = os.getpid()  # a conexão só vale no processo que a abriu
+        self._gravacoes = 0
+        self._acessos: Dict[Tuple[str, int], float] = {}  # (hash, versao) -> acessado_em ainda não gravado
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        # timeout alto porque vários processos de leitura podem gravar ao mesmo tempo
+        self._con = sqlite3.connect(self.caminho, timeout=60)
+        self._con.execute('PRAGMA journal_mode=WAL')
+        self._con.execute('PRAGMA synchronous=NORMAL')
+        self._con.execute(
+            'CREATE TABLE IF NOT EXISTS extracoes ('
+            ' hash TEXT NOT NULL,'
+            ' versao INTEGER NOT NULL,'
+            ' tamanho INTEGER NOT NULL,'
+            ' acessado_em REAL NOT NULL,'
+            ' dados BLOB NOT NULL,'
+            ' PRIMARY KEY (hash, versao))')
+        self._con.execute('CREATE INDEX IF NOT EXISTS idx_acessado ON extracoes (acessado_em)')
+        self._con.commit()
+
+    def __enter__(self) -> 'CacheExtracao':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def obter(self, hash_conteudo: str, versao: int) -> Optional[dict]:
+        """Retorna os dados gravados para o conteúdo e versão do extrator, ou None"""
+        linha = self._con.execute(
+            'SELECT dados, acessado_em FROM extracoes WHERE hash = ? AND versao = ?',
+            (hash_conteudo, versao)).fetchone()
+        if linha is None:
+            return None
+        agora = time.time()
+        if agora - linha[1] > ATUALIZAR_ACESSO:
+            self._acessos[(hash_conteudo, versao)] = agora
+            if len(self._acessos) >= LOTE_ACESSOS:
+                self._gravar_acessos()
+                self._con.commit()
+        return json.loads(zlib.decompress(linha[0]))
+
+    def _gravar_acessos(self) -> None:
+        """Grava os horários de acesso guardados em memória (na transação aberta; quem chama faz o commit)"""
+        if self._acessos:
+            self._con.executemany(
+                'UPDATE extracoes SET acessado_em = ? WHERE hash = ? AND versao = ?',
+                [(acessado_em, *chave) for chave, acessado_em in self._acessos.items()])
+            self._acessos.clear()
+
+    def gravar(self, hash_conteudo: str, versao: int, dados: dict) -> None:
+        """Grava (ou substitui) os dados extraídos de um conteúdo"""
+        blob = zlib.compress(json.dumps(dados, ensure_ascii=False).encode('utf-8'))
+        self._con.execute(
+            'INSERT OR REPLACE INTO extracoes (hash, versao, tamanho, acessado_em, dados) VALUES (?, ?, ?, ?, ?)',
+            (hash_conteudo, versao, len(blob), time.time(), blob))
+        self._acessos.pop((hash_conteudo, versao), None)
+        self._gravar_acessos()
+        self._con.commit()
+        self._gravacoes += 1
+        if self._gravacoes % PODAR_A_CADA == 0:
+            self.podar()
+
+    def invalidar(self, hashes: Optional[Iterable[str]] = None) -> int:
+        """Remove as entradas dos hashes informados (todas as versões) ou o cache inteiro"""
+        if hashes is None:
+            removidas = self._con.execute('DELETE FROM extracoes').rowcount
+        else:
+            removidas = sum(self._con.execute('DELETE FROM extracoes WHERE hash = ?', (h,)).rowcount
+                            for h in hashes)
+        self._con.commit()
+        return removidas
+
+    def tamanho_total(self) -> int:
+        return self._con.execute('SELECT COALESCE(SUM(tamanho), 0) FROM extracoes').fetchone()[0]
+
+    def podar(self) -> int:
+        """Remove as entradas acessadas há mais tempo até o cache caber no limite de tamanho"""
+        self._gravar_acessos()
+        self._con.commit()
+        excesso = self.tamanho_total() - self.limite_bytes
+        if excesso <= 0:
+            return 0
+        removidas = 0
+        linhas = self._con.execute(
+            'SELECT hash, versao, tamanho FROM extracoes ORDER BY acessado_em').fetchall()
+        for hash_conteudo, versao, tamanho in linhas:
+            if excesso <= 0:
+                break
+            self._con.execute('DELETE FROM extracoes WHERE hash = ? AND versao = ?', (hash_conteudo, versao))
+            excesso -= tamanho
+            removidas += 1
+        self._con.commit()
+        return removidas
+
+    def estatisticas(self) -> dict:
+        entradas, total = self._con.execute(
+            'SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM extracoes').fetchone()
+        return {'caminho': self.caminho, 'entradas': entradas, 'bytes': total, 'limite_bytes': self.limite_bytes}
+
+    def fechar(self) -> None:
+        if self._con is None:
+            return
+        if os.getpid() != self._pid:
+            # Cópia herdada por fork: a conexão é do processo pai e não pode ser usada aqui
+            self._con = None
+            return
+        self._gravar_acessos()
+        self._con.commit()
+        self._con.close()
+        self._con = None
+
+
+_caches_abertos: Dict[Tuple[int, str], CacheExtracao] = {}
+
+
+def cache_do_processo(caminho: Optional[str]) -> Optional[CacheExtracao]:
+    """Retorna uma conexão de cache reaproveitada dentro do processo atual (uma por caminho)
+
+    A chave inclui o pid: um processo de leitura criado por fork herda este dicionário com
+    as conexões do pai, que o SQLite não permite usar do outro lado do fork, e abre as suas.
+    """
+    if not caminho:
+        return None
+    chave = (os.getpid(), caminho)
+    if chave not in _caches_abertos:
+        _caches_abertos[chave] = cache = CacheExtracao(caminho)
+        # Grava os acessos pendentes ao sair; num processo de leitura criado por fork o atexit
+        # não roda e perdem-se no máximo LOTE_ACESSOS acessos, o que só muda a ordem da poda
+        atexit.register(cache.fechar)
+    return _caches_abertos[chave]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gerencia o cache de extração de PDFs")
+    parser.add_argument('--cache', default=CACHE_PADRAO, help="arquivo SQLite do cache")
+    sub = parser.add_subparsers(dest='comando', required=True)
+    sub.add_parser('estatisticas', help="mostra o tamanho do cache")
+    inv = sub.add_parser('invalidar', help="remove entradas do cache")
+    inv.add_argument('arquivos', nargs='*', help="PDFs cujas entradas devem ser removidas")
+    inv.add_argument('--tudo', action='store_true', help="remove todas as entradas")
+    pod = sub.add_parser('podar', help="reduz o cache até o limite de tamanho")
+    pod.add_argument('--limite-mb', type=int, default=LIMITE_PADRAO // (1024 * 1024))
+    args = parser.parse_args()
+
+    with CacheExtracao(args.cache) as cache:
+        if args.comando == 'estatisticas':
+            for chave, valor in cache.estatisticas().items():
+                print(f"{chave}: {valor}")
+        elif args.comando == 'invalidar':
+            if args.tudo:
+                print(f"Entradas removidas: {cache.invalidar()}")
+            elif args.arquivos:
+                print(f"Entradas removidas: {cache.invalidar(hash_arquivo(a) for a in args.arquivos)}")
+            else:
+                parser.error("informe os arquivos ou use --tudo")
+        elif args.comando == 'podar':
+            cache.limite_bytes = args.limite_mb * 1024 * 1024
+            print(f"Entradas removidas: {cache.podar()}")
+
+
+if __name__ == '__main__':
+    main()
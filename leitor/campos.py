@@ -0,0 +1,89 @@
+"""Varredura de campos (CNPJ, CEP, linha digitável, valores, número da NF e datas) em uma única passada
+
+Todos os padrões são combinados em uma só expressão regular com grupos nomeados, então
+incluir um campo novo não acrescenta outra passada sobre o texto. Quando dois padrões
+poderiam casar na mesma posição, vale o que aparece antes em CAMPOS_PADRAO.
+"""
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+CNPJ = r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}'
+CEP = r'\d{5}-\d{3}'
+# Linha digitável de boleto bancário: 5.5 5.6 5.6 1 14 (47 dígitos)
+LINHA_DIGITAVEL = r'\d{5}\.\d{5}\s+\d{5}\.\d{6}\s+\d{5}\.\d{6}\s+\d\s+\d{14}'
+DATA = r'\d{2}/\d{2}/\d{4}'
+VALOR = r'\d{1,3}(?:\.\d{3})*,\d{2}'
+# Número da NFS-e no modelo da prefeitura de Fortaleza ("Número da NFS-e 20030");
+# o grupo "valor" indica a parte do trecho que é o valor do campo
+NUMERO_NF = r'N[úu]mero da\s*NFS-e\s*(?P<valor>\d+)'
+
+# (tipo, padrão) em ordem de prioridade
+CAMPOS_PADRAO: Tuple[Tuple[str, str], ...] = (
+    ('linha_digitavel', LINHA_DIGITAVEL),
+    ('cnpj', CNPJ),
+    ('numero_nf', NUMERO_NF),
+    ('data', DATA),
+    ('cep', CEP),
+    ('valor', VALOR),
+)
+
+
+class Campo(NamedTuple):
+    """Um campo encontrado no texto, com o tipo e a posição (inicio, fim) do valor"""
+    tipo: str
+    valor: str
+    inicio: int
+    fim: int
+
+
+class Varredor:
+    def __init__(self, campos: Sequence[Tuple[str, str]] = CAMPOS_PADRAO) -> None:
+        self.campos = tuple(campos)
+        self.tipos = tuple(tipo for tipo, _ in self.campos)
+        partes = []
+        for tipo, padrao in self.campos:
+            # Os grupos internos "valor" precisam de nomes únicos dentro da expressão combinada
+            partes.append(f'(?P<{tipo}>{padrao.replace("(?P<valor>", f"(?P<{tipo}__valor>")})')
+        self._regex = re.compile('|'.join(partes))
+        self._grupo_valor = {tipo: f'{tipo}__valor' if f'{tipo}__valor' in self._regex.groupindex else tipo
+                             for tipo in self.tipos}
+
+    def com_campo(self, tipo: str, padrao: str, antes_de: Optional[str] = None) -> 'Varredor':
+        """Retorna um novo varredor com o campo incluído (no fim ou antes do tipo informado)"""
+        campos = list(self.campos)
+        posicao = self.tipos.index(antes_de) if antes_de else len(campos)
+        campos.insert(posicao, (tipo, padrao))
+        return Varredor(campos)
+
+    def varrer(self, texto: str) -> Iterator[Campo]:
+        """Percorre o texto uma única vez produzindo os campos na ordem em que aparecem"""
+        grupo_valor = self._grupo_valor
+        for m in self._regex.finditer(texto):
+            tipo = m.lastgroup
+            grupo = grupo_valor[tipo]
+            yield Campo(tipo, m.group(grupo), m.start(grupo), m.end(grupo))
+
+    def agrupar(self, texto: str) -> Dict[str, List[str]]:
+        """Retorna {tipo: [valores]} com todos os tipos conhecidos, mesmo os sem ocorrência"""
+        grupos: Dict[str, List[str]] = {tipo: [] for tipo in self.tipos}
+        for campo in self.varrer(texto):
+            grupos[campo.tipo].append(campo.valor)
+        return grupos
+
+
+VARREDOR_PADRAO = Varredor()
+
+
+def varrer(texto: str) -> Iterator[Campo]:
+    """Percorre o texto com os campos padrão"""
+    return VARREDOR_PADRAO.varrer(texto)
+
+
+def extrair_campos(texto: str) -> Dict[str, List[str]]:
+    """Retorna {tipo: [valores]} com os campos padrão encontrados no texto"""
+    return VARREDOR_PADRAO.agrupar(texto)
+
+
+def do_tipo(campos: Iterable[Campo], tipo: str) -> List[str]:
+    """Filtra os valores de um tipo de campo"""
+    return [campo.valor for campo in campos if campo.tipo == tipo]
@@ -0,0 +1,209 @@
+"""Linha de comando única: python -m leitor SUBCOMANDO [opções]
+
+    boletos     pastas por condomínio a partir do nome dos boletos (Aut)
+    notas       pastas por empresa a partir do nome das notas fiscais (OrganizadorDocumentos)
+    relacionar  junta as pastas de boletos e de notas com nomes semelhantes
+    cnpj        organização pelo CNPJ lido dos PDFs (CONDOMINIAIS/main.py)
+    relatorio   resumo da pasta de saída, sem abrir nenhum PDF
+
+Nada pede confirmação no terminal, e o código de saída é 0 em caso de sucesso. Este
+módulo só importa argparse e constantes leves; cada subcomando importa o que precisa
+quando roda, para que --help e os subcomandos que só olham nomes de arquivos comecem
+rápido (o agendador chama a linha de comando centenas de vezes por dia).
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional, Tuple
+
+from leitor.colocacao import MODO_PADRAO, MODOS
+from leitor.lote import THREADS_PADRAO
+from leitor.metricas import LENTOS_PADRAO
+from leitor.organizadores import NOMEACOES
+from leitor.semelhanca import MODOS as MODOS_SEMELHANCA
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Os mesmos de leitor.duplicados.ACOES, que não é importado aqui por puxar hashlib e sqlite3
+ACOES_DUPLICADOS = ('manter', 'pular', 'linkar')
+
+
+def _boletos(args):
+    from leitor.organizadores import Aut
+
+    aut = Aut(args.origem, args.destino, args.modo, args.threads)
+    aut.run(args.incremental)
+    return aut
+
+
+def _notas(args):
+    from leitor.organizadores import OrganizadorDocumentos
+
+    organizador = OrganizadorDocumentos(args.origem, args.destino, args.modo, args.nomeacao, args.progresso)
+    organizador.executar(args.incremental)
+    return organizador
+
+
+def _relacionar(args):
+    from leitor.organizadores import OrganizadorDocumentosPorRelacao
+
+    organizador = OrganizadorDocumentosPorRelacao(args.boletos, args.notas, args.destino, args.modo,
+                                                  args.semelhanca, args.k, args.duplicados)
+    organizador.organizar()
+    return organizador
+
+
+def _cnpj(argumentos: List[str]) -> int:
+    """Repassa as opções para CONDOMINIAIS/main.py, que tem a sua própria ajuda (cnpj --help)
+
+    Retorna o código de saída da execução: 1 se algum PDF não pôde ser lido ou colocado.
+    """
+    import importlib.util
+
+    caminho = os.path.join(RAIZ, 'CONDOMINIAIS', 'main.py')
+    spec = importlib.util.spec_from_file_location('condominiais_main', caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo.main(argumentos, prog='python -m leitor cnpj')
+
+
+def _relatorio(args) -> int:
+    from leitor.relatorio import formatar, resumo_arquivos
+
+    resumo = resumo_arquivos(args.dir)
+    print(formatar(resumo))
+    if args.json:
+        import json
+
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resumo, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument("--modo", choices=MODOS, default=MODO_PADRAO,
+                       help="como colocar os arquivos (padrão: %(default)s)")
+    comum.add_argument("--metricas", metavar="ARQUIVO",
+                       help="grava as métricas em JSON (ou no formato do Prometheus se terminar em .prom)")
+    comum.add_argument("--lentos", type=int, default=LENTOS_PADRAO,
+                       help="quantos arquivos mais lentos listar no resumo (padrão: %(default)s)")
+    comum.add_argument("--perfil", "--profile", nargs="?", const="", metavar="PREFIXO",
+                       help="grava PREFIXO.pstats, PREFIXO.collapsed e PREFIXO.alocacoes.txt "
+                            "(padrão: perfil_SUBCOMANDO)")
+
+    parser = argparse.ArgumentParser(prog="python -m leitor",
+                                     description="Organiza boletos e notas fiscais de condomínios")
+    subcomandos = parser.add_subparsers(dest="comando", required=True, metavar="SUBCOMANDO")
+
+    boletos = subcomandos.add_parser("boletos", parents=[comum], help="pastas por condomínio a partir dos boletos")
+    boletos.add_argument("--origem", default="CONDOMINIAIS/BOLETOS", help="pasta dos boletos (padrão: %(default)s)")
+    boletos.add_argument("--destino", default="Arquivos", help="pasta de saída (padrão: %(default)s)")
+    boletos.add_argument("--incremental", action="store_true", help="coloca só os boletos novos ou alterados")
+    boletos.add_argument("--threads", type=int, default=THREADS_PADRAO,
+                         help="colocações simultâneas (padrão: %(default)s; LEITOR_THREADS)")
+    boletos.set_defaults(executar=_boletos, perfil_padrao="perfil_boletos")
+
+    notas = subcomandos.add_parser("notas", parents=[comum], help="pastas por empresa a partir das notas fiscais")
+    notas.add_argument("--origem", default="CONDOMINIAIS/NOTA_FISCAL",
+                       help="pasta das notas fiscais (padrão: %(default)s)")
+    notas.add_argument("--destino", default="Arquivos/NOTA_FISCAL", help="pasta de saída (padrão: %(default)s)")
+    notas.add_argument("--nomeacao", choices=NOMEACOES, default=NOMEACOES[0],
+                       help="nome de cada nota na pasta da empresa (padrão: %(default)s)")
+    notas.add_argument("--incremental", action="store_true", help="coloca só as notas novas ou alteradas")
+    notas.add_argument("--progresso", action="store_true", help="mostra a barra de progresso (tqdm)")
+    notas.set_defaults(executar=_notas, perfil_padrao="perfil_notas")
+
+    relacionar = subcomandos.add_parser("relacionar", parents=[comum],
+                                        help="junta as pastas de boletos e notas com nomes semelhantes")
+    relacionar.add_argument("--boletos", default="Arquivos/BOLETOS", help="(padrão: %(default)s)")
+    relacionar.add_argument("--notas", default="Arquivos/NOTA_FISCAL", help="(padrão: %(default)s)")
+    relacionar.add_argument("--destino", default="Arquivos/ORGANIZADOS", help="(padrão: %(default)s)")
+    relacionar.add_argument("--semelhanca", choices=MODOS_SEMELHANCA, default=MODOS_SEMELHANCA[0],
+                            help="regra de semelhança dos nomes (padrão: %(default)s)")
+    relacionar.add_argument("-k", type=int, default=None, help="máximo de notas relacionadas a cada boleto")
+    relacionar.add_argument("--duplicados", choices=ACOES_DUPLICADOS, default="manter",
+                            help="o que fazer com PDFs idênticos salvos com outro nome; linkar cria hardlinks "
+                                 "(o mesmo arquivo em disco: editar um altera o outro) (padrão: %(default)s)")
+    relacionar.set_defaults(executar=_relacionar, perfil_padrao="perfil_relacao")
+
+    # As opções do cnpj são as de CONDOMINIAIS/main.py e são repassadas sem interpretação
+    subcomandos.add_parser("cnpj", add_help=False, help="organização pelo CNPJ lido dos PDFs (cnpj --help)")
+
+    relatorio = subcomandos.add_parser("relatorio", help="resumo da pasta de saída sem abrir PDFs")
+    relatorio.add_argument("--dir", default="Arquivos", help="pasta de saída (padrão: %(default)s)")
+    relatorio.add_argument("--json", metavar="ARQUIVO", help="grava o resumo também em JSON")
+    return parser
+
+
+def opcoes_por_subcomando(argv: List[str], comandos: Tuple[str, ...]) -> List[List[str]]:
+    """Reparte as opções de argv entre os subcomandos que as aceitam (uma lista por subcomando)
+
+    Usado pelos scripts da raiz, que rodam vários subcomandos em sequência: cada um recebe
+    só as suas opções (--threads só vai para boletos, --incremental não vai para
+    relacionar). Uma opção que nenhum deles aceita, ou um valor inválido, termina com erro
+    antes que qualquer subcomando rode.
+    """
+    parser = criar_parser()
+    subparsers = next(acao for acao in parser._actions if isinstance(acao, argparse._SubParsersAction)).choices
+    repartidas: List[List[str]] = [[] for _ in comandos]
+    i = 0
+    while i < len(argv):
+        opcao = argv[i]
+        nome = opcao.split('=', 1)[0] if opcao.startswith('--') else opcao
+        pares = [(destino, subparsers[comando]._option_string_actions.get(nome))
+                 for destino, comando in zip(repartidas, comandos)]
+        pares = [(destino, acao) for destino, acao in pares if acao is not None]
+        if not pares:
+            parser.error(f"argumento não reconhecido por {', '.join(comandos)}: {opcao}")
+        # Quantos valores seguem a opção (o mesmo em todos os subcomandos que a aceitam)
+        acao = pares[0][1]
+        if '=' in opcao or acao.nargs == 0:
+            valores = 0
+        elif acao.nargs == '?':
+            valores = 1 if i + 1 < len(argv) and not argv[i + 1].startswith('-') else 0
+        else:
+            valores = acao.nargs if isinstance(acao.nargs, int) else 1
+        for destino, _ in pares:
+            destino.extend(argv[i:i + 1 + valores])
+        i += 1 + valores
+    for comando, opcoes in zip(comandos, repartidas):
+        parser.parse_args([comando, *opcoes])
+    return repartidas
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = criar_parser()
+    args, extras = parser.parse_known_args(argv)
+    if args.comando == "cnpj":
+        try:
+            return _cnpj(extras)
+        except Exception as e:
+            print(f"Erro durante a execução: {e}", file=sys.stderr)
+            return 1
+    if extras:
+        parser.error(f"argumentos não reconhecidos: {' '.join(extras)}")
+    if args.comando == "relatorio":
+        return _relatorio(args)
+
+    from leitor.metricas import METRICAS, finalizar
+
+    codigo = 0
+    organizador = None
+    try:
+        if args.perfil is not None:
+            from leitor.perfil import Perfilador
+
+            with Perfilador(args.perfil or args.perfil_padrao):
+                organizador = args.executar(args)
+        else:
+            organizador = args.executar(args)
+    except Exception as e:
+        METRICAS.contar('erros')
+        print(f"Erro durante a execução: {e}", file=sys.stderr)
+        codigo = 1
+    if METRICAS.contadores['erros']:
+        codigo = 1
+    if organizador is not None:
+        METRICAS.incorporar('colocacao', organizador.colocador.estatisticas())
+    finalizar(args.lentos, args.metricas)
+    return codigo
@@ -0,0 +1,107 @@
+"""Dígitos verificadores e formatação de CNPJ
+
+Para agrupar e indexar, um CNPJ vira uma chave inteira de 64 bits (os 14 dígitos como
+número, ver chaves); os dígitos verificadores são conferidos na conversão, então um falso
+positivo da regex não vira pasta nem grupo. O nome da pasta sai da chave (pasta).
+"""
+import re
+from array import array
+from operator import mul
+from typing import Iterable, Optional
+
+PESOS_DV1 = (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+PESOS_DV2 = (6,) + PESOS_DV1
+INVALIDO = -1  # chave de um CNPJ ausente ou com dígitos verificadores errados
+MINIMO_NUMPY = 128  # abaixo disso a conferência em Python é mais rápida que montar as matrizes
+_PONTUACAO = str.maketrans('', '', './- ')
+_ZEROS_DV1 = 48 * sum(PESOS_DV1)  # os dígitos chegam como bytes ASCII ('0' == 48)
+_ZEROS_DV2 = 48 * sum(PESOS_DV2)
+
+
+def _dv(digitos: str, pesos) -> str:
+    resto = sum(int(d) * p for d, p in zip(digitos, pesos)) % 11
+    return '0' if resto < 2 else str(11 - resto)
+
+
+def digitos_verificadores(base: str) -> str:
+    """Os dois dígitos verificadores dos 12 primeiros dígitos do CNPJ"""
+    dv1 = _dv(base, PESOS_DV1)
+    return dv1 + _dv(base + dv1, PESOS_DV2)
+
+
+def formatar(digitos: str) -> str:
+    """'16707848000195' -> '16.707.848/0001-95'"""
+    return f'{digitos[:2]}.{digitos[2:5]}.{digitos[5:8]}/{digitos[8:12]}-{digitos[12:14]}'
+
+
+def valido(cnpj: str) -> bool:
+    """Confere tamanho e dígitos verificadores (aceita com ou sem pontuação)"""
+    digitos = re.sub(r'\D', '', cnpj)
+    return len(digitos) == 14 and digitos[12:] == digitos_verificadores(digitos[:12])
+
+
+def _digitos(cnpj: Optional[str]) -> Optional[bytes]:
+    """Os 14 dígitos em ASCII, ou None se o texto não tem a forma de um CNPJ"""
+    if not cnpj:
+        return None
+    digitos = cnpj.translate(_PONTUACAO)
+    if len(digitos) != 14 or not digitos.isdigit() or not digitos.isascii():
+        return None
+    return digitos.encode('ascii')
+
+
+def _chave_python(digitos: bytes) -> int:
+    resto = (sum(map(mul, digitos, PESOS_DV1)) - _ZEROS_DV1) % 11
+    if digitos[12] - 48 != (0 if resto < 2 else 11 - resto):
+        return INVALIDO
+    resto = (sum(map(mul, digitos, PESOS_DV2)) - _ZEROS_DV2) % 11
+    if digitos[13] - 48 != (0 if resto < 2 else 11 - resto):
+        return INVALIDO
+    return int(digitos)
+
+
+def _numpy(quantidade: int):
+    """O módulo numpy para lotes grandes; None se não compensar ou não estiver instalado"""
+    if quantidade < MINIMO_NUMPY:
+        return None
+    try:
+        import numpy
+    except ImportError:  # NumPy é opcional; sem ele a conferência é feita em Python
+        return None
+    return numpy
+
+
+def chaves(cnpjs: Iterable[Optional[str]]) -> array:
+    """Chaves inteiras (array 'q') dos CNPJs, com ou sem pontuação, conferidos todos de uma vez
+
+    Ausentes, malformados e com dígitos verificadores errados viram INVALIDO.
+    """
+    todos = [_digitos(cnpj) for cnpj in cnpjs]
+    resultado = array('q', [INVALIDO]) * len(todos)
+    posicoes = [i for i, digitos in enumerate(todos) if digitos is not None]
+    np = _numpy(len(posicoes))
+    if np is None:
+        for i in posicoes:
+            resultado[i] = _chave_python(todos[i])
+        return resultado
+    matriz = (np.frombuffer(b''.join(todos[i] for i in posicoes), dtype=np.uint8)
+              .reshape(-1, 14).astype(np.int64) - 48)
+    validos = np.ones(len(posicoes), dtype=bool)
+    for coluna, pesos in ((12, PESOS_DV1), (13, PESOS_DV2)):
+        resto = matriz[:, :coluna] @ np.array(pesos, dtype=np.int64) % 11
+        validos &= matriz[:, coluna] == np.where(resto < 2, 0, 11 - resto)
+    valores = matriz @ (10 ** np.arange(13, -1, -1, dtype=np.int64))
+    saida = np.frombuffer(resultado, dtype=np.int64)  # escreve direto no array de resultado
+    saida[np.array(posicoes, dtype=np.int64)] = np.where(validos, valores, INVALIDO)
+    return resultado
+
+
+def chave(cnpj: Optional[str]) -> int:
+    """Chave inteira de um CNPJ, ou INVALIDO"""
+    digitos = _digitos(cnpj)
+    return INVALIDO if digitos is None else _chave_python(digitos)
+
+
+def pasta(chave: int) -> str:
+    """Nome da pasta de uma chave: os 14 dígitos, com os zeros à esquerda"""
+    return f'{chave:014d}'
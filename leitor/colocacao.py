@@ -0,0 +1,185 @@
+"""Colocação de arquivos no destino: cópia, hardlink, reflink, symlink ou mover
+
+Os modos diferentes de "copia" evitam duplicar os bytes dos PDFs a cada execução. Quando
+o modo pedido não é suportado (outro sistema de arquivos, falta de permissão, Windows
+sem privilégio de symlink...), o arquivo é copiado normalmente. Um reflink sem suporte a
+clone que o kernel ainda consegue copiar (copy_file_range) conta como "copia_kernel": os
+bytes foram copiados, só que sem passar pelo processo.
+
+Um destino deixado por uma execução anterior em outro modo pode ser um hardlink ou um
+symlink para a entrada; antes de gravar por cima dele, o link é removido, senão a cópia
+escreveria dentro do próprio PDF de entrada.
+
+Um membro de pacote ZIP/TAR (leitor.pacotes) é sempre gravado direto do pacote no
+destino, em qualquer modo: não há arquivo para ligar nem para tirar do pacote.
+
+O modo padrão pode ser definido pela variável de ambiente LEITOR_MODO.
+"""
+import errno
+import os
+import shutil
+import stat
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+from leitor import pacotes
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MODOS = ('copia', 'hardlink', 'reflink', 'symlink', 'mover')
+MODO_PADRAO = os.environ.get('LEITOR_MODO', 'copia')
+FICLONE = 0x40049409  # ioctl do Linux que clona o arquivo (btrfs, xfs, ...)
+COPIA_KERNEL = 'copia_kernel'  # modo efetivo de um reflink feito com copy_file_range
+
+
+def _clonar(origem: str, destino: str) -> Optional[str]:
+    """Cria destino a partir de origem sem passar os bytes pelo processo
+
+    Retorna 'reflink' se os blocos passaram a ser compartilhados, COPIA_KERNEL se o kernel
+    copiou os bytes (copy_file_range, que só vira reflink em alguns sistemas de arquivos)
+    e None se não houver suporte a nenhum dos dois.
+    """
+    with open(origem, 'rb') as fs, open(destino, 'wb') as fd:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+                return 'reflink'
+            except OSError:
+                pass
+        if not hasattr(os, 'copy_file_range'):
+            return None
+        restante = os.fstat(fs.fileno()).st_size
+        try:
+            while restante > 0:
+                copiados = os.copy_file_range(fs.fileno(), fd.fileno(), restante)
+                if copiados == 0:
+                    break
+                restante -= copiados
+        except OSError:
+            return None
+        return COPIA_KERNEL if restante == 0 else None
+
+
+class Colocador:
+    def __init__(self, modo: str = MODO_PADRAO) -> None:
+        if modo not in MODOS:
+            raise ValueError(f"Modo de colocação inválido: {modo!r} (use um de {', '.join(MODOS)})")
+        self.modo = modo
+        self.contagem: Counter = Counter()  # arquivos por modo efetivamente usado
+        self.bytes_copiados = 0
+        self.fallbacks = 0
+        self._trava = threading.Lock()  # os contadores podem ser atualizados por várias threads
+
+    def colocar(self, origem: str, destino: str) -> str:
+        """Coloca origem em destino no modo configurado e retorna o modo efetivamente usado"""
+        if os.path.isdir(destino):
+            destino = os.path.join(destino, os.path.basename(origem))
+        modo = self.modo
+        if pacotes.separar(origem) is not None:
+            self._extrair(origem, destino)
+            with self._trava:
+                self.contagem['copia'] += 1
+                self.fallbacks += modo != 'copia'
+            return 'copia'
+        try:
+            if modo == 'mover':
+                shutil.move(origem, destino)
+            elif modo == 'hardlink':
+                self._remover_destino(origem, destino)
+                if not os.path.exists(destino):
+                    os.link(origem, destino)
+            elif modo == 'symlink':
+                self._remover_destino(origem, destino)
+                os.symlink(os.path.abspath(origem), destino)
+            elif modo == 'reflink':
+                self._desligar_destino(destino)
+                clonado = _clonar(origem, destino)
+                if clonado is None:
+                    raise OSError(errno.EOPNOTSUPP, "reflink não suportado")
+                shutil.copystat(origem, destino)
+                if clonado == COPIA_KERNEL:
+                    tamanho = os.path.getsize(destino)
+                    with self._trava:
+                        self.bytes_copiados += tamanho
+                        self.fallbacks += 1
+                    modo = COPIA_KERNEL
+            else:
+                self._copiar(origem, destino)
+        except (OSError, NotImplementedError) as e:
+            if modo in ('copia', 'mover') or getattr(e, 'errno', None) == errno.ENOENT:
+                raise
+            # Modo sem suporte neste destino: recorre à cópia comum
+            with self._trava:
+                self.fallbacks += 1
+            if os.path.lexists(destino) and not os.path.isdir(destino):
+                os.remove(destino)
+            modo = 'copia'
+            self._copiar(origem, destino)
+        with self._trava:
+            self.contagem[modo] += 1
+        return modo
+
+    def colocar_pasta(self, origem: str, destino: str, manter_origem: bool = False) -> None:
+        """Coloca uma pasta inteira, arquivo a arquivo, no modo configurado
+
+        Com manter_origem, o modo 'mover' copia a pasta: ela ainda vai ser colocada em
+        outro destino.
+        """
+        if self.modo != 'mover':
+            shutil.copytree(origem, destino, copy_function=self.colocar)
+        elif manter_origem:
+            shutil.copytree(origem, destino, copy_function=self._copiar_arquivo)
+        else:
+            shutil.move(origem, destino)
+
+    def estatisticas(self) -> Dict[str, int]:
+        return {**self.contagem, 'bytes_copiados': self.bytes_copiados, 'fallbacks': self.fallbacks}
+
+    def _copiar_arquivo(self, origem: str, destino: str) -> str:
+        self._copiar(origem, destino)
+        with self._trava:
+            self.contagem['copia'] += 1
+        return 'copia'
+
+    def _copiar(self, origem: str, destino: str) -> None:
+        self._desligar_destino(destino)
+        shutil.copy2(origem, destino)
+        tamanho = os.path.getsize(destino)
+        with self._trava:
+            self.bytes_copiados += tamanho
+
+    def _extrair(self, origem: str, destino: str) -> None:
+        """Grava o membro de pacote origem em destino, em blocos"""
+        with pacotes.abrir(origem) as fs, open(destino, 'wb') as fd:
+            shutil.copyfileobj(fs, fd, 2 ** 20)
+            tamanho = fd.tell()
+        with self._trava:
+            self.bytes_copiados += tamanho
+
+    @staticmethod
+    def _desligar_destino(destino: str) -> None:
+        """Remove um destino que é symlink ou hardlink: gravar nele alteraria o arquivo ligado"""
+        try:
+            info = os.lstat(destino)
+        except FileNotFoundError:
+            return
+        if stat.S_ISLNK(info.st_mode) or (stat.S_ISREG(info.st_mode) and info.st_nlink > 1):
+            os.remove(destino)
+
+    @staticmethod
+    def _remover_destino(origem: str, destino: str) -> None:
+        """Remove um destino antigo (como a cópia faria ao sobrescrever), exceto se já for o mesmo arquivo"""
+        if not os.path.lexists(destino):
+            return
+        if os.path.exists(destino) and not os.path.islink(destino) and os.path.samefile(origem, destino):
+            return
+        os.remove(destino)
+
+
+def colocar(origem: str, destino: str, modo: str = MODO_PADRAO) -> str:
+    """Atalho para colocar um único arquivo"""
+    return Colocador(modo).colocar(origem, destino)
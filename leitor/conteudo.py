@@ -0,0 +1,185 @@
+"""Leitura rápida dos CNPJs direto dos streams de conteúdo do PDF, sem o PyPDF2
+
+Nos modelos de boleto e NF que recebemos os CNPJs aparecem como texto simples nos
+operadores de texto (Tj, TJ, ' e ") do único stream de conteúdo da página. Aqui os
+streams FlateDecode são descomprimidos com zlib e só os blocos BT ... ET são percorridos;
+o resto do stream (desenhos, códigos de barras, imagens) não é interpretado.
+
+ler_cnpjs devolve None sempre que o resultado puder divergir do extract_text do PyPDF2:
+arquivo criptografado ou com atualizações incrementais, fontes compostas (Type0) ou com
+CMap, /Differences que troque dígitos ou a pontuação do CNPJ, texto em mais de um stream
+(mais de uma página, XObjects), um CNPJ que dependa de como os pedaços de texto são
+juntados, ou menos CNPJs que o pedido. Nesses casos quem chama volta ao PyPDF2.
+"""
+import re
+import zlib
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from leitor import campos
+
+CNPJ_PATTERN = re.compile(campos.CNPJ)
+# Caracteres de um CNPJ formatado; um /Differences que troque algum deles muda o texto
+CARACTERES_CNPJ = frozenset(b'0123456789./-')
+
+_STREAM = re.compile(rb'>>\s*stream(?:\r\n|\n|\r)')
+_IGNORADOS = re.compile(rb'/Subtype\s*/(?:Image|Type1C|CIDFontType0C|OpenType|XML)|/Length[123]\b'
+                        rb'|/Type\s*/(?:Metadata|XRef|EmbeddedFile)|/FunctionType|/ShadingType|/N\s+\d')
+_FLATE = re.compile(rb'/Filter\s*(?:/FlateDecode|\[\s*/FlateDecode\s*\])')
+_RECUSAR = re.compile(rb'/Encrypt\b|/Type0\b|/Identity-[HV]|begincmap')
+_DIFERENCAS = re.compile(rb'/Differences\s*\[([^\]]*)\]')
+_PAGINA = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+_BT = re.compile(rb'(?<![^\s\]\)>])BT(?=[\s\[\(<])')
+_TOKEN = re.compile(rb'\s*(<<|>>|\((?:[^()\\]|\\.|\((?:[^()\\]|\\.)*\))*\)|<[0-9A-Fa-f\s]*>|\[|\]'
+                    rb'|/[^\s()<>\[\]{}/%]*|%[^\r\n]*|[^\s()<>\[\]{}/%]+)', re.S)
+_ESCAPE = re.compile(rb'\\([0-7]{1,3}|\r\n|[\s\S])')
+_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f', b'\r\n': b'', b'\n': b'', b'\r': b''}
+
+
+class LeituraRapida(NamedTuple):
+    """CNPJs encontrados nos operadores de texto e o texto usado na busca"""
+    cnpjs: List[str]
+    texto: str
+    paginas: int
+
+
+def _escape(m: 're.Match') -> bytes:
+    codigo = m.group(1)
+    if codigo[:1].isdigit():
+        return bytes([int(codigo, 8) & 0xFF])
+    return _ESCAPES.get(codigo, codigo)
+
+
+def _texto_literal(token: bytes) -> str:
+    return _ESCAPE.sub(_escape, token[1:-1]).decode('latin-1')
+
+
+def _texto_hex(token: bytes) -> str:
+    digitos = re.sub(rb'\s', b'', token[1:-1])
+    if len(digitos) % 2:
+        digitos += b'0'
+    return bytes.fromhex(digitos.decode('ascii')).decode('latin-1')
+
+
+def _string(token: bytes) -> Optional[str]:
+    if token[:1] == b'(':
+        return _texto_literal(token)
+    if token[:1] == b'<' and token[:2] != b'<<':
+        return _texto_hex(token)
+    return None
+
+
+def pedacos_de_texto(conteudo: bytes) -> Iterator[str]:
+    """Produz, na ordem do stream, cada pedaço de texto mostrado pelos operadores de texto
+
+    Levanta ValueError se um bloco BT não puder ser percorrido até o ET.
+    """
+    posicao = 0
+    while True:
+        bt = _BT.search(conteudo, posicao)
+        if bt is None:
+            return
+        posicao = bt.end()
+        operandos: List[str] = []
+        arranjo: Optional[List[str]] = None
+        while True:
+            m = _TOKEN.match(conteudo, posicao)
+            if m is None or m.end() == posicao:
+                raise ValueError("bloco de texto sem ET ou com string malformada")
+            posicao = m.end()
+            token = m.group(1)
+            texto = _string(token)
+            if texto is not None:
+                (arranjo if arranjo is not None else operandos).append(texto)
+            elif token == b'[':
+                arranjo = []
+            elif token == b']':
+                operandos.append(arranjo or [])
+                arranjo = None
+            elif token[:1] in b'/%<>' or token[:1].isdigit() or token[:1] in b'+-.':
+                continue  # nomes, comentários, dicionários e números não mudam o estado
+            else:
+                if token == b'ET':
+                    break
+                if token == b'TJ' and operandos and isinstance(operandos[-1], list):
+                    yield from operandos[-1]
+                elif token in (b'Tj', b"'", b'"') and operandos and isinstance(operandos[-1], str):
+                    yield operandos[-1]
+                operandos = []
+
+
+def _remapeia_cnpj(diferencas: bytes) -> bool:
+    """Indica se um array /Differences troca algum caractere usado nos CNPJs"""
+    codigo = 0
+    for token in re.findall(rb'\d+|/[^\s/\[\]]*', diferencas):
+        if token[:1].isdigit():
+            codigo = int(token)
+        else:
+            if codigo in CARACTERES_CNPJ:
+                return True
+            codigo += 1
+    return False
+
+
+def _streams(dados) -> Iterator[Tuple[bytes, bytes]]:
+    """Produz (dicionário, bytes brutos) de cada stream do arquivo"""
+    for m in _STREAM.finditer(dados):
+        inicio_dict = dados.rfind(b'obj', 0, m.start())
+        fim = dados.find(b'endstream', m.end())
+        if inicio_dict < 0 or fim < 0:
+            continue
+        yield dados[inicio_dict + 3:m.start() + 2], dados[m.end():fim]
+
+
+def ler_cnpjs(dados, minimo: int = 1, teto_bytes: Optional[int] = None) -> Optional[LeituraRapida]:
+    """Lê os CNPJs dos operadores de texto dos bytes de um PDF (bytes ou mmap)
+
+    Retorna None quando o atalho não é confiável ou encontra menos de minimo CNPJs. Um
+    stream que descomprimido passe de teto_bytes também faz a leitura desistir.
+    """
+    fim_arquivo = dados.find(b'%%EOF')
+    if fim_arquivo < 0 or dados.rfind(b'%%EOF') != fim_arquivo:
+        return None  # atualizações incrementais: o arquivo tem mais de uma versão das páginas
+    objetos = [dados]  # onde procurar fontes e páginas (o arquivo e os streams de objetos)
+    textos: List[List[str]] = []
+    for dicionario, bruto in _streams(dados):
+        if _IGNORADOS.search(dicionario):
+            continue
+        if b'/Filter' not in dicionario:
+            conteudo = bruto
+        elif _FLATE.search(dicionario) and b'/DecodeParms' not in dicionario:
+            descompressor = zlib.decompressobj()
+            try:
+                conteudo = descompressor.decompress(bruto, teto_bytes or 0)
+            except zlib.error:
+                return None
+            if descompressor.unconsumed_tail:
+                return None
+        else:
+            return None  # outro filtro num stream que pode ser de conteúdo
+        if re.search(rb'/Type\s*/ObjStm', dicionario):
+            objetos.append(conteudo)
+            continue
+        try:
+            pedacos = list(pedacos_de_texto(conteudo))
+        except ValueError:
+            return None
+        if any(pedacos):
+            textos.append(pedacos)
+        elif b'begincmap' in conteudo:
+            return None
+    if len(textos) != 1:
+        return None
+    for trecho in objetos:
+        if _RECUSAR.search(trecho):
+            return None
+        if any(_remapeia_cnpj(m.group(1)) for m in _DIFERENCAS.finditer(trecho)):
+            return None
+    paginas = sum(len(_PAGINA.findall(trecho)) for trecho in objetos)
+
+    # O PyPDF2 pode juntar dois pedaços com espaço, quebra de linha ou nada; o resultado só
+    # vale se os CNPJs forem os mesmos com os pedaços todos colados e todos separados
+    separado = '\n'.join(textos[0])
+    cnpjs = CNPJ_PATTERN.findall(separado)
+    if not paginas or len(cnpjs) < minimo or CNPJ_PATTERN.findall(''.join(textos[0])) != cnpjs:
+        return None
+    return LeituraRapida(cnpjs, separado, paginas)
@@ -0,0 +1,168 @@
+"""Diário da execução, para retomar uma organização interrompida (--resume)
+
+Cada etapa concluída vira uma linha JSON acrescentada ao diário (ORGANIZADOS/.diario.jsonl):
+
+    {"op": "lido", ...}     PDF lido: tamanho, mtime e o registro (Documento) extraído
+    {"op": "inicio", ...}   colocação de origem em destino começando
+    {"op": "fim", ...}      colocação concluída, com o modo efetivamente usado
+
+As linhas são gravadas em lotes e o fsync é feito a cada LOTE_FSYNC linhas ou
+INTERVALO_FSYNC segundos, não a cada linha. Uma linha perdida na queda só faz a etapa ser
+repetida: a leitura é determinística e colocar de novo sobrescreve o destino.
+
+Ao retomar, as leituras cujo arquivo não mudou (tamanho e mtime) e as colocações
+concluídas cujo destino ainda existe são puladas. Uma colocação iniciada e não concluída
+é levada adiante ou desfeita: um "mover" cuja origem sumiu e cujo destino existe já
+terminou (o shutil.move entre sistemas de arquivos copia e depois apaga a origem); nos
+outros casos o destino, possivelmente incompleto, é apagado e a colocação é refeita.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from leitor.pacotes import estado, existe
+
+DIARIO_PADRAO = '.diario.jsonl'
+LOTE_FSYNC = 256       # linhas gravadas entre dois fsync
+INTERVALO_FSYNC = 1.0  # segundos, no máximo, entre dois fsync
+
+
+class Diario:
+    """Diário só de acréscimo; com retomar, as etapas do diário existente valem para esta execução"""
+
+    def __init__(self, caminho: str, retomar: bool = False) -> None:
+        self.caminho = os.path.abspath(caminho)
+        self.leituras: Dict[str, dict] = {}
+        self.colocados: Dict[Tuple[str, str], Optional[str]] = {}  # (origem, destino) -> modo
+        self.avancados: List[Tuple[str, str]] = []  # colocações interrompidas dadas como concluídas
+        self.desfeitos = 0  # colocações interrompidas desfeitas (serão refeitas)
+        self._trava = threading.Lock()
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        if retomar and os.path.exists(self.caminho):
+            self._recuperar()
+            modo = 'a'
+        else:
+            modo = 'w'
+        self._arquivo = open(self.caminho, modo, encoding='utf-8')
+        if modo == 'a':
+            # As colocações levadas adiante passam a constar como concluídas no próprio diário
+            for origem, destino in self.avancados:
+                self._escrever({'op': 'fim', 'origem': origem, 'destino': destino, 'modo': 'mover'})
+            self.sincronizar()
+
+    def _recuperar(self) -> None:
+        iniciados: Dict[Tuple[str, str], str] = {}
+        with open(self.caminho, encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    break  # última linha cortada pela queda
+                op = registro.get('op')
+                if op == 'lido':
+                    self.leituras[registro['caminho']] = registro
+                elif op == 'inicio':
+                    iniciados[(registro['origem'], registro['destino'])] = registro['modo']
+                elif op == 'fim':
+                    chave = (registro['origem'], registro['destino'])
+                    iniciados.pop(chave, None)
+                    self.colocados[chave] = registro['modo']
+        for (origem, destino), modo in iniciados.items():
+            if modo == 'mover' and not existe(origem) and os.path.lexists(destino):
+                self.colocados[(origem, destino)] = modo
+                self.avancados.append((origem, destino))
+            else:
+                if os.path.lexists(destino) and not os.path.isdir(destino):
+                    os.remove(destino)
+                self.desfeitos += 1
+
+    def _escrever(self, registro: dict) -> None:
+        self._arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self._pendentes += 1
+        if self._pendentes >= LOTE_FSYNC or time.monotonic() - self._ultimo_fsync >= INTERVALO_FSYNC:
+            self.sincronizar()
+
+    def sincronizar(self) -> None:
+        """Garante no disco tudo o que já foi escrito no diário"""
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def documento(self, caminho: str, limite_cnpjs: Optional[int]) -> Optional[dict]:
+        """Registro lido antes da queda, se o arquivo não mudou e a leitura cobre limite_cnpjs"""
+        registro = self.leituras.get(os.path.abspath(caminho))
+        if registro is None:
+            return None
+        limite = registro['limite_cnpjs']
+        if limite is not None and (limite_cnpjs is None or limite < limite_cnpjs):
+            return None
+        try:
+            tamanho, mtime_ns = estado(caminho)
+        except OSError:
+            return None
+        if tamanho != registro['tamanho'] or mtime_ns != registro['mtime_ns']:
+            return None
+        return registro['documento']
+
+    def lido(self, caminho: str, documento: dict, limite_cnpjs: Optional[int]) -> None:
+        caminho = os.path.abspath(caminho)
+        tamanho, mtime_ns = estado(caminho)
+        with self._trava:
+            self._escrever({'op': 'lido', 'caminho': caminho, 'tamanho': tamanho, 'mtime_ns': mtime_ns,
+                            'limite_cnpjs': limite_cnpjs, 'documento': documento})
+
+    def iniciar(self, origem: str, destino: str, modo: str) -> None:
+        with self._trava:
+            self._escrever({'op': 'inicio', 'origem': origem, 'destino': destino, 'modo': modo})
+
+    def concluir(self, origem: str, destino: str, modo: Optional[str]) -> None:
+        with self._trava:
+            self._escrever({'op': 'fim', 'origem': origem, 'destino': destino, 'modo': modo})
+
+    def fechar(self, concluido: bool = False) -> None:
+        """Fecha o diário; com concluido (nada falhou na execução) ele é apagado, não há o que retomar"""
+        with self._trava:
+            self.sincronizar()
+            self._arquivo.close()
+        if concluido:
+            os.remove(self.caminho)
+
+
+class ColocadorDiario:
+    """Envolve um Colocador: anota cada colocação no diário e pula as já concluídas antes da queda"""
+
+    def __init__(self, colocador, diario: Diario) -> None:
+        self.colocador = colocador
+        self.diario = diario
+        self.retomados = 0
+        self._trava = threading.Lock()
+        # Modo do Colocador de fato, por baixo de outros envoltórios (duplicatas, incremental)
+        interno = colocador
+        while not hasattr(interno, 'modo') and hasattr(interno, 'colocador'):
+            interno = interno.colocador
+        self.modo = getattr(interno, 'modo', '')
+
+    def colocar(self, origem: str, destino: str) -> Optional[str]:
+        if os.path.isdir(destino):
+            destino = os.path.join(destino, os.path.basename(origem))
+        origem, destino = os.path.abspath(origem), os.path.abspath(destino)
+        chave = (origem, destino)
+        if chave in self.diario.colocados and os.path.lexists(destino):
+            with self._trava:
+                self.retomados += 1
+            return self.diario.colocados[chave]
+        self.diario.iniciar(origem, destino, self.modo)
+        modo = self.colocador.colocar(origem, destino)
+        self.diario.concluir(origem, destino, modo)
+        return modo
+
+    def colocar_pasta(self, origem: str, destino: str, manter_origem: bool = False) -> None:
+        self.colocador.colocar_pasta(origem, destino, manter_origem)
+
+    def estatisticas(self) -> Dict[str, int]:
+        return {**self.colocador.estatisticas(), 'retomados': self.retomados}
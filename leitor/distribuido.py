@@ -0,0 +1,272 @@
+"""Fila de trabalho num diretório compartilhado, para dividir uma execução entre processos e máquinas
+
+Vários trabalhadores (na mesma máquina ou em máquinas que enxergam o mesmo sistema de
+arquivos) apontam para o mesmo diretório:
+
+    lotes/NNNNNN.json       itens de cada lote, escritos uma vez por quem preparar a fila
+    lotes/indice.json       quantidade de lotes; existe quando a fila está pronta
+    arrendamentos/*.lease   quem está com cada lote (ou com o preparo e a junção), e até quando
+    resultados/NNNNNN.json  resultado de cada lote; existir = lote concluído
+    concluido.json          gravado por quem juntou os resultados
+
+Um arrendamento é um arquivo criado com O_EXCL (só um trabalhador consegue) e renovado
+pelo dono a cada prazo/3 segundos, atualizando o mtime. Passado o prazo sem renovação, o
+dono é dado como morto: outro trabalhador renomeia o arquivo para um nome só seu (rename
+é atômico, só um vence) e arrenda de novo. Entre ver o arrendamento expirado e renomear,
+outro trabalhador pode ter tomado o mesmo arrendamento e criado um novo; por isso, depois
+de renomear, o arquivo tomado é conferido (mesmo inode e ainda expirado) e, se for um
+arrendamento vivo, é devolvido ao lugar com os.link, que nunca sobrescreve. O horário de
+comparação vem do próprio sistema de arquivos (mtime de um arquivo tocado agora), para
+não depender do relógio de cada máquina.
+Os resultados são gravados por arquivo temporário + os.replace e o processamento de um
+lote é determinístico, então um lote processado duas vezes (dono lento dado como morto)
+não estraga nada: só gasta tempo.
+"""
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Iterable, Iterator, List, Optional
+
+PRAZO_PADRAO = float(os.environ.get('LEITOR_PRAZO', '60'))  # segundos sem renovação até o arrendamento expirar
+LOTE_PADRAO = 200  # itens por lote
+ESPERA = 0.5       # segundos entre verificações quando não há lote livre
+
+
+def gravar_json(caminho: str, dados, dono: str) -> None:
+    """Grava o JSON por inteiro ou não grava (temporário no mesmo diretório + os.replace)"""
+    temporario = f'{caminho}.{dono.replace(":", "_")}.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+
+def ler_json(caminho: str):
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class Arrendamento:
+    """Posse de um recurso da fila, renovada numa thread enquanto o bloco with estiver aberto
+
+    perdido fica verdadeiro se outro trabalhador tomar o arrendamento (o dono demorou mais
+    que o prazo para renovar); quem processa deve então descartar o trabalho.
+    """
+
+    def __init__(self, caminho: str, dono: str, prazo: float) -> None:
+        self.caminho = caminho
+        self.dono = dono
+        self.prazo = prazo
+        self.perdido = False
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._renovar, name='arrendamento', daemon=True)
+
+    def _meu(self) -> bool:
+        try:
+            with open(self.caminho, encoding='utf-8') as f:
+                return json.load(f).get('dono') == self.dono
+        except (OSError, ValueError):
+            return False
+
+    def _renovar(self) -> None:
+        while not self._parar.wait(self.prazo / 3):
+            if not self._meu():
+                self.perdido = True
+                return
+            try:
+                os.utime(self.caminho)
+            except OSError:
+                self.perdido = True
+                return
+
+    def __enter__(self) -> 'Arrendamento':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._parar.set()
+        self._thread.join()
+        if self._meu():
+            try:
+                os.remove(self.caminho)
+            except FileNotFoundError:
+                pass
+
+
+class FilaCompartilhada:
+    """Fila de lotes num diretório; cada trabalhador cria a sua instância apontando para o mesmo lugar"""
+
+    def __init__(self, diretorio: str, prazo: float = PRAZO_PADRAO, dono: Optional[str] = None) -> None:
+        self.diretorio = os.path.abspath(diretorio)
+        self.prazo = prazo
+        self.dono = dono or f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self._lotes = os.path.join(self.diretorio, 'lotes')
+        self._arrendamentos = os.path.join(self.diretorio, 'arrendamentos')
+        self._resultados = os.path.join(self.diretorio, 'resultados')
+        for pasta in (self._lotes, self._arrendamentos, self._resultados):
+            os.makedirs(pasta, exist_ok=True)
+
+    # Arrendamentos
+
+    def agora(self) -> float:
+        """Horário do sistema de arquivos compartilhado (mtime de um arquivo tocado agora)"""
+        relogio = os.path.join(self._arrendamentos, f'relogio.{self.dono.replace(":", "_")}')
+        with open(relogio, 'a'):
+            pass
+        os.utime(relogio)
+        return os.stat(relogio).st_mtime
+
+    def arrendar(self, nome: str) -> Optional[Arrendamento]:
+        """Tenta ficar com o recurso nome; None se outro trabalhador vivo já estiver com ele"""
+        caminho = os.path.join(self._arrendamentos, f'{nome}.lease')
+        for _ in range(2):
+            try:
+                descritor = os.open(caminho, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                try:
+                    visto = os.stat(caminho)
+                except FileNotFoundError:
+                    continue  # liberado agora há pouco
+                if visto.st_mtime + self.prazo >= self.agora():
+                    return None
+                if not self._tomar_expirado(caminho, visto):
+                    return None
+                continue
+            with os.fdopen(descritor, 'w', encoding='utf-8') as f:
+                json.dump({'dono': self.dono, 'inicio': time.time()}, f)
+            return Arrendamento(caminho, self.dono, self.prazo)
+        return None
+
+    def _tomar_expirado(self, caminho: str, visto: os.stat_result) -> bool:
+        """Remove o arrendamento expirado visto em caminho; False se ele já não era o mesmo
+
+        O rename para um nome só deste trabalhador é atômico (só um vence), mas o arquivo
+        renomeado pode ser um arrendamento novo, criado depois do stat por quem tomou o
+        expirado antes. A conferência depois do rename (mesmo inode, mtime ainda vencido)
+        fecha essa janela; um arrendamento vivo tomado por engano volta para o lugar.
+        """
+        tomado = f'{caminho}.expirado.{self.dono.replace(":", "_")}'
+        try:
+            os.rename(caminho, tomado)
+        except FileNotFoundError:
+            return False  # outro trabalhador tomou antes
+        atual = os.stat(tomado)
+        if atual.st_ino == visto.st_ino and atual.st_mtime + self.prazo < self.agora():
+            os.remove(tomado)
+            return True
+        try:
+            os.link(tomado, caminho)  # devolve sem sobrescrever um arrendamento criado nesse meio-tempo
+        except FileExistsError:
+            pass  # o dono devolvido vê o arrendamento de outro e descarta o trabalho (perdido)
+        except OSError:  # sistema de arquivos sem hardlink
+            if not os.path.exists(caminho):
+                os.rename(tomado, caminho)
+                return False
+        os.remove(tomado)
+        return False
+
+    def esperar_arrendamento(self, nome: str, pronto: Callable[[], bool]) -> Optional[Arrendamento]:
+        """Arrenda nome, esperando enquanto outro trabalhador estiver com ele; None quando pronto() ficar verdadeiro"""
+        while not pronto():
+            arrendamento = self.arrendar(nome)
+            if arrendamento is not None:
+                if pronto():  # o dono anterior terminou entre a verificação e o arrendamento
+                    arrendamento.__exit__(None, None, None)
+                    return None
+                return arrendamento
+            time.sleep(ESPERA)
+        return None
+
+    # Lotes
+
+    def _lote(self, numero: int) -> str:
+        return os.path.join(self._lotes, f'{numero:06d}.json')
+
+    def _resultado(self, numero: int) -> str:
+        return os.path.join(self._resultados, f'{numero:06d}.json')
+
+    def _indice(self) -> str:
+        return os.path.join(self._lotes, 'indice.json')
+
+    def pronta(self) -> bool:
+        return os.path.exists(self._indice())
+
+    def preparar(self, itens: Callable[[], Iterable], tamanho: int = LOTE_PADRAO) -> int:
+        """Divide itens() em lotes, se nenhum outro trabalhador já tiver feito isso; retorna o total de lotes
+
+        Só o trabalhador que arrendar o preparo chama itens(); os outros esperam o índice.
+        """
+        arrendamento = self.esperar_arrendamento('preparo', self.pronta)
+        if arrendamento is not None:
+            with arrendamento:
+                total = 0
+                atual: List = []
+                for item in itens():
+                    atual.append(item)
+                    if len(atual) == tamanho:
+                        gravar_json(self._lote(total), atual, self.dono)
+                        total, atual = total + 1, []
+                if atual:
+                    gravar_json(self._lote(total), atual, self.dono)
+                    total += 1
+                gravar_json(self._indice(), {'lotes': total, 'tamanho': tamanho}, self.dono)
+        return ler_json(self._indice())['lotes']
+
+    def pendentes(self) -> List[int]:
+        """Lotes ainda sem resultado"""
+        total = ler_json(self._indice())['lotes']
+        feitos = set(os.listdir(self._resultados))
+        return [numero for numero in range(total) if f'{numero:06d}.json' not in feitos]
+
+    def trabalhar(self, processar: Callable[[list], object]) -> int:
+        """Processa lotes livres até todos terem resultado; retorna quantos lotes este trabalhador concluiu
+
+        processar recebe os itens do lote e devolve o resultado (serializável em JSON).
+        """
+        concluidos = 0
+        while True:
+            pendentes = self.pendentes()
+            if not pendentes:
+                return concluidos
+            # Cada trabalhador começa num ponto diferente da lista, para disputarem menos os mesmos lotes
+            inicio = hash(self.dono) % len(pendentes)
+            arrendou = False
+            for numero in pendentes[inicio:] + pendentes[:inicio]:
+                if os.path.exists(self._resultado(numero)):
+                    continue
+                arrendamento = self.arrendar(f'{numero:06d}')
+                if arrendamento is None:
+                    continue
+                arrendou = True
+                with arrendamento:
+                    if os.path.exists(self._resultado(numero)):
+                        continue  # concluído pelo dono anterior, que foi dado como morto
+                    resultado = processar(ler_json(self._lote(numero)))
+                    if not arrendamento.perdido:
+                        gravar_json(self._resultado(numero), resultado, self.dono)
+                        concluidos += 1
+            if not arrendou:
+                time.sleep(ESPERA)  # o que falta está com outros trabalhadores
+
+    def resultados(self) -> Iterator:
+        """Resultados de todos os lotes, na ordem dos lotes"""
+        for numero in range(ler_json(self._indice())['lotes']):
+            yield ler_json(self._resultado(numero))
+
+    def concluida(self) -> bool:
+        return os.path.exists(os.path.join(self.diretorio, 'concluido.json'))
+
+    def juntar(self, funcao: Callable[[Iterator], dict]) -> Optional[dict]:
+        """Um único trabalhador chama funcao(resultados()) e grava concluido.json; os outros esperam
+
+        Retorna o que funcao devolveu para quem juntou, e None para os demais.
+        """
+        arrendamento = self.esperar_arrendamento('juncao', self.concluida)
+        if arrendamento is None:
+            return None
+        with arrendamento:
+            resumo = funcao(self.resultados())
+            gravar_json(os.path.join(self.diretorio, 'concluido.json'), dict(resumo, dono=self.dono), self.dono)
+        return resumo
@@ -0,0 +1,133 @@
+"""Registro em memória dos documentos lidos em uma execução"""
+import os
+import sys
+from array import array
+from itertools import islice
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from leitor import cnpj
+
+STATUS_OK = 'ok'              # PDF lido e com segundo CNPJ
+STATUS_SEM_CNPJ = 'sem_cnpj'  # PDF lido, mas sem segundo CNPJ
+STATUS_ERRO = 'erro'          # Falha ao ler o PDF
+
+
+class Documento(NamedTuple):
+    """Um PDF lido uma única vez na execução; as etapas seguintes e o relatório usam este registro"""
+    caminho: str
+    nome: str
+    tamanho: int
+    cnpjs: Tuple[str, ...]
+    status: str
+    erro: Optional[str] = None
+    valores: Tuple[str, ...] = ()
+    linhas_digitaveis: Tuple[str, ...] = ()
+
+    @property
+    def segundo_cnpj(self) -> Optional[str]:
+        return self.cnpjs[1] if len(self.cnpjs) > 1 else None
+
+    @property
+    def terceiro_cnpj(self) -> Optional[str]:
+        return self.cnpjs[2] if len(self.cnpjs) > 2 else None
+
+
+def documento_de_dict(dados: dict) -> Documento:
+    """Reconstrói um Documento gravado em JSON (as listas voltam a ser tuplas)"""
+    return Documento(**{k: tuple(v) if isinstance(v, list) else v for k, v in dados.items()})
+
+
+def status_de(cnpjs: Tuple[str, ...], erro: Optional[str]) -> str:
+    """Define o status do documento a partir do resultado da extração"""
+    if erro:
+        return STATUS_ERRO
+    return STATUS_OK if len(cnpjs) > 1 else STATUS_SEM_CNPJ
+
+
+class TabelaDocumentos:
+    """Documentos em colunas: nomes numa lista, pasta e segundo e terceiro CNPJ em arrays de inteiros
+
+    Cada CNPJ é guardado como chave inteira (leitor.cnpj.chaves), com os dígitos
+    verificadores conferidos em lote na entrada; um CNPJ inválido vale cnpj.INVALIDO.
+    O caminho de cada documento é o nome mais o índice da pasta, guardada uma vez só.
+    Sem um objeto por documento nem os CNPJs em texto, a tabela ocupa uma fração de uma
+    lista de Documento, e os agrupamentos são feitos por chave inteira.
+    """
+    __slots__ = ('nomes', 'pastas', '_indices', 'indice_pasta', 'segundos', 'terceiros', 'outros_caminhos', 'erros')
+
+    LOTE = 65536  # documentos conferidos de cada vez na entrada
+
+    def __init__(self, documentos: Iterable[Documento] = ()) -> None:
+        self.nomes: List[str] = []
+        self.pastas: List[str] = []
+        self._indices: Dict[str, int] = {}  # pasta -> posição em pastas
+        self.indice_pasta = array('I')
+        self.segundos = array('q')
+        self.terceiros = array('q')
+        self.outros_caminhos: Dict[int, str] = {}  # linha -> caminho que não termina no nome
+        self.erros: Dict[int, str] = {}  # linha -> erro de leitura (só as que falharam)
+        self.adicionar(documentos)
+
+    def __len__(self) -> int:
+        return len(self.nomes)
+
+    def adicionar(self, documentos: Iterable[Documento]) -> None:
+        documentos = iter(documentos)
+        while True:
+            lote = list(islice(documentos, self.LOTE))
+            if not lote:
+                return
+            for linha, doc in enumerate(lote, len(self.nomes)):
+                pasta, nome = os.path.split(doc.caminho)
+                if nome != doc.nome:
+                    self.outros_caminhos[linha] = doc.caminho
+                if pasta not in self._indices:
+                    self._indices[pasta] = len(self.pastas)
+                    self.pastas.append(pasta)
+                self.indice_pasta.append(self._indices[pasta])
+                if doc.erro:
+                    self.erros[linha] = doc.erro
+            self.nomes.extend(doc.nome for doc in lote)
+            self.segundos.extend(cnpj.chaves(doc.segundo_cnpj for doc in lote))
+            self.terceiros.extend(cnpj.chaves(doc.terceiro_cnpj for doc in lote))
+
+    def caminho(self, linha: int) -> str:
+        if linha in self.outros_caminhos:
+            return self.outros_caminhos[linha]
+        return os.path.join(self.pastas[self.indice_pasta[linha]], self.nomes[linha])
+
+    def agrupar(self) -> Dict[int, List[int]]:
+        """{chave do segundo CNPJ: [linhas]}, na ordem de entrada; as linhas sem CNPJ válido ficam de fora"""
+        grupos: Dict[int, List[int]] = {}
+        for linha, chave in enumerate(self.segundos):
+            if chave != cnpj.INVALIDO:
+                grupos.setdefault(chave, []).append(linha)
+        return grupos
+
+    def sem_cnpj(self) -> List[int]:
+        """Linhas sem segundo CNPJ válido"""
+        return [linha for linha, chave in enumerate(self.segundos) if chave == cnpj.INVALIDO]
+
+    def memoria(self) -> int:
+        """Bytes ocupados pela tabela: colunas, textos, pastas, caminhos à parte e erros"""
+        total = sum(map(sys.getsizeof, (self.nomes, self.indice_pasta, self.segundos, self.terceiros)))
+        total += sum(map(sys.getsizeof, self.nomes)) + sys.getsizeof(self.pastas) + sys.getsizeof(self._indices)
+        total += sum(map(sys.getsizeof, self.pastas))
+        for extras in (self.outros_caminhos, self.erros):
+            total += sys.getsizeof(extras) + sum(map(sys.getsizeof, extras.values()))
+        return total
+
+
+def agrupar_por_segundo_cnpj(documentos: Iterable[Documento]) -> Dict[int, List[str]]:
+    """Agrupa os nomes dos arquivos em {chave do CNPJ: [arquivos]} pelo segundo CNPJ, mantendo a ordem de leitura
+
+    Só entram CNPJs com dígitos verificadores corretos; a pasta de cada grupo é cnpj.pasta(chave).
+    """
+    tabela = TabelaDocumentos(documentos)
+    return {chave: [tabela.nomes[linha] for linha in linhas] for chave, linhas in tabela.agrupar().items()}
+
+
+def sem_segundo_cnpj(documentos: Iterable[Documento]) -> List[str]:
+    """Nomes dos documentos dos quais não foi possível identificar um segundo CNPJ válido"""
+    tabela = TabelaDocumentos(documentos)
+    return [tabela.nomes[linha] for linha in tabela.sem_cnpj()]
@@ -0,0 +1,157 @@
+"""Detecção de PDFs duplicados antes da extração e da colocação
+
+O mesmo boleto costuma chegar salvo com nomes diferentes (com "_" ou espaços). Os
+arquivos idênticos byte a byte são encontrados em três filtros, do mais barato ao mais
+caro: tamanho, hash parcial (início e fim do arquivo) e hash completo. Opcionalmente,
+PDFs com o mesmo texto (gerados de novo, metadados diferentes) também são agrupados;
+esse critério exige ler o texto e por isso usa o cache de extração. PDFs sem texto
+extraível (NFs digitalizadas) não são comparados pelo texto: todos teriam o mesmo hash
+e seriam tomados por cópias uns dos outros. PDFs dentro de
+pacotes ZIP/TAR (leitor.pacotes) são comparados pelos bytes do membro.
+"""
+import csv
+import hashlib
+import os
+import re
+import shutil
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from leitor import pacotes
+from leitor.cache import hash_arquivo
+from leitor.colocacao import Colocador
+
+ACOES = ('manter', 'pular', 'linkar')
+BLOCO_PARCIAL = 64 * 1024
+# Textos normalizados mais curtos que isto (páginas só com imagem) não identificam o PDF
+TEXTO_MINIMO = 1
+
+
+class Duplicata(NamedTuple):
+    """Arquivo repetido e o arquivo considerado original do grupo"""
+    caminho: str
+    original: str
+    criterio: str  # "bytes" ou "texto"
+    tamanho: int
+
+
+def hash_parcial(caminho: str, bloco: int = BLOCO_PARCIAL) -> str:
+    """Hash do primeiro e do último bloco do arquivo (ou do membro de pacote)"""
+    h = hashlib.sha256()
+    tamanho = pacotes.tamanho(caminho)
+    with pacotes.abrir(caminho) as f:
+        h.update(f.read(bloco))
+        if tamanho > 2 * bloco:
+            f.seek(tamanho - bloco)
+        h.update(f.read(bloco))
+    return h.hexdigest()
+
+
+def _refinar(grupos: Iterable[List[str]], chave) -> List[List[str]]:
+    """Divide cada grupo pela chave, descartando os que ficam com um único arquivo
+
+    Arquivos cuja chave é None ficam de fora de qualquer grupo.
+    """
+    refinados = []
+    for grupo in grupos:
+        por_chave: Dict[str, List[str]] = defaultdict(list)
+        for caminho in grupo:
+            valor = chave(caminho)
+            if valor is not None:
+                por_chave[valor].append(caminho)
+        refinados.extend(g for g in por_chave.values() if len(g) > 1)
+    return refinados
+
+
+def agrupar_identicos(caminhos: Iterable[str]) -> List[List[str]]:
+    """Grupos de arquivos idênticos byte a byte (cada grupo na ordem de entrada)"""
+    por_tamanho: Dict[int, List[str]] = defaultdict(list)
+    for caminho in caminhos:
+        por_tamanho[pacotes.tamanho(caminho)].append(caminho)
+    grupos = [g for g in por_tamanho.values() if len(g) > 1]
+    grupos = _refinar(grupos, hash_parcial)
+    return _refinar(grupos, hash_arquivo)
+
+
+def hash_texto(caminho: str, cache=None) -> Optional[str]:
+    """Hash do texto extraído do PDF, com os espaços normalizados (None se não houver texto)"""
+    from leitor.extracao import extrair_dados
+
+    texto = re.sub(r'\s+', ' ', ' '.join(extrair_dados(caminho, cache)['paginas'])).strip()
+    if len(texto) < TEXTO_MINIMO:
+        return None
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def detectar(caminhos: Iterable[str], texto: bool = False, cache=None) -> List[Duplicata]:
+    """Lista as duplicatas; o primeiro arquivo de cada grupo (na ordem de entrada) é o original"""
+    caminhos = list(caminhos)
+    duplicatas = []
+    for grupo in agrupar_identicos(caminhos):
+        duplicatas.extend(Duplicata(c, grupo[0], 'bytes', pacotes.tamanho(c)) for c in grupo[1:])
+
+    if texto:
+        repetidos = {d.caminho for d in duplicatas}
+        unicos = [c for c in caminhos if c not in repetidos]
+        for grupo in _refinar([unicos], lambda c: hash_texto(c, cache)):
+            duplicatas.extend(Duplicata(c, grupo[0], 'texto', pacotes.tamanho(c)) for c in grupo[1:])
+    return duplicatas
+
+
+def mapa_originais(duplicatas: Iterable[Duplicata]) -> Dict[str, str]:
+    """{caminho absoluto da duplicata: caminho absoluto do original}"""
+    return {os.path.abspath(d.caminho): os.path.abspath(d.original) for d in duplicatas}
+
+
+def escrever_relatorio(duplicatas: Iterable[Duplicata], caminho_csv: str) -> str:
+    """Grava o relatório (CSV separado por ";") e retorna o caminho"""
+    os.makedirs(os.path.dirname(os.path.abspath(caminho_csv)), exist_ok=True)
+    with open(caminho_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['arquivo', 'original', 'criterio', 'tamanho'])
+        for d in duplicatas:
+            writer.writerow([d.caminho, d.original, d.criterio, d.tamanho])
+    return caminho_csv
+
+
+class ColocadorDuplicatas:
+    """Envolve um Colocador: duplicatas são puladas ou ligadas (hardlink) em vez de copiadas
+
+    Com 'linkar' o destino é um hardlink do próprio arquivo duplicado, de propósito: não
+    ocupa espaço, mas o destino e a duplicata na pasta de entrada são o mesmo arquivo em
+    disco (mesmo inode). Uma edição feita por um dos caminhos aparece no outro; apagar um
+    deles não apaga o outro. Membros de pacotes ZIP/TAR não têm como ser ligados e são
+    copiados. Para um destino independente da entrada, use 'manter' ou 'pular'.
+    """
+
+    def __init__(self, colocador, duplicatas: Dict[str, str], acao: str = 'pular') -> None:
+        if acao not in ACOES:
+            raise ValueError(f"Ação inválida para duplicatas: {acao!r} (use uma de {', '.join(ACOES)})")
+        self.colocador = colocador
+        self.duplicatas = duplicatas
+        self.acao = acao
+        self.ligador = Colocador('hardlink')
+        self.pulados = 0
+        self._trava = threading.Lock()
+
+    def colocar(self, origem: str, destino: str) -> Optional[str]:
+        if self.acao == 'manter' or os.path.abspath(origem) not in self.duplicatas:
+            return self.colocador.colocar(origem, destino)
+        if self.acao == 'pular':
+            with self._trava:
+                self.pulados += 1
+            return None
+        return self.ligador.colocar(origem, destino)
+
+    def colocar_pasta(self, origem: str, destino: str, manter_origem: bool = False) -> None:
+        if getattr(self.colocador, 'modo', None) == 'mover':
+            self.colocador.colocar_pasta(origem, destino, manter_origem)
+        else:
+            shutil.copytree(origem, destino, copy_function=self.colocar)
+
+    def estatisticas(self) -> Dict[str, int]:
+        estatisticas = dict(self.colocador.estatisticas())
+        for modo, quantidade in self.ligador.estatisticas().items():
+            estatisticas[modo] = estatisticas.get(modo, 0) + quantidade
+        return {**estatisticas, 'duplicatas_puladas': self.pulados}
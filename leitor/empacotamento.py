@@ -0,0 +1,164 @@
+"""Saída em pacotes: cada pasta de destino vira um único ZIP ou TAR
+
+ColocadorPacotes segue o protocolo do Colocador (colocar, colocar_pasta, estatisticas),
+mas colocar() só anota o arquivo no grupo da pasta de destino; nada é gravado nem
+nenhuma pasta é criada durante a organização. No fim, fechar() grava os pacotes um depois
+do outro, cada um numa única passada sequencial (arquivo temporário + os.replace):
+"ORGANIZADOS/<CNPJ>.zip" no lugar de "ORGANIZADOS/<CNPJ>/". Dentro de cada pacote vai
+também INDICE (JSON) com nome, tamanho, SHA-256 e origem de cada PDF.
+
+Os PDFs entram sem compressão (ZIP_STORED / TAR sem gzip): já são comprimidos por
+dentro, e assim o pacote é gravado na velocidade do disco.
+"""
+import hashlib
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+import zipfile
+from typing import Dict, List, NamedTuple, Tuple
+
+from leitor import pacotes
+
+FORMATOS = ('zip', 'tar')
+INDICE = 'indice.json'
+BLOCO = 2 ** 20
+
+
+class ResumoPacotes(NamedTuple):
+    """Resultado de ColocadorPacotes.fechar"""
+    pacotes: int
+    arquivos: int
+    segundos: float
+    bytes_gravados: int
+
+    def texto(self) -> str:
+        vazao = self.bytes_gravados / 2 ** 20 / self.segundos if self.segundos else 0.0
+        return (f"{self.arquivos} arquivo(s) em {self.pacotes} pacote(s), {self.segundos:.2f}s "
+                f"({vazao:.1f} MB/s)")
+
+
+class _Hasher:
+    """Repassa as leituras de um arquivo calculando o SHA-256 e o tamanho do que passou"""
+
+    def __init__(self, arquivo) -> None:
+        self.arquivo = arquivo
+        self.sha256 = hashlib.sha256()
+        self.lidos = 0
+
+    def read(self, n: int = -1) -> bytes:
+        dados = self.arquivo.read(n)
+        self.sha256.update(dados)
+        self.lidos += len(dados)
+        return dados
+
+
+class ColocadorPacotes:
+    def __init__(self, formato: str = 'zip') -> None:
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de pacote inválido: {formato!r} (use um de {', '.join(FORMATOS)})")
+        self.formato = formato
+        self.grupos: Dict[str, Dict[str, str]] = {}  # pasta de destino -> {nome: origem}
+        self.bytes_copiados = 0
+        self._trava = threading.Lock()
+
+    def colocar(self, origem: str, destino: str) -> str:
+        """Anota origem no pacote da pasta de destino; um nome repetido fica com a última origem"""
+        pasta, nome = os.path.split(os.path.abspath(destino))
+        with self._trava:
+            self.grupos.setdefault(pasta, {})[nome] = origem
+        return 'pacote'
+
+    def colocar_pasta(self, origem: str, destino: str, manter_origem: bool = False) -> None:
+        for raiz, _, arquivos in os.walk(origem):
+            relativo = os.path.relpath(raiz, origem)
+            pasta = os.path.normpath(os.path.join(destino, relativo))
+            for arquivo in sorted(arquivos):
+                self.colocar(os.path.join(raiz, arquivo), os.path.join(pasta, arquivo))
+
+    def estatisticas(self) -> Dict[str, int]:
+        return {'pacote': sum(len(nomes) for nomes in self.grupos.values()), 'pacotes': len(self.grupos),
+                'bytes_copiados': self.bytes_copiados}
+
+    def caminho_pacote(self, pasta: str) -> str:
+        return f'{pasta}.{self.formato}'
+
+    def fechar(self) -> Tuple[ResumoPacotes, List[Tuple[str, str]]]:
+        """Grava todos os pacotes; devolve o resumo e as falhas (origem, erro), que não interrompem os outros
+
+        Um erro num PDF descarta o pacote dele: todos os PDFs desse pacote entram nas falhas.
+        """
+        inicio = time.perf_counter()
+        falhas: List[Tuple[str, str]] = []
+        gravados = arquivos = 0
+        for pasta in sorted(self.grupos):
+            quantidade = self._gravar(pasta, self.grupos[pasta], falhas)
+            gravados += quantidade > 0
+            arquivos += quantidade
+        return ResumoPacotes(gravados, arquivos, time.perf_counter() - inicio, self.bytes_copiados), falhas
+
+    def _gravar(self, pasta: str, nomes: Dict[str, str], falhas: List[Tuple[str, str]]) -> int:
+        destino = self.caminho_pacote(pasta)
+        temporario = f'{destino}.tmp'
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        indice = []
+        origem = destino
+        try:
+            with open(temporario, 'wb') as saida:
+                if self.formato == 'zip':
+                    pacote = zipfile.ZipFile(saida, 'w', zipfile.ZIP_STORED, allowZip64=True)
+                else:
+                    pacote = tarfile.open(fileobj=saida, mode='w', format=tarfile.PAX_FORMAT)
+                with pacote:
+                    for nome, origem in nomes.items():
+                        indice.append(self._adicionar(pacote, nome, origem))
+                    origem = destino
+                    dados = json.dumps({'pacote': os.path.basename(pasta), 'arquivos': indice},
+                                       ensure_ascii=False, indent=1).encode('utf-8')
+                    self._adicionar_bytes(pacote, INDICE, dados)
+                saida.flush()
+                os.fsync(saida.fileno())
+            os.replace(temporario, destino)
+        except (OSError, ValueError, zipfile.BadZipFile, tarfile.TarError) as e:
+            # Um membro gravado pela metade deixa o pacote corrompido (num TAR, o resto do
+            # fluxo fica desalinhado): o pacote inteiro é descartado e nenhum PDF dele conta
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            with self._trava:
+                self.bytes_copiados -= sum(entrada['tamanho'] for entrada in indice)
+            falhas.append((origem, str(e)))
+            falhas.extend((outra, f"pacote {os.path.basename(destino)} descartado")
+                          for outra in nomes.values() if outra != origem)
+            return 0
+        return len(indice)
+
+    def _adicionar(self, pacote, nome: str, origem: str) -> dict:
+        mtime = os.stat(pacotes.separar(origem)[0] if pacotes.separar(origem) else origem).st_mtime
+        with pacotes.abrir(origem) as arquivo:
+            leitor = _Hasher(arquivo)
+            if isinstance(pacote, zipfile.ZipFile):
+                info = zipfile.ZipInfo(nome, time.localtime(max(mtime, 315532800))[:6])  # ZIP não guarda antes de 1980
+                info.file_size = pacotes.tamanho(origem)
+                with pacote.open(info, 'w', force_zip64=info.file_size >= zipfile.ZIP64_LIMIT) as membro:
+                    for parte in iter(lambda: leitor.read(BLOCO), b''):
+                        membro.write(parte)
+            else:
+                info = tarfile.TarInfo(nome)
+                info.size = pacotes.tamanho(origem)
+                info.mtime = mtime
+                pacote.addfile(info, leitor)
+        with self._trava:
+            self.bytes_copiados += leitor.lidos
+        return {'nome': nome, 'tamanho': leitor.lidos, 'sha256': leitor.sha256.hexdigest(), 'origem': origem}
+
+    @staticmethod
+    def _adicionar_bytes(pacote, nome: str, dados: bytes) -> None:
+        if isinstance(pacote, zipfile.ZipFile):
+            pacote.writestr(nome, dados)
+        else:
+            info = tarfile.TarInfo(nome)
+            info.size = len(dados)
+            info.mtime = time.time()
+            pacote.addfile(info, io.BytesIO(dados))
@@ -0,0 +1,350 @@
+"""Extração de CNPJs de arquivos PDF"""
+import io
+import mmap
+import os
+import re
+import time
+from contextlib import contextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from leitor import campos, conteudo, pacotes
+from leitor.cache import CacheExtracao, cache_do_processo, hash_arquivo
+from leitor.fluxo import mapear_em_processos
+
+if TYPE_CHECKING:  # o PyPDF2 é importado só quando um PDF precisa dele
+    import PyPDF2
+
+# Versão do extrator gravada junto com cada entrada do cache. Incrementar sempre que a
+# forma de extrair o texto ou os campos mudar, para que entradas antigas sejam ignoradas.
+VERSAO_EXTRATOR = 3
+
+CNPJ_PATTERN = re.compile(campos.CNPJ)
+CNPJ_TAMANHO = 18  # "00.000.000/0000-00"
+
+# Teto de memória por documento, em MB (0 = sem teto). Um PDF que passe dele durante a
+# leitura é abandonado com erro, sem derrubar o processo que lê os outros.
+MEMORIA_PADRAO_MB = int(os.environ.get('LEITOR_MEMORIA_MB', '1024'))
+# PDFs a partir deste tamanho saem do cache de páginas do sistema depois de lidos, para
+# não empurrar para fora os arquivos que ainda serão copiados
+DESCARTAR_CACHE_BYTES = 64 * 2 ** 20
+# Com limite de CNPJs, tenta antes a leitura direta dos streams de conteúdo (leitor.conteudo)
+# e só usa o PyPDF2 quando ela não é confiável. LEITOR_LEITURA_RAPIDA=0 desliga o atalho.
+LEITURA_RAPIDA = os.environ.get('LEITOR_LEITURA_RAPIDA', '1') != '0'
+
+
+class MemoriaExcedida(MemoryError):
+    """O documento passou do teto de memória durante a leitura"""
+
+
+def extract_cnpjs(text: str) -> List[str]:
+    """Extrai todos os CNPJs de um texto"""
+    return CNPJ_PATTERN.findall(text)
+
+
+def iterar_cnpjs_por_pagina(textos: Iterable[str]) -> Iterator[List[str]]:
+    """Produz, para cada texto de página, os CNPJs que terminam nela
+
+    O resultado concatenado é idêntico a extract_cnpjs(''.join(textos)), inclusive para
+    um CNPJ quebrado entre duas páginas, mas sem montar o texto completo do documento.
+    """
+    resto = ''
+    for texto in textos:
+        bloco = resto + texto
+        fim = 0
+        achados = []
+        for m in CNPJ_PATTERN.finditer(bloco):
+            achados.append(m.group())
+            fim = m.end()
+        # Só os últimos caracteres após o último CNPJ podem formar um CNPJ com a próxima página
+        resto = bloco[max(fim, len(bloco) - (CNPJ_TAMANHO - 1)):]
+        yield achados
+
+
+def iterar_cnpjs(textos: Iterable[str]) -> Iterator[str]:
+    """Produz os CNPJs dos textos das páginas, um a um, à medida que as páginas são lidas"""
+    for achados in iterar_cnpjs_por_pagina(textos):
+        yield from achados
+
+
+def _memoria_anonima() -> Optional[int]:
+    """Memória residente do processo que não vem de arquivos mapeados, em bytes (só Linux)
+
+    As páginas do PDF mapeado ficam de fora: o sistema pode descartá-las a qualquer momento.
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            campos_statm = f.read().split()
+        return (int(campos_statm[1]) - int(campos_statm[2])) * mmap.PAGESIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def iterar_textos_paginas(reader: 'PyPDF2.PdfReader', liberar: bool = False,
+                          teto_bytes: Optional[int] = None) -> Iterator[str]:
+    """Extrai o texto das páginas sob demanda, uma página por vez
+
+    Com liberar, os objetos resolvidos de cada página (streams de conteúdo, fontes) são
+    descartados depois que o texto dela é extraído, e a memória do leitor não cresce com
+    o número de páginas. Com teto_bytes, levanta MemoriaExcedida quando a memória do
+    processo cresce mais do que isso desde o início do documento.
+    """
+    base = _memoria_anonima() if teto_bytes else None
+    # O cache de objetos resolvidos não é API pública do PyPDF2; numa versão sem ele
+    # as páginas são lidas do mesmo jeito, só sem a liberação
+    resolvidos = getattr(reader, 'resolved_objects', None) if liberar else None
+    for numero, page in enumerate(reader.pages, 1):
+        texto = page.extract_text() or ''
+        if base is not None:
+            atual = _memoria_anonima()
+            if atual is not None and atual - base > teto_bytes:
+                raise MemoriaExcedida(f"teto de memória excedido na página {numero}: "
+                                      f"{(atual - base) / 2 ** 20:.1f} MB > {teto_bytes / 2 ** 20:.0f} MB")
+        if isinstance(resolvidos, dict):
+            resolvidos.clear()
+        yield texto
+
+
+def _aconselhar(file, conselho: str) -> None:
+    """posix_fadvise no arquivo inteiro, onde existir"""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(file.fileno(), 0, 0, getattr(os, conselho))
+        except OSError:
+            pass
+
+
+@contextmanager
+def abrir_mapeado(pdf_path: str):
+    """Abre o PDF mapeado em memória (somente leitura), para ser lido pelo PyPDF2
+
+    Os bytes do arquivo não são copiados para a memória do processo: o sistema traz e
+    descarta as páginas conforme o leitor avança. PDFs grandes saem do cache de páginas
+    ao final (DESCARTAR_CACHE_BYTES). Um membro de pacote (leitor.pacotes) é descomprimido
+    num mapa anônimo do mesmo tamanho, sem passar pelo disco.
+    """
+    if pacotes.separar(pdf_path) is not None:
+        tamanho = pacotes.tamanho(pdf_path)
+        with pacotes.abrir(pdf_path) as membro:
+            if not tamanho:
+                yield io.BytesIO(b'')
+                return
+            with mmap.mmap(-1, tamanho) as mapa:
+                for parte in iter(lambda: membro.read(2 ** 20), b''):
+                    mapa.write(parte)
+                mapa.seek(0)
+                yield mapa
+        return
+    with open(pdf_path, 'rb') as file:
+        tamanho = os.fstat(file.fileno()).st_size
+        if not tamanho:  # mmap não aceita arquivo vazio; o PyPDF2 dá o erro de sempre
+            yield file
+            return
+        _aconselhar(file, 'POSIX_FADV_SEQUENTIAL')
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                yield mapa
+        finally:
+            if tamanho >= DESCARTAR_CACHE_BYTES:
+                _aconselhar(file, 'POSIX_FADV_DONTNEED')
+
+
+def _teto_bytes(memoria_mb: Optional[int]) -> Optional[int]:
+    memoria_mb = MEMORIA_PADRAO_MB if memoria_mb is None else memoria_mb
+    return memoria_mb * 2 ** 20 if memoria_mb > 0 else None
+
+
+def _cronometrar(tempos: Optional[Dict[str, float]], nome: str, inicio: float) -> float:
+    """Soma em tempos[nome] o tempo desde inicio (se tempos foi pedido) e retorna o instante atual"""
+    agora = time.perf_counter()
+    if tempos is not None:
+        tempos[nome] = tempos.get(nome, 0.0) + agora - inicio
+    return agora
+
+
+def _ler_pdf(pdf_path: str, limite_cnpjs: Optional[int], tempos: Optional[Dict[str, float]] = None,
+             memoria_mb: Optional[int] = None) -> dict:
+    """Lê as páginas em sequência, parando assim que houver limite_cnpjs CNPJs
+
+    O arquivo é mapeado em memória e os objetos de cada página são liberados assim que
+    ela é lida; o documento que passar de memoria_mb é abandonado (MemoriaExcedida).
+    Os campos (CNPJ, CEP, linha digitável, valores...) das páginas lidas saem de uma única
+    varredura do texto.
+    """
+    import PyPDF2
+
+    inicio = time.perf_counter()
+    with abrir_mapeado(pdf_path) as stream:
+        reader = PyPDF2.PdfReader(stream)
+        paginas: List[str] = []
+        cnpjs: List[str] = []
+        textos_paginas = iterar_textos_paginas(reader, True, _teto_bytes(memoria_mb))
+
+        if limite_cnpjs:
+            def textos():
+                for texto in textos_paginas:
+                    paginas.append(texto)
+                    yield texto
+
+            for achados in iterar_cnpjs_por_pagina(textos()):
+                cnpjs.extend(achados)
+                if len(cnpjs) >= limite_cnpjs:
+                    break
+        else:
+            paginas.extend(textos_paginas)
+        total_paginas = len(reader.pages)
+
+    inicio = _cronometrar(tempos, 'pdf', inicio)
+    encontrados = campos.extrair_campos(''.join(paginas))
+    _cronometrar(tempos, 'regex', inicio)
+    return {
+        'paginas': paginas,
+        'total_paginas': total_paginas,
+        'completo': len(paginas) == total_paginas,
+        'cnpjs': cnpjs if limite_cnpjs else encontrados['cnpj'],
+        'ceps': encontrados['cep'],
+        'campos': encontrados,
+        'leitura': 'pypdf2',
+    }
+
+
+def _ler_rapido(pdf_path: str, limite_cnpjs: int, tempos: Optional[Dict[str, float]] = None,
+                memoria_mb: Optional[int] = None) -> Optional[dict]:
+    """Lê os CNPJs direto dos streams de conteúdo; None quando é preciso recorrer ao PyPDF2
+
+    O resultado fica marcado como incompleto e sem o texto das páginas: quem precisar do
+    texto ou do documento inteiro faz a leitura completa pelo PyPDF2.
+    """
+    inicio = time.perf_counter()
+    with abrir_mapeado(pdf_path) as stream:
+        leitura = None
+        if isinstance(stream, mmap.mmap):
+            leitura = conteudo.ler_cnpjs(stream, limite_cnpjs, _teto_bytes(memoria_mb))
+    inicio = _cronometrar(tempos, 'rapida', inicio)
+    if leitura is None:
+        return None
+    encontrados = campos.extrair_campos(leitura.texto)
+    _cronometrar(tempos, 'regex', inicio)
+    return {
+        'paginas': [],
+        'total_paginas': leitura.paginas,
+        'completo': False,
+        'cnpjs': leitura.cnpjs,
+        'ceps': encontrados['cep'],
+        'campos': encontrados,
+        'leitura': 'rapida',
+    }
+
+
+def _suficiente(dados: dict, limite_cnpjs: Optional[int]) -> bool:
+    """Indica se os dados (possivelmente parciais) atendem ao pedido"""
+    if dados['completo']:
+        return True
+    return bool(limite_cnpjs) and len(dados['cnpjs']) >= limite_cnpjs
+
+
+def extrair_dados(pdf_path: str, cache: Optional[CacheExtracao] = None,
+                  limite_cnpjs: Optional[int] = None, tempos: Optional[Dict[str, float]] = None,
+                  memoria_mb: Optional[int] = None) -> dict:
+    """Retorna {'paginas', 'total_paginas', 'completo', 'cnpjs', 'ceps', 'campos', 'leitura'} do PDF
+
+    'campos' é {tipo: [valores]} com todos os campos de leitor.campos. 'leitura' diz de onde
+    veio o resultado: 'rapida' (leitor.conteudo), 'pypdf2', 'alternativa' (PyPDF2 depois
+    de a leitura rápida recusar o arquivo) ou 'cache'.
+
+    Com limite_cnpjs, a leitura para na página em que o N-ésimo CNPJ aparece e o resultado
+    fica marcado como incompleto ('completo': False), com os textos só das páginas lidas.
+    Quando há cache, arquivos com conteúdo já conhecido não são lidos pelo PyPDF2; uma
+    entrada parcial só é reaproveitada se já contiver os CNPJs pedidos.
+    Com tempos (dicionário), acumula nele a duração de cada parte: 'hash', 'cache',
+    'rapida', 'pdf' (leitura do texto) e 'regex' (varredura dos campos).
+    memoria_mb é o teto de memória do documento (padrão: MEMORIA_PADRAO_MB; 0 = sem teto).
+    """
+    chave = None
+    if cache is not None:
+        inicio = time.perf_counter()
+        chave = hash_arquivo(pdf_path)
+        inicio = _cronometrar(tempos, 'hash', inicio)
+        dados = cache.obter(chave, VERSAO_EXTRATOR)
+        _cronometrar(tempos, 'cache', inicio)
+        if dados is not None and _suficiente(dados, limite_cnpjs):
+            return dict(dados, leitura='cache')
+
+    dados = None
+    if limite_cnpjs and LEITURA_RAPIDA:
+        dados = _ler_rapido(pdf_path, limite_cnpjs, tempos, memoria_mb)
+    if dados is None:
+        dados = _ler_pdf(pdf_path, limite_cnpjs, tempos, memoria_mb)
+        if limite_cnpjs and LEITURA_RAPIDA:
+            dados['leitura'] = 'alternativa'
+    if cache is not None:
+        inicio = time.perf_counter()
+        cache.gravar(chave, VERSAO_EXTRATOR, dados)
+        _cronometrar(tempos, 'cache', inicio)
+    return dados
+
+
+def n_esimo_cnpj(pdf_path: str, n: int, cache: Optional[CacheExtracao] = None) -> Optional[str]:
+    """Retorna o N-ésimo CNPJ (começando em 1) do PDF, lendo só as páginas necessárias"""
+    cnpjs = extrair_dados(pdf_path, cache, limite_cnpjs=n)['cnpjs']
+    return cnpjs[n - 1] if len(cnpjs) >= n else None
+
+
+class ResumoPDF(NamedTuple):
+    """Resultado compacto da leitura de um PDF (sem o texto das páginas)"""
+    cnpjs: Tuple[str, ...]
+    paginas: int
+    erro: Optional[str] = None
+    valores: Tuple[str, ...] = ()
+    linhas_digitaveis: Tuple[str, ...] = ()
+    segundos: float = 0.0      # latência da leitura deste arquivo
+    cpu_segundos: float = 0.0
+    tempos: Tuple[Tuple[str, float], ...] = ()  # detalhamento: hash, cache, rapida, pdf, regex
+    leitura: str = ''  # rapida, pypdf2, alternativa ou cache (ver extrair_dados)
+
+
+def resumir_pdf(pdf_path: str, cache_path: Optional[str] = None,
+                limite_cnpjs: Optional[int] = None, memoria_mb: Optional[int] = None) -> ResumoPDF:
+    """Lê o PDF (ou o cache) e devolve os CNPJs encontrados, o número de páginas e o erro, se houver"""
+    inicio, inicio_cpu = time.perf_counter(), time.process_time()
+    tempos: Dict[str, float] = {}
+    try:
+        dados = extrair_dados(pdf_path, cache_do_processo(cache_path), limite_cnpjs, tempos, memoria_mb)
+        encontrados = dados['campos']
+        resumo = ResumoPDF(tuple(dados['cnpjs']), dados['total_paginas'], None,
+                           tuple(encontrados['valor']), tuple(encontrados['linha_digitavel']),
+                           leitura=dados.get('leitura', ''))
+    except Exception as e:
+        resumo = ResumoPDF((), 0, str(e))
+    return resumo._replace(segundos=time.perf_counter() - inicio, cpu_segundos=time.process_time() - inicio_cpu,
+                           tempos=tuple(tempos.items()))
+
+
+def resumir_pedido(pedido: Tuple[str, Optional[int]], cache_path: Optional[str] = None,
+                   memoria_mb: Optional[int] = None) -> ResumoPDF:
+    """resumir_pdf para um par (caminho, limite_cnpjs), quando o limite varia de um arquivo para outro"""
+    caminho, limite_cnpjs = pedido
+    return resumir_pdf(caminho, cache_path, limite_cnpjs, memoria_mb)
+
+
+def normalizar_workers(workers: Optional[int]) -> int:
+    """Converte o número de processos pedido (0 ou None = todos os núcleos) em um valor válido"""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def resumir_pdfs(caminhos: Iterable[str], workers: int = 1, cache_path: Optional[str] = None,
+                 limite_cnpjs: Optional[int] = None, memoria_mb: Optional[int] = None) -> Iterator[ResumoPDF]:
+    """Resume vários PDFs, em paralelo quando workers > 1, na mesma ordem da entrada
+
+    Com cache_path, cada processo abre sua própria conexão com o cache de extração.
+    Com limite_cnpjs, cada PDF é lido só até a página em que aparece o N-ésimo CNPJ.
+    """
+    resumir = partial(resumir_pdf, cache_path=cache_path, limite_cnpjs=limite_cnpjs, memoria_mb=memoria_mb)
+    # Os caminhos são consumidos aos poucos, com poucos lotes em andamento por processo
+    for _, resumo in mapear_em_processos(resumir, caminhos, workers):
+        yield resumo
+
+    if cache_path:
+        cache_do_processo(cache_path).podar()
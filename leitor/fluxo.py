@@ -0,0 +1,172 @@
+"""Peças para montar um pipeline em fluxo com filas limitadas
+
+Cada etapa roda ao mesmo tempo que as outras e se comunica por filas de tamanho fixo:
+quando uma etapa mais lenta fica para trás, a anterior bloqueia ao encher a fila
+(contrapressão), então a memória usada não depende da quantidade de arquivos.
+
+    em_segundo_plano     consome um iterável numa thread (etapas de E/S, como listar pastas)
+    mapear_em_processos  aplica uma função em processos (etapas de CPU), na ordem da entrada
+    ColocacaoEmFundo     coloca arquivos com colocar_em_lote numa thread, alimentada por fila
+"""
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from leitor.lote import THREADS_PADRAO, ResumoLote, colocar_em_lote
+
+TAMANHO_FILA = 256  # itens aguardando entre duas etapas
+LOTE_PROCESSOS = 4  # itens enviados juntos a um processo, para reduzir a troca de mensagens
+ESPERA_FILA = 0.1  # segundos entre as verificações de quem espera uma fila cheia
+_FIM = object()
+
+
+class Fila:
+    """Fila limitada que pode ser fechada; iterar devolve os itens até o fechamento"""
+
+    def __init__(self, tamanho: int = TAMANHO_FILA) -> None:
+        self._fila: queue.Queue = queue.Queue(maxsize=max(1, tamanho))
+        self.erro: Optional[BaseException] = None
+
+    def colocar(self, item, timeout: Optional[float] = None) -> None:
+        """Bloqueia enquanto a fila estiver cheia; com timeout, levanta queue.Full ao esgotá-lo"""
+        self._fila.put(item, timeout=timeout)
+
+    def fechar(self, erro: Optional[BaseException] = None, timeout: Optional[float] = None) -> None:
+        self.erro = erro
+        self._fila.put(_FIM, timeout=timeout)
+
+    def __iter__(self) -> Iterator:
+        while True:
+            item = self._fila.get()
+            if item is _FIM:
+                if self.erro is not None:
+                    raise self.erro
+                return
+            yield item
+
+
+def em_segundo_plano(iteravel: Iterable, tamanho: int = TAMANHO_FILA, nome: str = 'fluxo') -> Iterator:
+    """Percorre iteravel numa thread, entregando os itens por uma fila limitada
+
+    Um erro na thread é repassado a quem consome, depois dos itens já produzidos.
+    """
+    fila = Fila(tamanho)
+
+    def produzir() -> None:
+        try:
+            for item in iteravel:
+                fila.colocar(item)
+        except BaseException as e:
+            fila.fechar(e)
+        else:
+            fila.fechar()
+
+    threading.Thread(target=produzir, name=nome, daemon=True).start()
+    return iter(fila)
+
+
+def _aplicar(funcao: Callable, itens: List) -> List:
+    return [funcao(item) for item in itens]
+
+
+def mapear_em_processos(funcao: Callable, itens: Iterable, workers: int = 1,
+                        pular: Optional[Callable] = None, entrada: Optional[Callable] = None,
+                        em_voo: Optional[int] = None, lote: int = LOTE_PROCESSOS) -> Iterator[Tuple[object, object]]:
+    """Produz (item, funcao(entrada(item))) na ordem da entrada, com no máximo em_voo lotes em andamento
+
+    entrada escolhe o que é enviado ao processo (padrão: o próprio item, que precisa ser
+    serializável). Itens para os quais pular(item) é verdadeiro não são processados e
+    saem como (item, None), sem perder a ordem. Com workers <= 1 tudo roda no próprio processo.
+    """
+    entrada = entrada or (lambda item: item)
+    if workers <= 1:
+        for item in itens:
+            yield item, (None if pular is not None and pular(item) else funcao(entrada(item)))
+        return
+
+    em_voo = em_voo or 2 * workers
+    # Cada posição é (itens do lote, futuro) ou (item pulado, None)
+    pendentes: deque = deque()
+    atual: List = []
+
+    def entregar(posicao):
+        grupo, futuro = posicao
+        if futuro is None:
+            yield grupo, None
+        else:
+            yield from zip(grupo, futuro.result())
+
+    def cheio() -> bool:
+        enviados = sum(1 for _, futuro in pendentes if futuro is not None)
+        return enviados >= em_voo or len(pendentes) >= TAMANHO_FILA
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def enviar() -> None:
+            pendentes.append((list(atual), executor.submit(_aplicar, funcao, [entrada(item) for item in atual])))
+            atual.clear()
+
+        for item in itens:
+            if pular is not None and pular(item):
+                if atual:
+                    enviar()
+                pendentes.append((item, None))
+            else:
+                atual.append(item)
+                if len(atual) >= lote:
+                    enviar()
+            # Entrega o que já terminou; com a fila cheia, espera o mais antigo (contrapressão)
+            while pendentes and (pendentes[0][1] is None or pendentes[0][1].done() or cheio()):
+                yield from entregar(pendentes.popleft())
+        if atual:
+            enviar()
+        while pendentes:
+            yield from entregar(pendentes.popleft())
+
+
+class ColocacaoEmFundo:
+    """Recebe pares (origem, destino) por colocar() e os coloca em paralelo numa thread
+
+    As pastas de destino já devem existir. concluir() espera a fila esvaziar e devolve o
+    ResumoLote da colocação. Se a thread morrer com um erro, a próxima chamada de colocar()
+    ou concluir() o levanta, em vez de esperar para sempre por espaço na fila.
+    """
+
+    def __init__(self, colocador, threads: int = THREADS_PADRAO, tamanho: int = TAMANHO_FILA) -> None:
+        self.colocador = colocador
+        self._fila = Fila(tamanho)
+        self._resultado: List[ResumoLote] = []
+        self._erro: List[BaseException] = []
+        self._thread = threading.Thread(target=self._executar, args=(threads,), name='colocacao-fundo', daemon=True)
+        self._thread.start()
+
+    def _executar(self, threads: int) -> None:
+        try:
+            self._resultado.append(colocar_em_lote(self.colocador, iter(self._fila), threads))
+        except BaseException as e:
+            self._erro.append(e)
+
+    def _enviar(self, enviar: Callable[..., None]) -> None:
+        """Chama enviar(timeout=...) até a fila aceitar, levantando o erro da thread se ela morrer"""
+        while True:
+            # _executar só termina sem erro depois do fim da fila, que é enviado por último
+            if self._erro or not self._thread.is_alive():
+                self._thread.join()
+                raise self._erro[0]
+            try:
+                enviar(timeout=ESPERA_FILA)
+                return
+            except queue.Full:
+                pass
+
+    def colocar(self, origem: str, destino: str) -> None:
+        self._enviar(partial(self._fila.colocar, (origem, destino)))
+
+    def concluir(self) -> ResumoLote:
+        self._enviar(self._fila.fechar)
+        self._thread.join()
+        if self._erro:
+            raise self._erro[0]
+        return self._resultado[0]
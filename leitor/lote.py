@@ -0,0 +1,101 @@
+"""Colocação em lote: cada pasta de destino é criada uma única vez e os arquivos são
+colocados por um pool limitado de threads, com novas tentativas para erros passageiros
+
+Em compartilhamentos de rede o custo de cada chamada (stat, mkdir, cópia) é dominado
+pela latência, não pelos bytes; com várias cópias em andamento ao mesmo tempo essa
+latência se sobrepõe. O número de tarefas pendentes é limitado, então a memória não
+cresce com o tamanho da lista.
+"""
+import errno
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, List, NamedTuple, Tuple
+
+THREADS_PADRAO = int(os.environ.get('LEITOR_THREADS', '8'))
+TENTATIVAS_PADRAO = 3
+TRAVAS_DESTINO = 64  # travas por hash do destino, para não crescer com a quantidade de arquivos
+ESPERA_PADRAO = 0.5  # segundos antes da 2ª tentativa; dobra a cada nova tentativa
+# Erros que não melhoram tentando de novo. Um OSError sem errno (shutil.SameFileError, por
+# exemplo) também é tratado como permanente: não vem de uma falha passageira do sistema.
+PERMANENTES = {errno.ENOENT, errno.EACCES, errno.EPERM, errno.EEXIST, errno.EISDIR, errno.ENOTDIR,
+               errno.ENOSPC, errno.EROFS, errno.ENAMETOOLONG}
+
+
+class ResumoLote(NamedTuple):
+    """Resultado de colocar_em_lote"""
+    arquivos: int
+    segundos: float
+    bytes_copiados: int
+    retentativas: int
+    falhas: List[Tuple[str, str]]  # (origem, erro)
+
+    @property
+    def arquivos_por_segundo(self) -> float:
+        return self.arquivos / self.segundos if self.segundos else 0.0
+
+    def texto(self) -> str:
+        megabytes = self.bytes_copiados / 2 ** 20
+        vazao = megabytes / self.segundos if self.segundos else 0.0
+        return (f"{self.arquivos} arquivo(s) em {self.segundos:.2f}s ({self.arquivos_por_segundo:.0f} arq/s, "
+                f"{vazao:.1f} MB/s); {self.retentativas} nova(s) tentativa(s), {len(self.falhas)} falha(s)")
+
+
+def criar_pastas(pastas: Iterable[str]) -> int:
+    """Cria cada pasta distinta uma única vez e retorna quantas não existiam"""
+    criadas = 0
+    for pasta in sorted(set(pastas)):
+        try:
+            os.makedirs(pasta)
+            criadas += 1
+        except FileExistsError:
+            pass
+    return criadas
+
+
+def _bytes(colocador) -> int:
+    return colocador.estatisticas().get('bytes_copiados', 0)
+
+
+def colocar_em_lote(colocador, pares: Iterable[Tuple[str, str]], threads: int = THREADS_PADRAO,
+                    tentativas: int = TENTATIVAS_PADRAO, espera: float = ESPERA_PADRAO) -> ResumoLote:
+    """Coloca cada (origem, destino) com o colocador, em paralelo; as pastas já devem existir
+
+    Falhas que persistem depois das tentativas não interrompem o lote: voltam em
+    ResumoLote.falhas. Dois pares com o mesmo destino nunca são colocados ao mesmo tempo.
+    """
+    trava = threading.Lock()
+    travas_destino = [threading.Lock() for _ in range(TRAVAS_DESTINO)]
+    retentativas = 0
+    falhas: List[Tuple[str, str]] = []
+
+    def colocar(origem: str, destino: str) -> None:
+        nonlocal retentativas
+        for tentativa in range(1, tentativas + 1):
+            try:
+                with travas_destino[hash(destino) % TRAVAS_DESTINO]:
+                    colocador.colocar(origem, destino)
+                return
+            except Exception as e:
+                passageiro = isinstance(e, OSError) and e.errno is not None and e.errno not in PERMANENTES
+                if not passageiro or tentativa == tentativas:
+                    with trava:
+                        falhas.append((origem, str(e)))
+                    return
+                with trava:
+                    retentativas += 1
+                time.sleep(espera * 2 ** (tentativa - 1))
+
+    inicio = time.perf_counter()
+    bytes_antes = _bytes(colocador)
+    arquivos = 0
+    with ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix='colocacao') as executor:
+        pendentes = set()
+        for origem, destino in pares:
+            if len(pendentes) >= 4 * threads:
+                _, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            pendentes.add(executor.submit(colocar, origem, destino))
+            arquivos += 1
+        wait(pendentes)
+    return ResumoLote(arquivos, time.perf_counter() - inicio, _bytes(colocador) - bytes_antes, retentativas, falhas)
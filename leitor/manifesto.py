@@ -0,0 +1,157 @@
+"""Manifesto de execução para o modo incremental
+
+Guarda, para cada arquivo de entrada já processado, caminho, tamanho, mtime e hash do
+conteúdo, além do destino onde foi colocado e dos dados extraídos. Em uma nova execução,
+só os arquivos novos ou alterados são lidos e colocados de novo.
+
+Várias entradas podem ir para o mesmo destino (nomes que a nomeação torna iguais, como
+"VICTA 01.pdf" e "VICTA 12.pdf" sem os números): um destino só é apagado quando nenhuma
+outra entrada do manifesto aponta para ele.
+"""
+import json
+import os
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from leitor.cache import hash_arquivo
+from leitor.pacotes import estado
+
+MANIFESTO_PADRAO = '.manifesto.json'
+
+
+class Manifesto:
+    def __init__(self, caminho: str) -> None:
+        self.caminho = os.path.abspath(caminho)
+        self.arquivos: Dict[str, dict] = {}
+        self._verificados: Dict[str, bool] = {}
+        self._trava = threading.Lock()  # as colocações atualizam o manifesto de várias threads
+        if os.path.exists(self.caminho):
+            with open(self.caminho, encoding='utf-8') as f:
+                self.arquivos = json.load(f).get('arquivos', {})
+
+    def alterado(self, caminho: str) -> bool:
+        """Indica se o arquivo é novo ou mudou desde a execução anterior
+
+        Tamanho e mtime iguais bastam para considerar o arquivo inalterado; se algum deles
+        mudou, o hash do conteúdo decide. O resultado fica guardado até o fim da execução.
+        """
+        caminho = os.path.abspath(caminho)
+        with self._trava:
+            if caminho in self._verificados:
+                return self._verificados[caminho]
+            registro = dict(self.arquivos.get(caminho, {}))
+
+        tamanho, mtime_ns = estado(caminho)
+        if registro and registro['tamanho'] == tamanho and registro['mtime_ns'] == mtime_ns:
+            alterado = False
+        else:
+            # O hash é calculado fora da trava, para não segurar as outras threads
+            hash_conteudo = hash_arquivo(caminho)
+            alterado = not registro or registro['hash'] != hash_conteudo
+            with self._trava:
+                registro = self.arquivos.setdefault(caminho, {})
+                if alterado:
+                    # Dados e destino antigos não valem mais para o conteúdo novo
+                    registro.clear()
+                registro.update(tamanho=tamanho, mtime_ns=mtime_ns, hash=hash_conteudo)
+        with self._trava:
+            return self._verificados.setdefault(caminho, alterado)
+
+    def registro(self, caminho: str) -> dict:
+        """Registro do arquivo no manifesto (vazio se ainda não houver)"""
+        with self._trava:
+            return dict(self.arquivos.get(os.path.abspath(caminho), {}))
+
+    def atualizar(self, caminho: str, **campos) -> None:
+        """Grava campos extras (dados extraídos, destino...) no registro do arquivo"""
+        caminho = os.path.abspath(caminho)
+        with self._trava:
+            novo = caminho not in self.arquivos
+        if novo:
+            self.alterado(caminho)
+        with self._trava:
+            self.arquivos[caminho].update(campos)
+
+    def em_uso(self, destino: str, exceto: Optional[str] = None) -> bool:
+        """Indica se alguma entrada do manifesto (fora exceto) foi colocada em destino"""
+        destino = os.path.abspath(destino)
+        exceto = os.path.abspath(exceto) if exceto else None
+        with self._trava:
+            return any(registro.get('destino') == destino
+                       for caminho, registro in self.arquivos.items() if caminho != exceto)
+
+    def remover_ausentes(self, presentes: Iterable[str], prefixo: Optional[str] = None) -> List[str]:
+        """Remove do manifesto (e do destino) os arquivos que não existem mais na entrada
+
+        Só são considerados os registros sob o diretório prefixo, quando informado.
+        """
+        presentes = {os.path.abspath(p) for p in presentes}
+        prefixo = os.path.abspath(prefixo) + os.sep if prefixo else None
+        removidos, apagar = [], []
+        with self._trava:
+            for caminho in list(self.arquivos):
+                if caminho in presentes or (prefixo and not caminho.startswith(prefixo)):
+                    continue
+                registro = self.arquivos.pop(caminho)
+                removidos.append(caminho)
+                # Arquivos movidos não existem mais na entrada por definição: o destino é a única cópia
+                if registro.get('destino') and registro.get('modo') != 'mover':
+                    apagar.append(registro['destino'])
+            em_uso = Counter(registro.get('destino') for registro in self.arquivos.values())
+        for destino in apagar:
+            if not em_uso[destino] and os.path.lexists(destino):
+                os.remove(destino)
+        return removidos
+
+    def salvar(self) -> None:
+        """Grava o manifesto de forma atômica (arquivo temporário + rename)"""
+        os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        temporario = f'{self.caminho}.tmp'
+        with self._trava, open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'versao': 1, 'arquivos': self.arquivos}, f, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+
+
+class ColocadorIncremental:
+    """Envolve um Colocador e pula arquivos inalterados que já estão no destino certo"""
+
+    def __init__(self, colocador, manifesto: Manifesto) -> None:
+        self.colocador = colocador
+        self.manifesto = manifesto
+        self.pulados = 0
+        self._trava = threading.Lock()
+        self._colocando: Counter = Counter()  # destinos sendo gravados agora por alguma thread
+
+    def colocar(self, origem: str, destino: str) -> str:
+        if os.path.isdir(destino):
+            destino = os.path.join(destino, os.path.basename(origem))
+        destino = os.path.abspath(destino)
+        anterior = self.manifesto.registro(origem).get('destino')
+        if not self.manifesto.alterado(origem) and anterior == destino and os.path.lexists(destino):
+            with self._trava:
+                self.pulados += 1
+            return 'inalterado'
+
+        with self._trava:
+            self._colocando[destino] += 1
+        try:
+            modo = self.colocador.colocar(origem, destino)
+            self.manifesto.atualizar(origem, destino=destino, modo=modo)
+        finally:
+            with self._trava:
+                self._colocando[destino] -= 1
+        # O arquivo mudou de grupo (ou de nome): remove a versão antiga do destino, se nenhuma
+        # outra entrada foi ou está sendo colocada nela
+        if anterior and anterior != destino:
+            with self._trava:
+                if (not self._colocando[anterior] and not self.manifesto.em_uso(anterior, exceto=origem)
+                        and os.path.lexists(anterior)):
+                    os.remove(anterior)
+        return modo
+
+    def colocar_pasta(self, origem: str, destino: str, manter_origem: bool = False) -> None:
+        self.colocador.colocar_pasta(origem, destino, manter_origem)
+
+    def estatisticas(self) -> Dict[str, int]:
+        return {**self.colocador.estatisticas(), 'inalterados': self.pulados}
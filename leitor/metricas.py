@@ -0,0 +1,156 @@
+"""Métricas de execução: tempo por etapa, latência por arquivo, contadores e exportação
+
+Uso típico:
+
+    from leitor.metricas import METRICAS
+
+    with METRICAS.etapa('listagem'):
+        arquivos = os.listdir(pasta)
+    METRICAS.registrar_arquivo(caminho, segundos)
+    METRICAS.contar('erros')
+    METRICAS.exportar('metricas.json')  # ou metricas.prom (formato texto do Prometheus)
+
+As etapas acumulam tempo real e de CPU do processo principal; a latência de cada PDF é
+medida onde ele é lido (inclusive em processos auxiliares) e chega junto com o resultado.
+"""
+import heapq
+import json
+import os
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Limites (em segundos) das faixas do histograma de latência por arquivo
+FAIXAS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LENTOS_PADRAO = 10
+
+
+class Metricas:
+    def __init__(self, limite_lentos: int = 100) -> None:
+        self.limite_lentos = limite_lentos
+        self.etapas: Dict[str, Dict[str, float]] = defaultdict(lambda: {'segundos': 0.0, 'cpu_segundos': 0.0,
+                                                                         'chamadas': 0})
+        self.contadores: Counter = Counter()
+        self.faixas = [0] * (len(FAIXAS_LATENCIA) + 1)  # a última é +Inf
+        self.latencia_total = 0.0
+        self.arquivos = 0
+        self._lentos: List[Tuple[float, str]] = []  # heap com os mais lentos
+
+    @contextmanager
+    def etapa(self, nome: str) -> Iterator[None]:
+        """Acumula o tempo real e de CPU do bloco na etapa"""
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.somar_etapa(nome, time.perf_counter() - inicio, time.process_time() - inicio_cpu)
+
+    def somar_etapa(self, nome: str, segundos: float, cpu_segundos: float = 0.0, chamadas: int = 1) -> None:
+        etapa = self.etapas[nome]
+        etapa['segundos'] += segundos
+        etapa['cpu_segundos'] += cpu_segundos
+        etapa['chamadas'] += chamadas
+
+    def registrar_arquivo(self, caminho: str, segundos: float, cpu_segundos: float = 0.0,
+                          tempos: Iterable[Tuple[str, float]] = (), etapa: str = 'extracao') -> None:
+        """Registra a latência de um arquivo (e o detalhamento por subetapa, se houver)"""
+        self.arquivos += 1
+        self.latencia_total += segundos
+        self.faixas[bisect_left(FAIXAS_LATENCIA, segundos)] += 1
+        self.somar_etapa(etapa, segundos, cpu_segundos)
+        for subetapa, duracao in tempos:
+            self.somar_etapa(f'{etapa}.{subetapa}', duracao)
+        if len(self._lentos) < self.limite_lentos:
+            heapq.heappush(self._lentos, (segundos, caminho))
+        elif segundos > self._lentos[0][0]:
+            heapq.heapreplace(self._lentos, (segundos, caminho))
+
+    def contar(self, nome: str, quantidade: int = 1) -> None:
+        self.contadores[nome] += quantidade
+
+    def incorporar(self, prefixo: str, estatisticas: Dict[str, int]) -> None:
+        """Soma contadores vindos de outro componente (ex.: Colocador.estatisticas())"""
+        for nome, valor in estatisticas.items():
+            self.contadores[f'{prefixo}_{nome}'] += valor
+
+    def mais_lentos(self, n: Optional[int] = None) -> List[Tuple[float, str]]:
+        """Os n arquivos mais lentos (segundos, caminho), do mais lento ao mais rápido"""
+        return sorted(self._lentos, reverse=True)[:n]
+
+    def para_dict(self) -> dict:
+        return {
+            'etapas': {nome: dict(valores) for nome, valores in self.etapas.items()},
+            'contadores': dict(self.contadores),
+            'latencia': {
+                'arquivos': self.arquivos,
+                'soma_segundos': self.latencia_total,
+                'faixas': {str(limite): quantidade for limite, quantidade in
+                           zip(FAIXAS_LATENCIA + ('+Inf',), self.faixas)},
+            },
+            'mais_lentos': [{'arquivo': caminho, 'segundos': segundos} for segundos, caminho in self.mais_lentos()],
+        }
+
+    def prometheus(self) -> str:
+        """Métricas no formato texto de exposição do Prometheus"""
+        linhas = []
+
+        def metrica(nome, tipo, ajuda, amostras):
+            linhas.append(f'# HELP {nome} {ajuda}')
+            linhas.append(f'# TYPE {nome} {tipo}')
+            linhas.extend(f'{nome}{rotulos} {valor}' for rotulos, valor in amostras)
+
+        metrica('leitor_etapa_segundos_total', 'counter', 'Tempo real acumulado por etapa',
+                [(f'{{etapa="{nome}"}}', e['segundos']) for nome, e in self.etapas.items()])
+        metrica('leitor_etapa_cpu_segundos_total', 'counter', 'Tempo de CPU acumulado por etapa',
+                [(f'{{etapa="{nome}"}}', e['cpu_segundos']) for nome, e in self.etapas.items()])
+        metrica('leitor_etapa_chamadas_total', 'counter', 'Execuções de cada etapa',
+                [(f'{{etapa="{nome}"}}', e['chamadas']) for nome, e in self.etapas.items()])
+        metrica('leitor_eventos_total', 'counter', 'Contadores da execução (erros, bytes copiados...)',
+                [(f'{{nome="{nome}"}}', valor) for nome, valor in self.contadores.items()])
+
+        acumulado = 0
+        amostras = []
+        for limite, quantidade in zip(FAIXAS_LATENCIA + ('+Inf',), self.faixas):
+            acumulado += quantidade
+            amostras.append((f'_bucket{{le="{limite}"}}', acumulado))
+        amostras += [('_sum', self.latencia_total), ('_count', self.arquivos)]
+        linhas.append('# HELP leitor_arquivo_segundos Latência de leitura por arquivo')
+        linhas.append('# TYPE leitor_arquivo_segundos histogram')
+        linhas.extend(f'leitor_arquivo_segundos{sufixo} {valor}' for sufixo, valor in amostras)
+        return '\n'.join(linhas) + '\n'
+
+    def exportar(self, caminho: str) -> str:
+        """Grava em JSON ou, se a extensão for .prom/.txt, no formato do Prometheus"""
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            if caminho.endswith(('.prom', '.txt')):
+                f.write(self.prometheus())
+            else:
+                json.dump(self.para_dict(), f, ensure_ascii=False, indent=2)
+        return caminho
+
+    def resumo(self, lentos: int = LENTOS_PADRAO) -> str:
+        """Texto curto com as etapas, os contadores e os arquivos mais lentos"""
+        linhas = ['Etapas (real / CPU):']
+        for nome, e in sorted(self.etapas.items()):
+            linhas.append(f'  {nome:<28} {e["segundos"]:9.3f}s {e["cpu_segundos"]:9.3f}s  ({e["chamadas"]}x)')
+        if self.contadores:
+            linhas.append('Contadores:')
+            linhas.extend(f'  {nome:<28} {valor}' for nome, valor in sorted(self.contadores.items()))
+        if self._lentos and lentos:
+            linhas.append(f'Arquivos mais lentos ({min(lentos, len(self._lentos))}):')
+            linhas.extend(f'  {segundos:8.3f}s  {caminho}' for segundos, caminho in self.mais_lentos(lentos))
+        return '\n'.join(linhas)
+
+
+# Instância única do processo, usada por todos os organizadores
+METRICAS = Metricas()
+
+
+def finalizar(lentos: int = LENTOS_PADRAO, arquivo: Optional[str] = None) -> None:
+    """Mostra o resumo das métricas e grava o arquivo pedido"""
+    print('\n' + METRICAS.resumo(lentos))
+    if arquivo:
+        print(f"Métricas gravadas em: {METRICAS.exportar(arquivo)}")
@@ -0,0 +1,93 @@
+"""Gramática dos nomes de arquivo de boletos e notas fiscais
+
+    boleto  "DD-MM-AAAA - CEDENTE - SACADO - NUMERO.pdf" (às vezes com '_' no lugar dos espaços)
+    nota    "NOME - NUMERO.pdf"
+
+Cada nome vira um registro compacto (NamedTuple) com os campos da gramática e os nomes
+derivados que a organização usa (pasta e nome de destino). Os registros são memoizados
+pelo nome do arquivo, então a mesma listagem analisada de novo (execuções incrementais,
+relação boletos <-> notas) não passa pelas expressões regulares outra vez. Nomes fora da
+gramática ficam com os campos vazios, mas os nomes derivados seguem as regras de sempre.
+"""
+import os
+import re
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional
+
+MEMO_NOMES = 2 ** 17  # nomes guardados por tipo; cobre uma pasta de 100 mil arquivos
+
+# Os separadores são " - " ou "_-_"; o cedente vai até o primeiro, o sacado até o último
+BOLETO = re.compile(r'(?P<dia>\d\d)-(?P<mes>\d\d)-(?P<ano>\d{4})[ _]*-[ _]*(?P<cedente>[^-]*[^-_ ])[ _]*-[ _]*'
+                    r'(?P<sacado>.*[^-_ ])[ _]*-[ _]*(?P<numero>\d+)(?:\.[pP][dD][fF])?')
+NOTA = re.compile(r'(?P<nome>.*[^-_ ])[ _]*-[ _]*(?P<numero>\d+)')
+_PALAVRA_EMPRESA = re.compile(r'[a-zA-Z0-9]*[a-zA-Z][a-zA-Z0-9]*')  # palavra com ao menos uma letra
+_NUMERO = re.compile(r'\d+')
+_NUMERO_FINAL = re.compile(r'\d+$')
+
+
+class NomeBoleto(NamedTuple):
+    """Campos de "DD-MM-AAAA - CEDENTE - SACADO - NUMERO.pdf" e os nomes usados por Aut"""
+    arquivo: str
+    data: Optional[str]  # "DD-MM-AAAA", como no nome
+    cedente: Optional[str]
+    sacado: Optional[str]
+    numero: Optional[str]
+    pasta: str    # nome sem a data e o número, com '_' e '-' trocados por espaço
+    destino: str  # dia e número ("DD-NUMERO.pdf"), para não estourar o tamanho do caminho
+
+
+class NomeNota(NamedTuple):
+    """Campos de "NOME - NUMERO.pdf" e os nomes usados por OrganizadorDocumentos"""
+    arquivo: str
+    nome: str
+    numero: Optional[str]
+    empresa: str       # duas primeiras palavras com letras, ou 'OUTROS'
+    numero_final: str  # última sequência de dígitos do nome, ou '0000'
+    sem_numeros: str   # nome sem a extensão e sem os dígitos do final
+
+
+@lru_cache(maxsize=MEMO_NOMES)
+def nome_boleto(arquivo: str) -> NomeBoleto:
+    """Analisa o nome de um boleto"""
+    # O primeiro item separado por '-' é o dia e o último, o número; o que fica entre eles é a pasta
+    inicio, fim = arquivo.find('-'), arquivo.rfind('-')
+    if inicio == fim:
+        pasta = ''
+        destino = f'{arquivo}-{arquivo}' if inicio < 0 else arquivo
+    else:
+        pasta = ' '.join(arquivo[inicio + 1:fim].replace('_', ' ').replace('-', ' ').split())
+        destino = f'{arquivo[:inicio]}-{arquivo[fim + 1:]}'
+    m = BOLETO.fullmatch(arquivo)
+    if m is None:
+        return NomeBoleto(arquivo, None, None, None, None, pasta, destino)
+    _, _, _, cedente, sacado, numero = m.groups()
+    return NomeBoleto(arquivo, arquivo[:10], cedente.replace('_', ' '), sacado.replace('_', ' '), numero, pasta, destino)
+
+
+@lru_cache(maxsize=MEMO_NOMES)
+def nome_nota(arquivo: str) -> NomeNota:
+    """Analisa o nome de uma nota fiscal"""
+    base, extensao = os.path.splitext(arquivo)
+    palavras = []
+    for m in _PALAVRA_EMPRESA.finditer(base):
+        palavras.append(m.group())
+        if len(palavras) == 2:
+            break
+    empresa = ' '.join(palavras) if palavras else 'OUTROS'
+    m = NOTA.fullmatch(base)
+    if m is not None and extensao.lower() == '.pdf':
+        # O número da gramática já é a última sequência de dígitos do nome
+        return NomeNota(arquivo, m['nome'], m['numero'], empresa, m['numero'], base[:m.start('numero')].strip())
+    numeros = _NUMERO.findall(arquivo)
+    return NomeNota(arquivo, m['nome'] if m else base.strip(), m['numero'] if m else None, empresa,
+                    numeros[-1] if numeros else '0000', _NUMERO_FINAL.sub('', base).strip())
+
+
+def nomes_boletos(arquivos: Iterable[str]) -> List[NomeBoleto]:
+    """Analisa uma listagem inteira de boletos numa única passada"""
+    return [nome_boleto(arquivo) for arquivo in arquivos]
+
+
+def nomes_notas(arquivos: Iterable[str]) -> List[NomeNota]:
+    """Analisa uma listagem inteira de notas fiscais numa única passada"""
+    return [nome_nota(arquivo) for arquivo in arquivos]
@@ -0,0 +1,354 @@
+"""Organização de boletos e notas fiscais pelo nome dos arquivos
+
+Aut, OrganizadorDocumentos e OrganizadorDocumentosPorRelacao eram redefinidos em
+main.py, boletos.py, boletos_nfs.py e arquivos_iguais.py; agora ficam só aqui e são
+usados pela linha de comando (python -m leitor). Nenhum PDF é aberto: tudo sai do nome
+dos arquivos e das pastas, então os módulos pesados (tqdm, NumPy, difflib) só são
+importados quando uma etapa precisa deles. PDFs dentro de pacotes ZIP/TAR na pasta de
+entrada valem pelo nome do membro e são gravados direto do pacote no destino.
+"""
+import os
+from collections import Counter
+from typing import List
+
+from leitor.colocacao import MODO_PADRAO, Colocador
+from leitor.lote import THREADS_PADRAO, ResumoLote, colocar_em_lote, criar_pastas
+from leitor.metricas import METRICAS
+from leitor.nomes import NomeNota, nome_boleto, nome_nota, nomes_boletos, nomes_notas
+from leitor.pacotes import listar, listar_pdfs
+
+# Como OrganizadorDocumentos nomeia cada nota dentro da pasta da empresa:
+#   sem_numeros     "NOME DO CONDOMINIO - .pdf" (nome original sem o número final; main.py)
+#   empresa_numero  "PRIMEIRA_NUMERO.pdf" (primeira palavra da empresa e número; boletos_nfs.py)
+NOMEACOES = ('sem_numeros', 'empresa_numero')
+
+
+class Aut:
+    def __init__(self, bol_dir:  str, dest: str = 'Arquivos', modo: str = MODO_PADRAO,
+                 threads: int = THREADS_PADRAO) -> None:
+        self.bol_dir = bol_dir  # Diretório dos boletos.
+        self.dest = dest  # Diretório de destino dos arquivos.
+        self.dest_bol = f'{dest}/BOLETOS'  # Diretório de destino dos boletos.
+        self.colocador = Colocador(modo)  # Cópia, hardlink, reflink, symlink ou mover.
+        self.threads = threads  # Colocações simultâneas.
+
+    def init_dir(self) -> None:
+        """Inicializa o diretório de destino dos arquivos."""
+        if not os.path.exists(self.dest):
+            os.mkdir(self.dest)
+            os.mkdir(self.dest_bol)
+
+    @staticmethod
+    def nome_pasta(arquivo: str) -> str:
+        """Pasta do boleto: o nome sem a data e o número, com '_' trocado por espaço e sem espaços repetidos"""
+        # Alguns arquivos tem '_' no lugar de ' ' entre os itens; o primeiro item é o dia e o último, o número.
+        return nome_boleto(arquivo).pasta
+
+    @staticmethod
+    def nome_arquivo(arquivo: str) -> str:
+        """
+        O nome dos arquivos ficam grandes demais, por causa do nome das pastas, gerando erro na hora de mudar,
+        por isso, no nome dos arquivos será salvo apenas a data e o número do boleto, sendo estes
+        arquivo.split('-')[0:3] e arquivo.split('-')[-1], respectivamente.
+        """
+        return nome_boleto(arquivo).destino
+
+    def processa_boletos(self, incremental: bool = False) -> ResumoLote:
+        # Lista os arquivos do diretório de boletos.
+        with METRICAS.etapa('listagem'):
+            listagem = listar(self.bol_dir)
+        arquivos: List[str] = [nome for nome, _ in listagem]
+
+        # No modo incremental só os boletos novos ou alterados são colocados de novo.
+        colocador = self.colocador
+        manifesto = None
+        if incremental:
+            from leitor.manifesto import MANIFESTO_PADRAO, ColocadorIncremental, Manifesto
+
+            manifesto = Manifesto(f'{self.dest_bol}/{MANIFESTO_PADRAO}')
+            colocador = ColocadorIncremental(self.colocador, manifesto)
+
+        # Pasta e nome de destino de cada arquivo, numa passada só pela listagem; cada pasta
+        # distinta é criada uma única vez.
+        nomes = nomes_boletos(arquivos)
+        with METRICAS.etapa('mkdir'):
+            criar_pastas(f'{self.dest_bol}/{nome.pasta}' for nome in nomes)
+
+        # Coloca os arquivos (cópia por padrão) em paralelo, com novas tentativas para erros passageiros.
+        pares = ((caminho, f'{self.dest_bol}/{nome.pasta}/{nome.destino}') for nome, (_, caminho) in zip(nomes, listagem))
+        with METRICAS.etapa('colocacao'):
+            resumo = colocar_em_lote(colocador, pares, self.threads)
+        METRICAS.contar('colocacao_retentativas', resumo.retentativas)
+        METRICAS.contar('erros', len(resumo.falhas))
+        for origem, erro in resumo.falhas:
+            print(f"Erro ao colocar {origem}: {erro}")
+        print(f"Boletos: {resumo.texto()}")
+
+        if manifesto is not None:
+            manifesto.remover_ausentes([caminho for _, caminho in listagem], self.bol_dir)
+            manifesto.salvar()
+        return resumo
+
+    def run(self, incremental: bool = False) -> None:
+        self.init_dir()
+        self.processa_boletos(incremental)
+
+
+class OrganizadorDocumentos:
+    def __init__(self, nfs_dir: str, dest_dir: str = 'Arquivos/NOTA_FISCAL', modo: str = MODO_PADRAO,
+                 nomeacao: str = 'sem_numeros', progresso: bool = False) -> None:
+        """
+        Inicializa o organizador de documentos
+
+        Args:
+            nfs_dir (str): Diretório das notas fiscais
+            dest_dir (str): Diretório de destino (padrão: 'Arquivos/NOTA_FISCAL')
+            modo (str): Como colocar os arquivos (cópia, hardlink, reflink, symlink ou mover)
+            nomeacao (str): Nome dado a cada nota na pasta da empresa (um de NOMEACOES)
+            progresso (bool): Mostra a barra de progresso do tqdm
+        """
+        if nomeacao not in NOMEACOES:
+            raise ValueError(f"Nomeação inválida: {nomeacao!r} (use uma de {', '.join(NOMEACOES)})")
+        self.nfs_dir = os.path.abspath(nfs_dir)
+        self.dest_dir = os.path.abspath(dest_dir)
+        self.colocador = Colocador(modo)
+        self.nomeacao = nomeacao
+        self.progresso = progresso
+
+    def _extrair_nome_empresa(self, nome_arquivo: str) -> str:
+        """Nome da empresa: as duas primeiras palavras do nome do arquivo que têm letras"""
+        return nome_nota(nome_arquivo).empresa
+
+    def _extrair_numero_final(self, nome_arquivo: str) -> str:
+        """Última sequência numérica do nome do arquivo"""
+        return nome_nota(nome_arquivo).numero_final
+
+    def _remover_numeros_finais(self, nome_arquivo: str) -> str:
+        """Nome do arquivo sem a extensão e sem os números do final"""
+        return nome_nota(nome_arquivo).sem_numeros
+
+    def _novo_nome(self, nome: NomeNota) -> str:
+        """Nome do arquivo dentro da pasta da empresa, conforme a nomeação escolhida"""
+        if self.nomeacao == 'empresa_numero':
+            return f"{nome.empresa.split()[0]}_{nome.numero_final}.pdf"
+        return f"{nome.sem_numeros}.pdf"
+
+    def _criar_pasta_segura(self, caminho: str) -> bool:
+        """
+        Cria uma pasta com tratamento de erros
+
+        Args:
+            caminho (str): Caminho da pasta a ser criada
+
+        Returns:
+            bool: True se criada com sucesso, False caso contrário
+        """
+        try:
+            with METRICAS.etapa('mkdir'):
+                os.makedirs(caminho, exist_ok=True)
+            return True
+        except Exception as e:
+            METRICAS.contar('erros')
+            print(f"Erro ao criar pasta {caminho}: {e}")
+            return False
+
+    def processar_notas_fiscais(self, incremental: bool = False) -> None:
+        """
+        Processa todos os arquivos PDF de notas fiscais, organizando em pastas por empresa
+        e renomeando os arquivos conforme especificado
+        """
+        if not os.path.exists(self.nfs_dir):
+            print(f"Diretório de notas fiscais não encontrado: {self.nfs_dir}")
+            return
+
+        # Criar diretório principal se não existir
+        self._criar_pasta_segura(self.dest_dir)
+
+        # No modo incremental só as notas novas ou alteradas são colocadas de novo
+        colocador = self.colocador
+        manifesto = None
+        if incremental:
+            from leitor.manifesto import MANIFESTO_PADRAO, ColocadorIncremental, Manifesto
+
+            manifesto = Manifesto(os.path.join(self.dest_dir, MANIFESTO_PADRAO))
+            colocador = ColocadorIncremental(self.colocador, manifesto)
+
+        with METRICAS.etapa('listagem'):
+            listagem = listar_pdfs(self.nfs_dir)
+        # Empresa e nome de destino de cada nota, numa passada só pela listagem
+        nomes = nomes_notas(arquivo for arquivo, _ in listagem)
+        origens = {arquivo: caminho for arquivo, caminho in listagem}
+
+        # A barra de progresso só interessa a quem está olhando o terminal
+        if self.progresso:
+            from tqdm import tqdm
+            nomes = tqdm(nomes, desc="Processando notas fiscais")
+
+        for nome in nomes:
+            arquivo = nome.arquivo
+            try:
+                # Definir caminhos
+                pasta_empresa = os.path.join(self.dest_dir, nome.empresa)
+                caminho_destino = os.path.join(pasta_empresa, self._novo_nome(nome))
+
+                # Criar pasta e colocar arquivo
+                if self._criar_pasta_segura(pasta_empresa):
+                    caminho_origem = origens[arquivo]
+                    with METRICAS.etapa('colocacao'):
+                        colocador.colocar(caminho_origem, caminho_destino)
+                    print(f"Organizado: {arquivo} -> {caminho_destino}")
+
+            except Exception as e:
+                METRICAS.contar('erros')
+                print(f"Erro ao processar {arquivo}: {e}")
+
+        if manifesto is not None:
+            presentes = [caminho for _, caminho in listar(self.nfs_dir)]
+            manifesto.remover_ausentes(presentes, self.nfs_dir)
+            manifesto.salvar()
+
+    def executar(self, incremental: bool = False) -> None:
+        """
+        Executa o fluxo completo de organização
+        """
+        print("Iniciando organização de notas fiscais...")
+        print(f"Origem: {self.nfs_dir}")
+        print(f"Destino: {self.dest_dir}\n")
+
+        self.processar_notas_fiscais(incremental)
+
+        print("\nOrganização concluída com sucesso!")
+
+
+class OrganizadorDocumentosPorRelacao:
+    def __init__(self, boletos_dir='Arquivos/BOLETOS', notas_dir='Arquivos/NOTA_FISCAL', destino='Arquivos/ORGANIZADOS', modo=MODO_PADRAO,
+                 semelhanca='compativel', k=None, duplicados='manter'):
+        self.boletos_dir = os.path.abspath(boletos_dir)
+        self.notas_dir = os.path.abspath(notas_dir)
+        self.destino = os.path.abspath(destino)
+        self.colocador = Colocador(modo)
+        # "compativel" reproduz a regra antiga (contido ou ratio > 0.6); "ngramas" pega os k mais parecidos
+        self.semelhanca = semelhanca
+        self.k = k
+        # "pular" ou "linkar" evita copiar de novo PDFs idênticos salvos com outro nome
+        self.duplicados = duplicados
+
+    def _normalizar_nome(self, nome):
+        """Normaliza nomes para facilitar comparação"""
+        from leitor.semelhanca import normalizar
+
+        # Remove caracteres especiais e converte para minúsculas
+        return normalizar(nome)
+
+    def _verificar_semelhanca(self, nome1, nome2, threshold=0.6):
+        """Verifica se dois nomes têm semelhança (um contido no outro ou ratio do difflib)"""
+        from leitor.semelhanca import IndiceNomes
+
+        return bool(IndiceNomes([nome2]).compativeis(nome1, threshold))
+
+    def _criar_pasta_segura(self, caminho):
+        """Cria pastas de forma segura"""
+        try:
+            with METRICAS.etapa('mkdir'):
+                os.makedirs(caminho, exist_ok=True)
+            return True
+        except Exception as e:
+            METRICAS.contar('erros')
+            print(f"Erro ao criar pasta {caminho}: {e}")
+            return False
+
+    def _copiar_pasta(self, origem, destino, manter_origem=False):
+        """Copia uma pasta e seu conteúdo para o destino (com manter_origem, nunca a move)"""
+        if not os.path.exists(destino):
+            try:
+                with METRICAS.etapa('colocacao'):
+                    self.colocador.colocar_pasta(origem, destino, manter_origem)
+                return True
+            except Exception as e:
+                METRICAS.contar('erros')
+                print(f"Erro ao copiar pasta {origem} para {destino}: {e}")
+                return False
+        return False
+
+    def detectar_duplicados(self, texto=False):
+        """Procura PDFs idênticos nas pastas de boletos e notas e grava duplicados.csv no destino"""
+        from leitor.duplicados import detectar, escrever_relatorio
+
+        caminhos = []
+        for raiz in (self.boletos_dir, self.notas_dir):
+            for pasta, _, arquivos in sorted(os.walk(raiz)):
+                caminhos.extend(os.path.join(pasta, a) for a in sorted(arquivos) if a.lower().endswith('.pdf'))
+        duplicatas = detectar(caminhos, texto)
+        relatorio = escrever_relatorio(duplicatas, os.path.join(self.destino, "duplicados.csv"))
+        for d in duplicatas:
+            print(f"Duplicado ({d.criterio}): {d.caminho} = {d.original}")
+        print(f"{len(duplicatas)} arquivo(s) duplicado(s); relatório em {relatorio}")
+        return duplicatas
+
+    def organizar(self):
+        """Função principal para organizar os documentos"""
+        from leitor.semelhanca import relacionar
+
+        print("Iniciando organização de documentos...")
+
+        # Verifica se os diretórios existem
+        if not os.path.exists(self.boletos_dir):
+            print(f"Diretório de boletos não encontrado: {self.boletos_dir}")
+            return
+
+        if not os.path.exists(self.notas_dir):
+            print(f"Diretório de notas fiscais não encontrado: {self.notas_dir}")
+            return
+
+        # Cria diretório de destino
+        self._criar_pasta_segura(self.destino)
+
+        # Duplicatas são resolvidas antes de qualquer cópia
+        if self.duplicados != 'manter':
+            from leitor.duplicados import ColocadorDuplicatas, mapa_originais
+
+            originais = mapa_originais(self.detectar_duplicados())
+            self.colocador = ColocadorDuplicatas(self.colocador, originais, self.duplicados)
+
+        # Lista pastas de boletos e notas fiscais
+        with METRICAS.etapa('listagem'):
+            pastas_boletos = [d for d in os.listdir(self.boletos_dir)
+                              if os.path.isdir(os.path.join(self.boletos_dir, d))]
+
+            pastas_notas = [d for d in os.listdir(self.notas_dir)
+                            if os.path.isdir(os.path.join(self.notas_dir, d))]
+
+        # Compara cada boleto com todas as notas de uma vez (nomes indexados uma única vez)
+        with METRICAS.etapa('semelhanca'):
+            relacoes = relacionar(pastas_boletos, pastas_notas, self.semelhanca, self.k)
+        # Uma pasta pode entrar em várias relações: no modo "mover" ela é copiada em todas
+        # menos na última, senão as seguintes não a encontrariam mais
+        usos_boletos = Counter({boleto: len(relacoes[boleto]) for boleto in pastas_boletos})
+        usos_notas = Counter(candidato.nome for boleto in pastas_boletos for candidato in relacoes[boleto])
+        for boleto in pastas_boletos:
+            for candidato in relacoes[boleto]:
+                nota = candidato.nome
+                # Encontrou relação, cria pasta unificada
+                nome_unificado = f"{boleto}_{nota}"
+                pasta_unificada = os.path.join(self.destino, nome_unificado)
+
+                if self._criar_pasta_segura(pasta_unificada):
+                    # Cria subpastas
+                    pasta_boleto_dest = os.path.join(pasta_unificada, "BOLETOS")
+                    pasta_nota_dest = os.path.join(pasta_unificada, "NOTAS_FISCAIS")
+
+                    # Copia conteúdo
+                    origem_boleto = os.path.join(self.boletos_dir, boleto)
+                    origem_nota = os.path.join(self.notas_dir, nota)
+
+                    usos_boletos[boleto] -= 1
+                    if self._copiar_pasta(origem_boleto, pasta_boleto_dest, usos_boletos[boleto] > 0):
+                        print(f"Boleto copiado: {boleto}")
+
+                    usos_notas[nota] -= 1
+                    if self._copiar_pasta(origem_nota, pasta_nota_dest, usos_notas[nota] > 0):
+                        print(f"Nota fiscal copiada: {nota}")
+
+                    print(f"Relação encontrada e organizada: {boleto} <-> {nota} ({candidato.pontuacao:.2f})")
+
+        print("\nOrganização concluída com sucesso!")
@@ -0,0 +1,161 @@
+"""PDFs dentro de pacotes ZIP e TAR, lidos e colocados sem descompactar em disco
+
+Um PDF dentro de um pacote é endereçado como "<caminho do pacote>::<nome do membro>"
+(SEPARADOR). Esses caminhos passam pela listagem, pela extração, pelo cache e pela
+colocação como qualquer outro: quem abre um arquivo por aqui recebe os bytes do membro
+direto do pacote. O nome usado para organizar e casar documentos é o nome do membro
+(sem as pastas de dentro do pacote).
+
+Cada processo mantém abertos os últimos MAX_ABERTOS pacotes usados, então o índice de um
+ZIP (ou o cabeçalho de cada membro de um TAR) é lido uma vez, não uma vez por membro.
+TARs comprimidos (.tar.gz, .tgz...) só podem ser lidos do começo: acessar os membros fora
+de ordem descomprime o pacote de novo a cada volta.
+"""
+import io
+import os
+import tarfile
+import threading
+import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+SEPARADOR = '::'
+EXTENSOES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+MAX_ABERTOS = 16  # pacotes mantidos abertos por processo
+
+
+class _Aberto(NamedTuple):
+    pid: int
+    mtime_ns: int
+    pacote: object               # zipfile.ZipFile ou tarfile.TarFile
+    membros: dict                # nome do membro -> ZipInfo ou TarInfo
+    trava: threading.Lock        # o TarFile não pode ser lido por duas threads ao mesmo tempo
+
+
+_ABERTOS: 'OrderedDict[str, _Aberto]' = OrderedDict()
+_TRAVA = threading.Lock()
+
+
+def eh_pacote(nome: str) -> bool:
+    return nome.lower().endswith(EXTENSOES)
+
+
+def separar(caminho: str) -> Optional[Tuple[str, str]]:
+    """(pacote, membro) de um caminho de membro, ou None para um arquivo comum"""
+    pacote, separador, membro = caminho.partition(SEPARADOR)
+    if not separador:
+        return None
+    return pacote, membro.replace('\\', '/')
+
+
+def _membro_valido(nome: str) -> bool:
+    partes = nome.split('/')
+    return nome.lower().endswith('.pdf') and not nome.startswith('/') and '..' not in partes
+
+
+def _abrir_pacote(pacote: str) -> _Aberto:
+    """Pacote aberto neste processo (reaberto se o arquivo mudou ou o processo é outro)"""
+    mtime_ns = os.stat(pacote).st_mtime_ns
+    with _TRAVA:
+        aberto = _ABERTOS.get(pacote)
+        if aberto is not None and aberto.pid == os.getpid() and aberto.mtime_ns == mtime_ns:
+            _ABERTOS.move_to_end(pacote)
+            return aberto
+        if aberto is not None and aberto.pid == os.getpid():
+            aberto.pacote.close()
+        # Um pacote herdado de outro processo (fork) não é fechado: o descritor é compartilhado
+        _ABERTOS.pop(pacote, None)
+        if zipfile.is_zipfile(pacote):
+            arquivo = zipfile.ZipFile(pacote)
+            membros = {info.filename: info for info in arquivo.infolist()
+                       if not info.is_dir() and _membro_valido(info.filename)}
+        else:
+            arquivo = tarfile.open(pacote)
+            membros = {info.name: info for info in arquivo.getmembers()
+                       if info.isfile() and _membro_valido(info.name)}
+        aberto = _Aberto(os.getpid(), mtime_ns, arquivo, membros, threading.Lock())
+        _ABERTOS[pacote] = aberto
+        while len(_ABERTOS) > MAX_ABERTOS:
+            _, antigo = _ABERTOS.popitem(last=False)
+            if antigo.pid == os.getpid():
+                antigo.pacote.close()
+        return aberto
+
+
+def _info(caminho: str):
+    pacote, membro = separar(caminho)
+    aberto = _abrir_pacote(pacote)
+    info = aberto.membros.get(membro)
+    if info is None:
+        raise FileNotFoundError(f"'{membro}' não está no pacote '{pacote}'")
+    return aberto, info
+
+
+@contextmanager
+def abrir(caminho: str):
+    """Abre para leitura binária um arquivo comum ou um membro de pacote"""
+    if separar(caminho) is None:
+        with open(caminho, 'rb') as f:
+            yield f
+        return
+    aberto, info = _info(caminho)
+    if isinstance(aberto.pacote, zipfile.ZipFile):
+        with aberto.pacote.open(info) as f:  # o ZipFile aceita leituras simultâneas
+            yield f
+        return
+    with aberto.trava:
+        dados = aberto.pacote.extractfile(info).read()
+    yield io.BytesIO(dados)
+
+
+def tamanho(caminho: str) -> int:
+    """Tamanho em bytes do arquivo ou do membro (descomprimido)"""
+    if separar(caminho) is None:
+        return os.path.getsize(caminho)
+    _, info = _info(caminho)
+    return info.file_size if isinstance(info, zipfile.ZipInfo) else info.size
+
+
+def existe(caminho: str) -> bool:
+    if separar(caminho) is None:
+        return os.path.exists(caminho)
+    try:
+        _info(caminho)
+    except (OSError, zipfile.BadZipFile, tarfile.TarError):
+        return False
+    return True
+
+
+def estado(caminho: str) -> Tuple[int, int]:
+    """(tamanho, mtime_ns) para saber se o arquivo mudou; um membro usa o mtime do pacote"""
+    if separar(caminho) is None:
+        st = os.stat(caminho)
+        return st.st_size, st.st_mtime_ns
+    return tamanho(caminho), os.stat(separar(caminho)[0]).st_mtime_ns
+
+
+def listar(pasta: str, filtro: Optional[Callable[[str], bool]] = None) -> List[Tuple[str, str]]:
+    """(nome, caminho) de cada arquivo da pasta, na ordem do os.listdir
+
+    Cada pacote dá lugar aos PDFs de dentro dele, na ordem em que estão no pacote. filtro
+    escolhe, pelo nome, quais dos outros arquivos entram (padrão: todos).
+    """
+    arquivos = []
+    for nome in os.listdir(pasta):
+        caminho = os.path.join(pasta, nome)
+        if eh_pacote(nome) and os.path.isfile(caminho):
+            try:
+                membros = _abrir_pacote(caminho).membros
+            except (zipfile.BadZipFile, tarfile.TarError) as e:
+                print(f"\nAviso: pacote '{caminho}' ilegível: {e}")
+                continue
+            arquivos.extend((membro.rsplit('/', 1)[-1], f'{caminho}{SEPARADOR}{membro}') for membro in membros)
+        elif filtro is None or filtro(nome):
+            arquivos.append((nome, caminho))
+    return arquivos
+
+
+def listar_pdfs(pasta: str) -> List[Tuple[str, str]]:
+    """(nome, caminho) dos PDFs da pasta, soltos ou dentro de pacotes"""
+    return listar(pasta, lambda nome: nome.lower().endswith('.pdf'))
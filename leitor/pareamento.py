@@ -0,0 +1,99 @@
+"""Pareamento exato boleto <-> NF por (CNPJ do sacado/tomador, valor em centavos)
+
+O valor do boleto vem da linha digitável validada; os valores da NF vêm dos campos
+monetários do texto. O pareamento é uma junção por hash: as NFs são indexadas uma vez e
+cada boleto é resolvido com uma consulta ao dicionário, em tempo O(n). O CNPJ da chave é
+a chave inteira de leitor.cnpj, com os dígitos verificadores conferidos: um falso
+positivo da leitura não forma par.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from datetime import date
+
+from leitor import cnpj as cnpjs
+from leitor.boleto import Boleto, tentar_decodificar
+from leitor.documentos import Documento
+
+
+class Par(NamedTuple):
+    boleto: str
+    nf: str
+    cnpj: str
+    valor_centavos: int
+    vencimento: Optional[date]
+    nosso_numero: Optional[str]
+
+
+class Pareamento(NamedTuple):
+    pares: List[Par]
+    ambiguos: List[str]        # boletos com mais de uma NF possível (ou NF disputada)
+    boletos_sem_nf: List[str]  # boletos sem linha digitável válida ou sem NF com a mesma chave
+    nfs_sem_boleto: List[str]
+
+
+def valor_em_centavos(valor: str) -> int:
+    """Converte '41.200,22' em 4120022"""
+    return int(valor.replace('.', '').replace(',', ''))
+
+
+def decodificar_boleto(doc: Documento, referencia: Optional[date] = None) -> Optional[Boleto]:
+    """Primeira linha digitável válida encontrada no documento"""
+    for linha in doc.linhas_digitaveis:
+        boleto = tentar_decodificar(linha, referencia)
+        if boleto is not None:
+            return boleto
+    return None
+
+
+def indexar_nfs(nfs: Iterable[Documento]) -> Dict[Tuple[int, int], List[Documento]]:
+    """Índice {(chave do CNPJ, valor_centavos): [NFs]} com cada valor distinto de cada NF
+
+    NFs sem segundo CNPJ válido ficam de fora.
+    """
+    nfs = list(nfs)
+    indice: Dict[Tuple[int, int], List[Documento]] = {}
+    for nf, chave in zip(nfs, cnpjs.chaves(nf.segundo_cnpj for nf in nfs)):
+        if chave == cnpjs.INVALIDO:
+            continue
+        for centavos in {valor_em_centavos(v) for v in nf.valores}:
+            indice.setdefault((chave, centavos), []).append(nf)
+    return indice
+
+
+def parear(boletos: Iterable[Documento], nfs: Iterable[Documento],
+           referencia: Optional[date] = None) -> Pareamento:
+    """Pareia boletos e NFs pela chave exata (CNPJ, valor)"""
+    nfs = list(nfs)
+    indice = indexar_nfs(nfs)
+    boletos = list(boletos)
+
+    candidatos: List[Tuple[Documento, Boleto, Documento]] = []
+    ambiguos: List[str] = []
+    sem_nf: List[str] = []
+    # Códigos de barras distintos que apontam para cada NF (cópias do mesmo boleto contam uma vez)
+    disputa: Dict[str, Set[str]] = {}
+    for doc, chave in zip(boletos, cnpjs.chaves(doc.segundo_cnpj for doc in boletos)):
+        boleto = decodificar_boleto(doc, referencia)
+        if boleto is None or chave == cnpjs.INVALIDO:
+            sem_nf.append(doc.nome)
+            continue
+        encontrados = indice.get((chave, boleto.valor_centavos), [])
+        if len(encontrados) == 1:
+            nf = encontrados[0]
+            candidatos.append((doc, boleto, nf))
+            disputa.setdefault(nf.nome, set()).add(boleto.codigo_barras)
+        elif encontrados:
+            ambiguos.append(doc.nome)
+        else:
+            sem_nf.append(doc.nome)
+
+    pares: List[Par] = []
+    for doc, boleto, nf in candidatos:
+        if len(disputa[nf.nome]) > 1:
+            ambiguos.append(doc.nome)
+        else:
+            pares.append(Par(doc.nome, nf.nome, doc.segundo_cnpj, boleto.valor_centavos,
+                             boleto.vencimento, boleto.nosso_numero))
+
+    pareadas = {par.nf for par in pares}
+    nfs_sem_boleto = [nf.nome for nf in nfs if nf.nome not in pareadas]
+    return Pareamento(pares, ambiguos, sem_nf, nfs_sem_boleto)
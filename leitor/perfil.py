@@ -0,0 +1,154 @@
+"""Perfil de execução: cProfile, amostragem de pilhas e alocações (tracemalloc)
+
+Um bloco envolvido por Perfilador('perfil') grava:
+
+    perfil.pstats           estatísticas do cProfile (python -m pstats perfil.pstats, snakeviz...)
+    perfil.collapsed        pilhas amostradas no formato "a;b;c contagem" (flamegraph.pl, speedscope)
+    perfil.alocacoes.txt    linhas que mais alocaram memória e o pico do tracemalloc
+
+Todas as threads do processo principal entram no perfil: cada thread criada dentro do
+bloco (colocação em segundo plano, varredura, lotes) ganha o seu cProfile, e as
+estatísticas são somadas no fim; as pilhas amostradas começam pelo nome da thread.
+Outros processos não são medidos; com --workers > 1 a leitura dos PDFs acontece fora
+do processo principal, então para ver o PyPDF2 no perfil use um único processo.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import List, Optional
+
+INTERVALO_PADRAO = 0.005  # segundos entre amostras de pilha
+ALOCACOES_PADRAO = 30     # linhas no relatório de alocações
+# A partir do 3.12 o cProfile usa sys.monitoring, que já vale para todas as threads
+PERFIL_GLOBAL = sys.version_info >= (3, 12)
+
+
+class Amostrador(threading.Thread):
+    """Amostra periodicamente a pilha de todas as threads e conta as pilhas repetidas
+
+    Cada pilha começa pelo nome da thread ("thread MainThread;main (main.py:10);..."),
+    para separar no flamegraph o trabalho de cada uma.
+    """
+
+    def __init__(self, intervalo: float = INTERVALO_PADRAO) -> None:
+        super().__init__(name='amostrador-perfil', daemon=True)
+        self.intervalo = intervalo
+        self.pilhas: Counter = Counter()
+        self._parar = threading.Event()
+
+    def run(self) -> None:
+        while not self._parar.wait(self.intervalo):
+            nomes = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == self.ident:
+                    continue
+                pilha = []
+                while frame is not None:
+                    codigo = frame.f_code
+                    pilha.append(f'{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})')
+                    frame = frame.f_back
+                if pilha:
+                    pilha.append(f'thread {nomes.get(ident, ident)}')
+                    self.pilhas[';'.join(reversed(pilha))] += 1
+
+    def parar(self) -> None:
+        self._parar.set()
+        self.join()
+
+    def colapsado(self) -> str:
+        return ''.join(f'{pilha} {contagem}\n' for pilha, contagem in self.pilhas.most_common())
+
+
+class Perfilador:
+    def __init__(self, prefixo: str = 'perfil', intervalo: float = INTERVALO_PADRAO,
+                 alocacoes: Optional[int] = ALOCACOES_PADRAO, quadros: int = 1) -> None:
+        """alocacoes=None desliga o tracemalloc (que deixa a execução bem mais lenta)"""
+        self.prefixo = prefixo
+        self.intervalo = intervalo
+        self.alocacoes = alocacoes
+        self.quadros = quadros
+        self.arquivos: List[str] = []
+        self._perfis: List[cProfile.Profile] = []
+        self._trava = threading.Lock()
+
+    def _perfilar_thread(self, *_) -> None:
+        """Chamado pelo threading no primeiro evento de cada thread nova: liga um cProfile nela"""
+        perfil = cProfile.Profile()
+        perfil.enable()  # substitui este gancho pelo do cProfile, só nesta thread
+        with self._trava:
+            self._perfis.append(perfil)
+
+    def __enter__(self) -> 'Perfilador':
+        if self.alocacoes:
+            tracemalloc.start(self.quadros)
+        self._amostrador = Amostrador(self.intervalo)
+        self._amostrador.start()
+        if not PERFIL_GLOBAL:
+            threading.setprofile(self._perfilar_thread)
+        self._perfis = [cProfile.Profile()]
+        self._perfis[0].enable()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._perfis[0].disable()
+        if not PERFIL_GLOBAL:
+            threading.setprofile(None)
+        self._amostrador.parar()
+        diretorio = os.path.dirname(os.path.abspath(self.prefixo))
+        os.makedirs(diretorio, exist_ok=True)
+
+        caminho = f'{self.prefixo}.pstats'
+        self.estatisticas().dump_stats(caminho)
+        self.arquivos.append(caminho)
+
+        caminho = f'{self.prefixo}.collapsed'
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write(self._amostrador.colapsado())
+        self.arquivos.append(caminho)
+
+        if self.alocacoes:
+            caminho = f'{self.prefixo}.alocacoes.txt'
+            with open(caminho, 'w', encoding='utf-8') as f:
+                f.write(self._relatorio_alocacoes())
+            tracemalloc.stop()
+            self.arquivos.append(caminho)
+
+        print('\n' + self.resumo())
+
+    def _relatorio_alocacoes(self) -> str:
+        atual, pico = tracemalloc.get_traced_memory()
+        estatisticas = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        )).statistics('lineno')
+        linhas = [f'Memória rastreada: atual {atual / 2 ** 20:.1f} MB, pico {pico / 2 ** 20:.1f} MB',
+                  f'{self.alocacoes} linhas com mais memória alocada ainda em uso no fim:', '']
+        for estatistica in estatisticas[:self.alocacoes]:
+            quadro = estatistica.traceback[0]
+            linhas.append(f'{estatistica.size / 1024:10.1f} KiB {estatistica.count:8d} blocos  '
+                          f'{quadro.filename}:{quadro.lineno}')
+        return '\n'.join(linhas) + '\n'
+
+    def estatisticas(self, stream=None) -> pstats.Stats:
+        """Estatísticas do cProfile de todas as threads somadas"""
+        with self._trava:
+            perfis = list(self._perfis)
+        estatisticas = pstats.Stats(perfis[0], stream=stream)
+        for perfil in perfis[1:]:
+            estatisticas.add(perfil)
+        return estatisticas
+
+    def resumo(self, funcoes: int = 15) -> str:
+        """Funções com maior tempo acumulado e os arquivos gravados"""
+        saida = io.StringIO()
+        self.estatisticas(saida).sort_stats('cumulative').print_stats(funcoes)
+        texto = saida.getvalue().strip()
+        return texto + '\n\nPerfil gravado em:\n' + '\n'.join(f'  {caminho}' for caminho in self.arquivos)
+
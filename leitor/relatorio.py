@@ -0,0 +1,49 @@
+"""Resumo da pasta de saída (Arquivos/) montado só com os nomes de pastas e arquivos
+
+Nenhum PDF é aberto: conta as pastas de boletos e de empresas, os pares em ORGANIZADOS
+e lista os boletos que ainda não foram relacionados a nenhuma nota.
+"""
+import os
+from typing import Dict, List
+
+
+def _pastas(caminho: str) -> List[str]:
+    if not os.path.isdir(caminho):
+        return []
+    with os.scandir(caminho) as entradas:
+        return sorted(e.name for e in entradas if e.is_dir())
+
+
+def _contar_pdfs(caminho: str) -> int:
+    total = 0
+    for _, _, arquivos in os.walk(caminho):
+        total += sum(1 for a in arquivos if a.lower().endswith('.pdf'))
+    return total
+
+
+def resumo_arquivos(base: str = 'Arquivos') -> Dict:
+    """Contagens de BOLETOS, NOTA_FISCAL e ORGANIZADOS e os boletos sem nota relacionada"""
+    boletos = _pastas(os.path.join(base, 'BOLETOS'))
+    empresas = _pastas(os.path.join(base, 'NOTA_FISCAL'))
+    pares = _pastas(os.path.join(base, 'ORGANIZADOS'))
+    # A pasta unificada é "BOLETO_NOTA" e o nome do boleto nunca tem "_" (Aut troca por espaço)
+    relacionados = {par.split('_', 1)[0] for par in pares}
+    return {
+        'base': os.path.abspath(base),
+        'boletos': {'pastas': len(boletos), 'pdfs': _contar_pdfs(os.path.join(base, 'BOLETOS'))},
+        'notas': {'pastas': len(empresas), 'pdfs': _contar_pdfs(os.path.join(base, 'NOTA_FISCAL'))},
+        'relacionados': len(pares),
+        'boletos_sem_nota': [boleto for boleto in boletos if boleto not in relacionados],
+    }
+
+
+def formatar(resumo: Dict) -> str:
+    linhas = [
+        f"Pasta: {resumo['base']}",
+        f"Boletos: {resumo['boletos']['pdfs']} PDF(s) em {resumo['boletos']['pastas']} pasta(s)",
+        f"Notas fiscais: {resumo['notas']['pdfs']} PDF(s) em {resumo['notas']['pastas']} pasta(s) de empresa",
+        f"Relações boleto <-> nota: {resumo['relacionados']}",
+        f"Boletos sem nota relacionada: {len(resumo['boletos_sem_nota'])}",
+    ]
+    linhas.extend(f"  {boleto}" for boleto in resumo['boletos_sem_nota'])
+    return '\n'.join(linhas)
@@ -0,0 +1,88 @@
+"""Resultados de uma execução da organização por CNPJ, para o relatório final
+
+Os resultados são anotados enquanto os documentos são classificados (quantos boletos,
+NFs e PDFs avulsos foram para cada pasta e quais documentos ficaram pendentes), então o
+relatório não lista pastas nem abre PDFs: o custo depende da quantidade de pastas e de
+pendências, não do tamanho da árvore de saída.
+
+    relatorio.csv   pasta;categoria;boletos;nfs;avulsos
+    pendencias.csv  tipo;arquivo;motivo
+    relatorio.json  o mesmo, mais os totais e as métricas da execução (etapas, contadores)
+"""
+import csv
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Categorias das pastas de saída
+CNPJ = 'cnpj'                    # boletos e NFs do mesmo CNPJ
+APENAS_NF = 'apenas_nf'          # NF_<cnpj>: NFs sem boleto do CNPJ
+SEM_CNPJ = 'sem_cnpj'            # NFs_SEM_CNPJ_IDENTIFICADO
+TERCEIRO_CNPJ = 'terceiro_cnpj'  # PDFs avulsos, pelo terceiro CNPJ
+
+# Motivos de pendência
+BOLETO_SEM_NF = 'boleto_sem_nf'
+SEM_SEGUNDO_CNPJ = 'sem_segundo_cnpj'
+CNPJ_INVALIDO = 'cnpj_invalido'  # dígitos verificadores errados (falso positivo da leitura)
+SEM_TERCEIRO_CNPJ = 'sem_terceiro_cnpj'
+ERRO_LEITURA = 'erro_leitura'
+FALHA_COLOCACAO = 'falha_colocacao'
+
+
+class Resultados:
+    def __init__(self) -> None:
+        self.pastas: Dict[str, Counter] = {}
+        self.categorias: Dict[str, str] = {}
+        self.pendencias: List[Tuple[str, str, str]] = []  # (tipo, arquivo, motivo)
+
+    def colocado(self, pasta: str, categoria: str, tipo: str, quantidade: int = 1) -> None:
+        """Anota quantidade documentos do tipo ('boletos', 'nfs' ou 'avulsos') colocados na pasta"""
+        if pasta not in self.pastas:
+            self.pastas[pasta] = Counter()
+            self.categorias[pasta] = categoria
+        self.pastas[pasta][tipo] += quantidade
+
+    def pendente(self, tipo: str, arquivo: str, motivo: str) -> None:
+        self.pendencias.append((tipo, arquivo, motivo))
+
+    def totais(self) -> Dict[str, int]:
+        totais: Counter = Counter()
+        for pasta, contagem in self.pastas.items():
+            totais[f'pastas_{self.categorias[pasta]}'] += 1
+            totais.update(contagem)
+        for _, _, motivo in self.pendencias:
+            totais[f'pendencias_{motivo}'] += 1
+        return dict(totais)
+
+    def para_dict(self, metricas: Optional[dict] = None) -> dict:
+        dados = {
+            'totais': self.totais(),
+            'pastas': [{'pasta': pasta, 'categoria': self.categorias[pasta], 'boletos': contagem['boletos'],
+                        'nfs': contagem['nfs'], 'avulsos': contagem['avulsos']}
+                       for pasta, contagem in sorted(self.pastas.items())],
+            'pendencias': [{'tipo': tipo, 'arquivo': arquivo, 'motivo': motivo}
+                           for tipo, arquivo, motivo in self.pendencias],
+        }
+        if metricas is not None:
+            dados['metricas'] = metricas
+        return dados
+
+    def exportar(self, pasta: str, metricas: Optional[dict] = None) -> Tuple[str, str, str]:
+        """Grava relatorio.csv, pendencias.csv e relatorio.json na pasta; retorna os três caminhos"""
+        os.makedirs(pasta, exist_ok=True)
+        caminho_csv = os.path.join(pasta, 'relatorio.csv')
+        with open(caminho_csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow(['pasta', 'categoria', 'boletos', 'nfs', 'avulsos'])
+            for nome, contagem in sorted(self.pastas.items()):
+                writer.writerow([nome, self.categorias[nome], contagem['boletos'], contagem['nfs'], contagem['avulsos']])
+        caminho_pendencias = os.path.join(pasta, 'pendencias.csv')
+        with open(caminho_pendencias, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow(['tipo', 'arquivo', 'motivo'])
+            writer.writerows(self.pendencias)
+        caminho_json = os.path.join(pasta, 'relatorio.json')
+        with open(caminho_json, 'w', encoding='utf-8') as f:
+            json.dump(self.para_dict(metricas), f, ensure_ascii=False, indent=2)
+        return caminho_csv, caminho_pendencias, caminho_json
@@ -0,0 +1,191 @@
+"""Semelhança entre nomes de pastas (condomínios/empresas) calculada em lote
+
+Cada nome é normalizado e convertido em vetores uma única vez; as comparações de um
+nome contra todos os outros são feitas de uma vez, com NumPy quando estiver instalado.
+
+Há dois modos:
+
+- "compativel": o mesmo resultado da regra antiga (um nome contido no outro ou
+  SequenceMatcher.ratio() acima do limiar). A contagem de caracteres dá um limite
+  superior do ratio (o quick_ratio do difflib), calculado em lote; o SequenceMatcher
+  só roda para os poucos pares que passam desse filtro.
+- "ngramas": similaridade do cosseno entre vetores de n-gramas de caracteres, com os
+  k melhores candidatos de cada nome.
+
+NumPy e difflib só são importados quando um índice realmente precisa deles, para que a
+comparação de poucos nomes (o caso comum na linha de comando) comece rápido.
+"""
+import math
+import re
+import string
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+MODOS = ('compativel', 'ngramas')
+LIMIAR_PADRAO = 0.6
+LIMIAR_NGRAMAS = 0.3  # cosseno mínimo no modo "ngramas"
+ALFABETO = string.ascii_lowercase + string.digits
+_POSICAO = {c: i for i, c in enumerate(ALFABETO)}
+# Com menos nomes que isso o NumPy não compensa nem o tempo de importação (~50 ms)
+MINIMO_NUMPY = 200
+
+
+class Candidato(NamedTuple):
+    """Nome candidato (posição na lista indexada, nome original e pontuação)"""
+    indice: int
+    nome: str
+    pontuacao: float
+
+
+def normalizar(nome: str) -> str:
+    """Remove caracteres especiais e converte para minúsculas"""
+    return re.sub(r'[^a-zA-Z0-9]', '', nome).lower()
+
+
+def _numpy(quantidade: int):
+    """O módulo numpy para índices grandes; None se não compensar ou não estiver instalado"""
+    if quantidade < MINIMO_NUMPY:
+        return None
+    try:
+        import numpy
+    except ImportError:  # NumPy é opcional; sem ele os cálculos em lote são feitos em Python
+        return None
+    return numpy
+
+
+def ngramas(nome_normalizado: str, n: int = 3) -> Counter:
+    """Contagem dos n-gramas de caracteres (nomes curtos viram um único n-grama)"""
+    if len(nome_normalizado) <= n:
+        return Counter([nome_normalizado]) if nome_normalizado else Counter()
+    return Counter(nome_normalizado[i:i + n] for i in range(len(nome_normalizado) - n + 1))
+
+
+class IndiceNomes:
+    def __init__(self, nomes: Sequence[str], n: int = 3) -> None:
+        self.nomes = list(nomes)
+        self.normalizados = [normalizar(nome) for nome in self.nomes]
+        self.n = n
+        self._contagens = [self._contar(nome) for nome in self.normalizados]
+        self._tamanhos = [len(nome) for nome in self.normalizados]
+        self._np = np = _numpy(len(self.nomes))
+        if np is not None:
+            self._contagens_np = np.array(self._contagens, dtype=np.int32).reshape(len(self.nomes), len(ALFABETO))
+            self._tamanhos_np = np.array(self._tamanhos, dtype=np.int32)
+        self._postagens = None
+
+    @staticmethod
+    def _contar(nome_normalizado: str) -> List[int]:
+        contagem = [0] * len(ALFABETO)
+        for c in nome_normalizado:
+            contagem[_POSICAO[c]] += 1
+        return contagem
+
+    def _limite_superior(self, nome_normalizado: str) -> Tuple[list, list]:
+        """Caracteres em comum com cada nome indexado e o tamanho do menor nome de cada par"""
+        contagem = self._contar(nome_normalizado)
+        tamanho = len(nome_normalizado)
+        np = self._np
+        if np is not None:
+            comuns = np.minimum(self._contagens_np, np.array(contagem, dtype=np.int32)).sum(axis=1)
+            return comuns, np.minimum(self._tamanhos_np, tamanho)
+        presentes = [i for i, q in enumerate(contagem) if q]
+        comuns = [sum(min(c[i], contagem[i]) for i in presentes) for c in self._contagens]
+        return comuns, [min(t, tamanho) for t in self._tamanhos]
+
+    def compativeis(self, nome: str, limiar: float = LIMIAR_PADRAO) -> List[Candidato]:
+        """Nomes semelhantes pela regra antiga, do mais ao menos parecido
+
+        Um nome contido no outro recebe pontuação 1.0; os demais, o ratio do SequenceMatcher
+        (só entram os acima do limiar).
+        """
+        alvo = normalizar(nome)
+        comuns, menores = self._limite_superior(alvo)
+        tamanho = len(alvo)
+        np = self._np
+        if np is not None:
+            # Contido exige todos os caracteres do menor no maior; ratio <= 2 * comuns / (soma dos tamanhos)
+            possiveis = (comuns == menores) | (2 * comuns >= limiar * (self._tamanhos_np + tamanho) - 1e-9)
+            indices = np.flatnonzero(possiveis).tolist()
+        else:
+            indices = [i for i, (c, m, t) in enumerate(zip(comuns, menores, self._tamanhos))
+                       if c == m or 2 * c >= limiar * (t + tamanho) - 1e-9]
+
+        candidatos = []
+        for i in indices:
+            outro = self.normalizados[i]
+            if alvo in outro or outro in alvo:
+                pontuacao = 1.0
+            else:
+                import difflib
+                pontuacao = difflib.SequenceMatcher(None, alvo, outro).ratio()
+                if pontuacao <= limiar:
+                    continue
+            candidatos.append(Candidato(i, self.nomes[i], pontuacao))
+        candidatos.sort(key=lambda c: (-c.pontuacao, c.indice))
+        return candidatos
+
+    def _indexar_ngramas(self) -> None:
+        """Índice invertido n-grama -> (nomes, pesos), com vetores de norma 1"""
+        postagens: Dict[str, Tuple[list, list]] = defaultdict(lambda: ([], []))
+        for i, nome in enumerate(self.normalizados):
+            vetor = ngramas(nome, self.n)
+            norma = math.sqrt(sum(v * v for v in vetor.values())) or 1.0
+            for grama, v in vetor.items():
+                indices, pesos = postagens[grama]
+                indices.append(i)
+                pesos.append(v / norma)
+        np = self._np
+        if np is not None:
+            postagens = {g: (np.array(i, dtype=np.int64), np.array(p)) for g, (i, p) in postagens.items()}
+        self._postagens = dict(postagens)
+
+    def semelhantes(self, nome: str, k: int = 5, limiar: float = LIMIAR_NGRAMAS) -> List[Candidato]:
+        """Os k nomes com maior similaridade do cosseno entre n-gramas (acima do limiar)"""
+        if self._postagens is None:
+            self._indexar_ngramas()
+        vetor = ngramas(normalizar(nome), self.n)
+        norma = math.sqrt(sum(v * v for v in vetor.values())) or 1.0
+        consulta = [(self._postagens[g], v / norma) for g, v in vetor.items() if g in self._postagens]
+        if not consulta:
+            return []
+
+        np = self._np
+        if np is not None:
+            # Produto da matriz esparsa (nomes x n-gramas) pelo vetor da consulta
+            indices = np.concatenate([postagem[0] for postagem, _ in consulta])
+            pesos = np.concatenate([postagem[1] * peso for postagem, peso in consulta])
+            pontuacoes = np.bincount(indices, weights=pesos, minlength=len(self.nomes))
+            acima = np.flatnonzero(pontuacoes > limiar)
+            if len(acima) > k:
+                acima = acima[np.argpartition(-pontuacoes[acima], k - 1)[:k]]
+            melhores = [(int(i), float(pontuacoes[i])) for i in acima]
+        else:
+            acumulado: Dict[int, float] = defaultdict(float)
+            for (indices, pesos), peso in consulta:
+                for i, p in zip(indices, pesos):
+                    acumulado[i] += p * peso
+            melhores = [(i, p) for i, p in acumulado.items() if p > limiar]
+
+        melhores.sort(key=lambda par: (-par[1], par[0]))
+        return [Candidato(i, self.nomes[i], min(p, 1.0)) for i, p in melhores[:k]]
+
+
+def relacionar(nomes: Sequence[str], outros: Sequence[str], modo: str = 'compativel',
+               k: Optional[int] = None, limiar: Optional[float] = None) -> Dict[str, List[Candidato]]:
+    """Para cada nome, os candidatos semelhantes entre os outros
+
+    No modo "compativel" k=None devolve todos os pares aceitos pela regra antiga; no
+    modo "ngramas" k=None vale 5 e o limiar padrão é LIMIAR_NGRAMAS.
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo de semelhança inválido: {modo!r} (use um de {', '.join(MODOS)})")
+    indice = IndiceNomes(outros)
+    resultado = {}
+    for nome in nomes:
+        if modo == 'compativel':
+            candidatos = indice.compativeis(nome, LIMIAR_PADRAO if limiar is None else limiar)
+            resultado[nome] = candidatos if k is None else candidatos[:k]
+        else:
+            resultado[nome] = indice.semelhantes(nome, 5 if k is None else k,
+                                                 LIMIAR_NGRAMAS if limiar is None else limiar)
+    return resultado
@@ -0,0 +1,54 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Permite importar o pacote compartilhado "leitor" (e o gerador de benchmarks) da raiz do repositório
+sys.path.insert(0, RAIZ)
+
+# Corpus pequeno com uma classificação conhecida (pasta em ORGANIZADOS ou motivo da pendência)
+CNPJ_A = '49.865.378/0001-47'       # um boleto e duas NFs
+CNPJ_B = '36.108.122/0001-43'       # só NF
+CNPJ_C = '30.014.975/0001-30'       # só boleto
+CNPJ_ERRADO = '30.014.975/0001-31'  # dígito verificador errado
+
+
+@pytest.fixture
+def condominiais():
+    """CONDOMINIAIS/main.py importado pelo caminho (há dois main.py no repositório)"""
+    pytest.importorskip('tqdm')
+    pytest.importorskip('colorama')
+    from benchmarks.executar import carregar_modulo
+
+    return carregar_modulo('condominiais_main', os.path.join(RAIZ, 'CONDOMINIAIS', 'main.py'))
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Pasta com BOLETOS e NOTA_FISCAL no leiaute de CONDOMINIAIS"""
+    from benchmarks.corpus import CNPJ_PRESTADOR, PRESTADOR, pdf_texto, texto_boleto, texto_nf
+
+    base = tmp_path / 'CONDOMINIAIS'
+    boletos, nfs = base / 'BOLETOS', base / 'NOTA_FISCAL'
+    boletos.mkdir(parents=True)
+    nfs.mkdir()
+    dia = date(2025, 4, 1)
+    linha = '27490.00116 00000.000004 00000.000000 1 10470000012345'
+
+    def boleto(condominio, cnpj, numero):
+        nome = f'01-04-2025 - {PRESTADOR} - {condominio} - {numero}.pdf'
+        (boletos / nome).write_bytes(pdf_texto(texto_boleto(condominio, cnpj, linha, '123,45', dia, dia)))
+
+    def nf(condominio, numero, linhas):
+        (nfs / f'{condominio} - {numero}.pdf').write_bytes(pdf_texto(linhas))
+
+    boleto('SOLAR', CNPJ_A, 101)
+    nf('SOLAR', 1, texto_nf('SOLAR', CNPJ_A, 1, '123,45', dia))
+    nf('SOLAR', 2, texto_nf('SOLAR', CNPJ_A, 2, '123,45', dia))
+    nf('MARINO', 3, texto_nf('MARINO', CNPJ_B, 3, '123,45', dia))
+    boleto('DUNAS', CNPJ_C, 102)
+    nf('TORRE', 4, texto_nf('TORRE', CNPJ_ERRADO, 4, '123,45', dia))
+    nf('VILLA', 5, [f'NFS-e 5 PRESTADOR {PRESTADOR} CPF/CNPJ {CNPJ_PRESTADOR}', 'TOMADOR sem CNPJ'])
+    return base
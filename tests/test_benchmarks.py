@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from benchmarks import corpus
+from leitor.extracao import resumir_pdfs
+
+
+def _listar(destino):
+    pastas = [os.path.join(destino, 'CONDOMINIAIS', pasta) for pasta in ('BOLETOS', 'NOTA_FISCAL')]
+    return [sorted(os.listdir(pasta)) for pasta in pastas], pastas
+
+
+def test_corpus_no_leiaute_real(tmp_path):
+    contagem = corpus.gerar(str(tmp_path / 'a'), 40, semente=7)
+    (boletos, nfs), (boletos_dir, nfs_dir) = _listar(tmp_path / 'a')
+    assert sum(contagem.values()) >= 40
+    assert len(boletos) == contagem['boletos'] + contagem['duplicados'] and len(nfs) == contagem['nfs']
+    assert all(nome.count(' - ') == 3 and corpus.PRESTADOR in nome for nome in boletos if ' ' in nome)
+
+    # Cada boleto tem a NF do mesmo condomínio (segundo CNPJ igual)
+    def segundos(pasta, nomes):
+        return {r.cnpjs[1] for r in resumir_pdfs([os.path.join(pasta, nome) for nome in nomes])}
+
+    assert segundos(boletos_dir, boletos) <= segundos(nfs_dir, nfs)
+
+    # A mesma semente gera o mesmo corpus
+    assert corpus.gerar(str(tmp_path / 'b'), 40, semente=7) == contagem
+    assert _listar(tmp_path / 'b')[0] == [boletos, nfs]
+
+
+def test_executar_mede_as_etapas(tmp_path, capsys):
+    pytest.importorskip('tqdm')
+    pytest.importorskip('colorama')
+    from benchmarks import executar
+
+    resultados = executar.executar(str(tmp_path), 20, documentos=0)
+    for etapa in ('process_files', 'organize_files_by_second_cnpj'):
+        assert 'erro' not in resultados[etapa] and resultados[etapa]['arquivos_por_segundo'] > 0
+    (boletos, nfs), _ = _listar(tmp_path)
+    assert resultados['total']['arquivos'] == len(boletos) + len(nfs)
+    referencia = {'process_files': {'arquivos_por_segundo': resultados['process_files']['arquivos_por_segundo'] / 2}}
+    executar.imprimir(resultados, referencia)
+    assert '+100' in capsys.readouterr().out
@@ -0,0 +1,79 @@
+import random
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from leitor.boleto import (Boleto, LinhaDigitavelInvalida, decodificar_linha, fator_do_vencimento, montar_linha,
+                           tentar_decodificar, vencimento_do_fator)
+
+REFERENCIA = date(2025, 5, 1)
+
+# Linhas digitáveis de boletos reais (CONDOMINIAIS/BOLETOS); o vencimento é a data do nome do arquivo
+CONHECIDAS = [
+    ('27490.00101 15000.001139 90811.007203 1 10730003801141',
+     Boleto(banco='274', moeda='9', valor_centavos=3801141, fator_vencimento=1073, vencimento=date(2025, 5, 6),
+            campo_livre='0001015000001139081100720', nosso_numero='50000011390',
+            codigo_barras='27491107300038011410001015000001139081100720')),
+    ('27490.00101 15000.001113 97811.007208 3 10540006870206',
+     Boleto(banco='274', moeda='9', valor_centavos=6870206, fator_vencimento=1054, vencimento=date(2025, 4, 17),
+            campo_livre='0001015000001119781100720', nosso_numero='50000011197',
+            codigo_barras='27493105400068702060001015000001119781100720')),
+    ('27490.00101 15000.001121 00811.007202 3 10540002206305',
+     Boleto(banco='274', moeda='9', valor_centavos=2206305, fator_vencimento=1054, vencimento=date(2025, 4, 17),
+            campo_livre='0001015000001120081100720', nosso_numero='50000011200',
+            codigo_barras='27493105400022063050001015000001120081100720')),
+]
+
+
+@pytest.mark.parametrize('linha, esperado', CONHECIDAS)
+def test_decodificar_linhas_conhecidas(linha, esperado):
+    boleto = decodificar_linha(linha, REFERENCIA)
+    assert boleto == esperado
+    assert boleto.valor == Decimal(esperado.valor_centavos) / 100
+    assert montar_linha(boleto.banco, boleto.valor_centavos, boleto.vencimento, boleto.campo_livre) == linha
+
+
+def test_decodificar_sem_pontuacao():
+    linha, esperado = CONHECIDAS[0]
+    assert decodificar_linha(''.join(c for c in linha if c.isdigit()), REFERENCIA) == esperado
+
+
+@pytest.mark.parametrize('banco, inicio, fim', [('033', 8, 21), ('237', 6, 17), ('341', 3, 11), ('001', None, None)])
+def test_montar_e_decodificar(banco, inicio, fim):
+    rng = random.Random(banco)
+    for _ in range(200):
+        campo_livre = ''.join(rng.choice('0123456789') for _ in range(25))
+        centavos = rng.randrange(1, 10 ** 10)
+        vencimento = date.fromordinal(date(2024, 1, 1).toordinal() + rng.randrange(900))
+        boleto = decodificar_linha(montar_linha(banco, centavos, vencimento, campo_livre), vencimento)
+        assert (boleto.banco, boleto.valor_centavos, boleto.vencimento, boleto.campo_livre) == \
+            (banco, centavos, vencimento, campo_livre)
+        assert boleto.nosso_numero == (campo_livre[inicio:fim] if inicio is not None else None)
+        assert boleto.codigo_barras[:3] == banco and len(boleto.codigo_barras) == 44
+
+
+@pytest.mark.parametrize('posicao', [0, 9, 20, 31, 32, 38, 46])
+def test_digito_errado(posicao):
+    linha = CONHECIDAS[0][0]
+    digitos = [i for i, c in enumerate(linha) if c.isdigit()]
+    i = digitos[posicao]
+    errada = linha[:i] + str((int(linha[i]) + 1) % 10) + linha[i + 1:]
+    with pytest.raises(LinhaDigitavelInvalida):
+        decodificar_linha(errada)
+    assert tentar_decodificar(errada) is None
+
+
+def test_tamanho_errado():
+    with pytest.raises(LinhaDigitavelInvalida, match='47 dígitos'):
+        decodificar_linha(CONHECIDAS[0][0][:-1])
+    assert tentar_decodificar('') is None
+
+
+def test_fator_de_vencimento_nos_dois_ciclos():
+    assert vencimento_do_fator(0) is None
+    assert vencimento_do_fator(9999, date(2025, 2, 1)) == date(2025, 2, 21)
+    assert vencimento_do_fator(1000, date(2025, 3, 1)) == date(2025, 2, 22)
+    assert vencimento_do_fator(1000, date(2000, 7, 1)) == date(2000, 7, 3)
+    assert fator_do_vencimento(date(2025, 2, 21)) == 9999
+    assert fator_do_vencimento(date(2025, 2, 22)) == 1000
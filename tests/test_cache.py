@@ -0,0 +1,95 @@
+import sqlite3
+import zipfile
+
+import pytest
+
+from leitor import cache as modulo
+from leitor.cache import CacheExtracao, hash_arquivo
+
+DADOS = {'cnpjs': ['16.707.848/0001-95'], 'paginas': ['texto']}
+
+
+def _acessado_em(caminho, hash_conteudo):
+    with sqlite3.connect(caminho) as con:
+        return con.execute('SELECT acessado_em FROM extracoes WHERE hash = ?', (hash_conteudo,)).fetchone()[0]
+
+
+def _envelhecer(caminho, segundos):
+    with sqlite3.connect(caminho) as con:
+        con.execute('UPDATE extracoes SET acessado_em = acessado_em - ?', (segundos,))
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / 'cache' / 'extracao.sqlite3')
+
+
+def test_gravar_obter_e_versao(caminho):
+    with CacheExtracao(caminho) as cache:
+        assert cache.obter('h', 1) is None
+        cache.gravar('h', 1, DADOS)
+        assert cache.obter('h', 1) == DADOS
+        assert cache.obter('h', 2) is None
+        assert cache.estatisticas()['entradas'] == 1
+    with CacheExtracao(caminho) as cache:
+        assert cache.obter('h', 1) == DADOS
+        assert cache.invalidar(['h']) == 1
+        assert cache.obter('h', 1) is None
+
+
+def test_leitura_nao_grava_no_banco(caminho):
+    with CacheExtracao(caminho) as cache:
+        cache.gravar('h', 1, DADOS)
+    _envelhecer(caminho, 2 * modulo.ATUALIZAR_ACESSO)
+    antigo = _acessado_em(caminho, 'h')
+    cache = CacheExtracao(caminho)
+    cache.obter('h', 1)
+    assert cache._con.total_changes == 0
+    assert _acessado_em(caminho, 'h') == antigo
+    cache.fechar()
+    assert _acessado_em(caminho, 'h') > antigo
+    cache.fechar()  # fechar duas vezes não falha
+
+
+def test_acesso_recente_nao_e_anotado(caminho):
+    with CacheExtracao(caminho) as cache:
+        cache.gravar('h', 1, DADOS)
+        cache.obter('h', 1)
+        assert cache._acessos == {}
+
+
+def test_acessos_gravados_em_lote(caminho, monkeypatch):
+    monkeypatch.setattr(modulo, 'LOTE_ACESSOS', 3)
+    with CacheExtracao(caminho) as cache:
+        for h in 'abc':
+            cache.gravar(h, 1, DADOS)
+    _envelhecer(caminho, 2 * modulo.ATUALIZAR_ACESSO)
+    antigos = {h: _acessado_em(caminho, h) for h in 'abc'}
+    cache = CacheExtracao(caminho)
+    cache.obter('a', 1)
+    cache.obter('b', 1)
+    assert len(cache._acessos) == 2
+    cache.obter('c', 1)
+    assert cache._acessos == {}
+    assert all(_acessado_em(caminho, h) > antigos[h] for h in 'abc')
+    cache.fechar()
+
+
+def test_podar_usa_os_acessos_pendentes(caminho):
+    with CacheExtracao(caminho) as cache:
+        for h in 'abc':
+            cache.gravar(h, 1, DADOS)
+    _envelhecer(caminho, 2 * modulo.ATUALIZAR_ACESSO)
+    with CacheExtracao(caminho) as cache:
+        cache.obter('a', 1)  # 'a' passa a ser a mais recente
+        cache.limite_bytes = cache.tamanho_total() // 3
+        assert cache.podar() == 2
+        assert cache.obter('a', 1) == DADOS
+        assert cache.obter('b', 1) is None and cache.obter('c', 1) is None
+
+
+def test_hash_de_arquivo_e_de_membro(tmp_path):
+    (tmp_path / 'a.pdf').write_bytes(b'%PDF conteudo')
+    with zipfile.ZipFile(tmp_path / 'p.zip', 'w') as z:
+        z.writestr('x/a.pdf', b'%PDF conteudo')
+    assert hash_arquivo(str(tmp_path / 'a.pdf')) == hash_arquivo(f"{tmp_path / 'p.zip'}::x/a.pdf")
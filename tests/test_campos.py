@@ -0,0 +1,74 @@
+import re
+from datetime import date
+
+import pytest
+
+from benchmarks.corpus import texto_boleto, texto_nf
+from leitor import campos
+from leitor.boleto import montar_linha
+from leitor.extracao import extract_cnpjs
+
+# As expressões de antes da varredura única, cada uma aplicada numa passada própria
+ANTIGAS = {
+    'cnpj': r'\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}',
+    'cep': r'\d{5}-\d{3}',
+    'linha_digitavel': r'\d{5}\.\d{5}\s+\d{5}\.\d{6}\s+\d{5}\.\d{6}\s+\d\s+\d{14}',
+    'data': r'\d{2}/\d{2}/\d{4}',
+    'valor': r'\d{1,3}(?:\.\d{3})*,\d{2}',
+    'numero_nf': r'N[úu]mero da\s*NFS-e\s*(\d+)',
+}
+
+CONDOMINIO = 'CONDOMINIO RESIDENCIAL AQUARIUS'
+CNPJ_TOMADOR = '49.865.378/0001-47'
+LINHA = montar_linha('274', 3801141, date(2025, 5, 6), '0001015000001139081100720')
+
+# Texto como o extract_text do PyPDF2 devolve para os modelos reais (linhas coladas sem espaço)
+TEXTO_REAL = (
+    'PREFEITURA MUNICIPAL DE FORTALEZANúmero da NFS-e20030Data e Hora da Emissão17/04/2025 16:05:45'
+    'CPF/CNPJ16.707.848/0001-95FAUSTO CABRAL, 1031 CEP60175-415CPF/CNPJ49.865.378/0001-4760411-180'
+    'Valor dos Serviços R$ 41.200,22 (=) Valor Líquido R$41.200,22 00.000.000/0000-0'
+)
+
+AMOSTRAS = [
+    '\n'.join(texto_boleto(CONDOMINIO, CNPJ_TOMADOR, LINHA, '38.011,41', date(2025, 5, 6), date(2025, 4, 17))),
+    '\n'.join(texto_nf(CONDOMINIO, CNPJ_TOMADOR, 20030, '38.011,41', date(2025, 4, 17))),
+    TEXTO_REAL,
+    '',
+    'sem campos aqui',
+]
+
+
+@pytest.mark.parametrize('texto', AMOSTRAS)
+def test_extrair_campos_igual_as_expressoes_antigas(texto):
+    encontrados = campos.extrair_campos(texto)
+    assert set(encontrados) == set(ANTIGAS)
+    for tipo, padrao in ANTIGAS.items():
+        assert encontrados[tipo] == re.findall(padrao, texto), tipo
+
+
+@pytest.mark.parametrize('texto', AMOSTRAS)
+def test_extract_cnpjs(texto):
+    assert extract_cnpjs(texto) == re.findall(ANTIGAS['cnpj'], texto)
+
+
+def test_varrer_posicoes_e_ordem():
+    texto = f'Número da NFS-e 123 tomador {CNPJ_TOMADOR} CEP 60411-180'
+    achados = list(campos.varrer(texto))
+    assert [campo.tipo for campo in achados] == ['numero_nf', 'cnpj', 'cep']
+    for campo in achados:
+        assert texto[campo.inicio:campo.fim] == campo.valor
+    assert achados[0].valor == '123'
+    assert campos.do_tipo(achados, 'cnpj') == [CNPJ_TOMADOR]
+
+
+def test_prioridade_linha_digitavel_sobre_valor_e_data():
+    assert campos.extrair_campos(LINHA)['linha_digitavel'] == [LINHA]
+    assert [campo.tipo for campo in campos.varrer(LINHA)] == ['linha_digitavel']
+
+
+def test_com_campo():
+    varredor = campos.VARREDOR_PADRAO.com_campo('inscricao', r'Inscrição\s*(?P<valor>\d+)', antes_de='data')
+    assert varredor.tipos.index('inscricao') == varredor.tipos.index('data') - 1
+    assert campos.VARREDOR_PADRAO.tipos == tuple(tipo for tipo, _ in campos.CAMPOS_PADRAO)
+    grupos = varredor.agrupar('Inscrição 0042 em 17/04/2025')
+    assert grupos['inscricao'] == ['0042'] and grupos['data'] == ['17/04/2025']
@@ -0,0 +1,48 @@
+import os
+import shutil
+
+import pytest
+
+from leitor import cli
+from leitor.cli import opcoes_por_subcomando
+
+COMANDOS = ('boletos', 'notas', 'relacionar')
+
+
+def test_cada_subcomando_recebe_so_as_suas_opcoes():
+    argv = ['--threads', '2', '--incremental', '--modo', 'hardlink', '--nomeacao=empresa_numero', '-k', '3']
+    assert opcoes_por_subcomando(argv, COMANDOS) == [
+        ['--threads', '2', '--incremental', '--modo', 'hardlink'],
+        ['--incremental', '--modo', 'hardlink', '--nomeacao=empresa_numero'],
+        ['--modo', 'hardlink', '-k', '3'],
+    ]
+
+
+def test_opcao_com_valor_opcional():
+    assert opcoes_por_subcomando(['--perfil', '--threads', '4'], ('boletos', 'notas')) == \
+        [['--perfil', '--threads', '4'], ['--perfil']]
+    assert opcoes_por_subcomando(['--perfil', 'saida.prof'], ('boletos', 'notas')) == \
+        [['--perfil', 'saida.prof'], ['--perfil', 'saida.prof']]
+
+
+def test_sem_opcoes():
+    assert opcoes_por_subcomando([], COMANDOS) == [[], [], []]
+
+
+@pytest.mark.parametrize('argv', [['--desconhecida'], ['--threads', 'muitas'], ['--duplicados', 'x'], ['solto']])
+def test_opcao_invalida_termina_antes_de_rodar(argv, capsys):
+    with pytest.raises(SystemExit) as erro:
+        opcoes_por_subcomando(argv, COMANDOS)
+    assert erro.value.code == 2
+    assert capsys.readouterr().err
+
+
+@pytest.mark.parametrize('quebrado', [False, True])
+def test_cnpj_retorna_o_codigo_da_execucao(condominiais, corpus, monkeypatch, quebrado):
+    # Uma cópia de CONDOMINIAIS/main.py ao lado do corpus, que é onde o script procura as pastas
+    shutil.copy(os.path.join(cli.RAIZ, 'CONDOMINIAIS', 'main.py'), corpus / 'main.py')
+    monkeypatch.setattr(cli, 'RAIZ', str(corpus.parent))
+    if quebrado:
+        (corpus / 'NOTA_FISCAL' / 'QUEBRADO.pdf').write_bytes(b'nao e um PDF')
+    assert cli.main(['cnpj', '--sem-cache']) == int(quebrado)
+    assert os.path.exists(corpus / 'ORGANIZADOS' / 'relatorio.csv')
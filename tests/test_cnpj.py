@@ -0,0 +1,93 @@
+import random
+import sys
+from array import array
+
+import pytest
+
+from benchmarks.corpus import gerar_cnpj
+from leitor import cnpj
+
+PRESTADOR = '16.707.848/0001-95'
+
+
+def _amostra(quantidade: int, semente: int = 7):
+    """CNPJs válidos, com dígito verificador errado, sem pontuação, ausentes e malformados, misturados"""
+    rng = random.Random(semente)
+    cnpjs, esperadas = [], []
+    for i in range(quantidade):
+        valido = gerar_cnpj(rng)
+        digitos = valido.translate(str.maketrans('', '', './-'))
+        tipo = i % 6
+        if tipo == 0:
+            cnpjs.append(valido)
+            esperadas.append(int(digitos))
+        elif tipo == 1:
+            cnpjs.append(digitos)
+            esperadas.append(int(digitos))
+        elif tipo == 2:  # segundo dígito verificador trocado
+            cnpjs.append(valido[:-1] + str((int(valido[-1]) + 1) % 10))
+            esperadas.append(cnpj.INVALIDO)
+        elif tipo == 3:  # primeiro dígito verificador trocado
+            cnpjs.append(valido[:-2] + str((int(valido[-2]) + 1) % 10) + valido[-1])
+            esperadas.append(cnpj.INVALIDO)
+        elif tipo == 4:
+            cnpjs.append(None)
+            esperadas.append(cnpj.INVALIDO)
+        else:
+            cnpjs.append(rng.choice(['', '16.707.848/0001-9', '16.707.848/0001-955', '16.707.848/0001-9a',
+                                     '１６707848000195']))
+            esperadas.append(cnpj.INVALIDO)
+    return cnpjs, esperadas
+
+
+@pytest.mark.parametrize('quantidade', [1, 12, cnpj.MINIMO_NUMPY - 1, cnpj.MINIMO_NUMPY, 1000])
+def test_chaves(quantidade):
+    cnpjs, esperadas = _amostra(quantidade)
+    resultado = cnpj.chaves(cnpjs)
+    assert isinstance(resultado, array) and resultado.typecode == 'q'
+    assert list(resultado) == esperadas
+
+
+def test_chaves_numpy_e_python_concordam(monkeypatch):
+    pytest.importorskip('numpy')
+    cnpjs, esperadas = _amostra(600, semente=11)
+    monkeypatch.setattr(cnpj, 'MINIMO_NUMPY', 0)
+    assert cnpj._numpy(len(cnpjs)) is not None
+    com_numpy = cnpj.chaves(cnpjs)
+    monkeypatch.setattr(cnpj, 'MINIMO_NUMPY', 10 ** 9)
+    assert cnpj._numpy(len(cnpjs)) is None
+    assert list(cnpj.chaves(cnpjs)) == list(com_numpy) == esperadas
+
+
+def test_chaves_sem_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'numpy', None)  # import numpy levanta ImportError
+    cnpjs, esperadas = _amostra(cnpj.MINIMO_NUMPY * 2)
+    assert cnpj._numpy(len(cnpjs)) is None
+    assert list(cnpj.chaves(cnpjs)) == esperadas
+
+
+def test_chaves_vazio_e_gerador():
+    assert list(cnpj.chaves([])) == []
+    assert list(cnpj.chaves(c for c in [PRESTADOR, None])) == [16707848000195, cnpj.INVALIDO]
+
+
+def test_chave_confere_com_valido():
+    cnpjs, _ = _amostra(300, semente=3)
+    for texto in cnpjs:
+        assert (cnpj.chave(texto) != cnpj.INVALIDO) == bool(texto and texto.isascii() and cnpj.valido(texto))
+
+
+def test_chave_e_pasta_com_zeros_a_esquerda():
+    base = '001234560001'
+    digitos = base + cnpj.digitos_verificadores(base)
+    chave = cnpj.chave(cnpj.formatar(digitos))
+    assert chave == int(digitos)
+    assert cnpj.pasta(chave) == digitos
+    assert cnpj.formatar(cnpj.pasta(chave)) == cnpj.formatar(digitos)
+
+
+def test_digitos_verificadores_e_formatar():
+    assert cnpj.digitos_verificadores('167078480001') == '95'
+    assert cnpj.formatar('16707848000195') == PRESTADOR
+    assert cnpj.valido(PRESTADOR) and cnpj.valido('16707848000195')
+    assert not cnpj.valido('16.707.848/0001-96')
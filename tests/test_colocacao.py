@@ -0,0 +1,126 @@
+import errno
+import os
+import zipfile
+
+import pytest
+
+from leitor import colocacao
+from leitor.colocacao import MODOS, Colocador, colocar
+
+
+@pytest.fixture
+def origem(tmp_path):
+    caminho = tmp_path / 'origem' / 'a.pdf'
+    caminho.parent.mkdir()
+    caminho.write_bytes(b'%PDF conteudo')
+    return caminho
+
+
+@pytest.fixture
+def destino(tmp_path):
+    pasta = tmp_path / 'destino'
+    pasta.mkdir()
+    return pasta
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_cada_modo(origem, destino, modo):
+    colocador = Colocador(modo)
+    usado = colocador.colocar(str(origem), str(destino))
+    alvo = destino / 'a.pdf'
+    assert alvo.read_bytes() == b'%PDF conteudo'
+    assert usado in (modo, 'copia', colocacao.COPIA_KERNEL if modo == 'reflink' else 'copia')
+    assert colocador.estatisticas()[usado] == 1
+    if usado == 'hardlink':
+        assert os.path.samefile(origem, alvo)
+    if usado == 'symlink':
+        assert os.path.islink(alvo) and os.readlink(alvo) == str(origem)
+    assert origem.exists() == (modo != 'mover')
+
+
+def test_sobrescreve_destino_antigo(origem, destino):
+    alvo = destino / 'a.pdf'
+    alvo.write_bytes(b'antigo')
+    for modo in ('hardlink', 'symlink', 'copia'):
+        Colocador(modo).colocar(str(origem), str(alvo))
+        assert alvo.read_bytes() == b'%PDF conteudo'
+    Colocador('hardlink').colocar(str(origem), str(alvo))
+    Colocador('hardlink').colocar(str(origem), str(alvo))  # já é o mesmo arquivo
+    assert os.path.samefile(origem, alvo)
+
+
+@pytest.mark.parametrize('anterior', ['hardlink', 'symlink'])
+@pytest.mark.parametrize('modo', ['copia', 'reflink'])
+def test_nova_execucao_em_outro_modo_nao_altera_a_origem(origem, destino, anterior, modo):
+    alvo = destino / 'a.pdf'
+    Colocador(anterior).colocar(str(origem), str(alvo))
+    outra = destino.parent / 'b.pdf'
+    outra.write_bytes(b'%PDF outro')
+    Colocador(modo).colocar(str(outra), str(alvo))
+    assert origem.read_bytes() == b'%PDF conteudo'
+    assert alvo.read_bytes() == b'%PDF outro' and not os.path.islink(alvo)
+    # A mesma entrada de novo: o link antigo vira um arquivo próprio, sem SameFileError
+    Colocador(anterior).colocar(str(origem), str(alvo))
+    Colocador(modo).colocar(str(origem), str(alvo))
+    assert origem.read_bytes() == b'%PDF conteudo' and alvo.read_bytes() == b'%PDF conteudo'
+    assert not os.path.islink(alvo) and not os.path.samefile(origem, alvo)
+
+
+def test_copia_pelo_kernel_conta_os_bytes(origem, destino, monkeypatch):
+    monkeypatch.setattr(colocacao, 'fcntl', None)  # sem FICLONE: só copy_file_range
+    if not hasattr(os, 'copy_file_range'):
+        pytest.skip('sem copy_file_range')
+    colocador = Colocador('reflink')
+    assert colocador.colocar(str(origem), str(destino)) == colocacao.COPIA_KERNEL
+    estatisticas = colocador.estatisticas()
+    assert 'reflink' not in estatisticas and estatisticas[colocacao.COPIA_KERNEL] == 1
+    assert estatisticas['bytes_copiados'] == len(b'%PDF conteudo') and estatisticas['fallbacks'] == 1
+
+
+def test_modo_sem_suporte_recorre_a_copia(origem, destino, monkeypatch):
+    def falhar(*_):
+        raise OSError(errno.EXDEV, 'outro sistema de arquivos')
+
+    monkeypatch.setattr(colocacao.os, 'link', falhar)
+    colocador = Colocador('hardlink')
+    assert colocador.colocar(str(origem), str(destino)) == 'copia'
+    estatisticas = colocador.estatisticas()
+    assert estatisticas['fallbacks'] == 1 and estatisticas['bytes_copiados'] == len(b'%PDF conteudo')
+    assert not os.path.samefile(origem, destino / 'a.pdf')
+
+
+def test_origem_ausente_nao_vira_copia(tmp_path, destino):
+    with pytest.raises(FileNotFoundError):
+        Colocador('hardlink').colocar(str(tmp_path / 'nao.pdf'), str(destino))
+
+
+def test_membro_de_pacote_e_sempre_gravado(tmp_path, destino):
+    with zipfile.ZipFile(tmp_path / 'p.zip', 'w') as z:
+        z.writestr('x/b.pdf', b'%PDF membro')
+    colocador = Colocador('hardlink')
+    assert colocador.colocar(f"{tmp_path / 'p.zip'}::x/b.pdf", str(destino / 'b.pdf')) == 'copia'
+    assert (destino / 'b.pdf').read_bytes() == b'%PDF membro'
+    assert colocador.estatisticas()['fallbacks'] == 1
+
+
+def test_colocar_pasta(origem, destino):
+    colocador = Colocador('hardlink')
+    colocador.colocar_pasta(str(origem.parent), str(destino / 'copia'))
+    assert (destino / 'copia' / 'a.pdf').read_bytes() == b'%PDF conteudo'
+    assert origem.exists()
+    colocar(str(origem), str(destino / 'atalho.pdf'), 'copia')
+    assert (destino / 'atalho.pdf').exists()
+
+
+def test_mover_pasta_mantendo_a_origem(origem, destino):
+    colocador = Colocador('mover')
+    colocador.colocar_pasta(str(origem.parent), str(destino / 'primeira'), manter_origem=True)
+    assert origem.exists() and (destino / 'primeira' / 'a.pdf').read_bytes() == b'%PDF conteudo'
+    colocador.colocar_pasta(str(origem.parent), str(destino / 'ultima'))
+    assert not origem.parent.exists() and (destino / 'ultima' / 'a.pdf').exists()
+    assert colocador.estatisticas()['copia'] == 1
+
+
+def test_modo_invalido():
+    with pytest.raises(ValueError, match='inválido'):
+        Colocador('teleporte')
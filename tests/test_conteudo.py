@@ -0,0 +1,90 @@
+import io
+import os
+import zlib
+from datetime import date
+
+import pytest
+
+from benchmarks.corpus import pdf_texto, texto_boleto, texto_nf
+from leitor import conteudo
+from leitor.boleto import montar_linha
+from leitor.extracao import extract_cnpjs, extrair_dados
+
+PyPDF2 = pytest.importorskip('PyPDF2')
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CNPJ_TOMADOR = '49.865.378/0001-47'
+LINHA = montar_linha('274', 3801141, date(2025, 5, 6), '0001015000001139081100720')
+BOLETO = pdf_texto(texto_boleto('CONDOMINIO AQUARIUS', CNPJ_TOMADOR, LINHA, '38.011,41', date(2025, 5, 6),
+                                date(2025, 4, 17)))
+NF = pdf_texto(texto_nf('CONDOMINIO AQUARIUS', CNPJ_TOMADOR, 20030, '38.011,41', date(2025, 4, 17)))
+
+
+def _cnpjs_pypdf2(dados):
+    reader = PyPDF2.PdfReader(io.BytesIO(dados))
+    return extract_cnpjs(''.join(pagina.extract_text() for pagina in reader.pages))
+
+
+def _reais(pasta, quantidade=10):
+    caminho = os.path.join(RAIZ, 'CONDOMINIAIS', pasta)
+    if not os.path.isdir(caminho):
+        return []
+    return [os.path.join(caminho, nome) for nome in sorted(os.listdir(caminho)) if nome.endswith('.pdf')][:quantidade]
+
+
+@pytest.mark.parametrize('dados', [BOLETO, NF], ids=['boleto', 'nf'])
+def test_igual_ao_pypdf2(dados):
+    leitura = conteudo.ler_cnpjs(dados)
+    assert leitura is not None
+    assert leitura.cnpjs == _cnpjs_pypdf2(dados)
+    assert leitura.paginas == 1
+
+
+@pytest.mark.parametrize('caminho', _reais('BOLETOS') + _reais('NOTA_FISCAL'), ids=os.path.basename)
+def test_pdfs_reais_iguais_ao_pypdf2_quando_aceitos(caminho):
+    with open(caminho, 'rb') as f:
+        dados = f.read()
+    leitura = conteudo.ler_cnpjs(dados)
+    if leitura is not None:
+        assert leitura.cnpjs == _cnpjs_pypdf2(dados)
+
+
+def test_menos_cnpjs_que_o_pedido():
+    quantidade = len(_cnpjs_pypdf2(NF))
+    assert conteudo.ler_cnpjs(NF, minimo=quantidade) is not None
+    assert conteudo.ler_cnpjs(NF, minimo=quantidade + 1) is None
+
+
+def test_recusa_o_que_pode_divergir():
+    assert conteudo.ler_cnpjs(NF + NF[NF.index(b'xref'):]) is None  # atualização incremental: dois %%EOF
+    assert conteudo.ler_cnpjs(NF.replace(b'/Type /Catalog', b'/Type /Catalog /Encrypt 9 0 R')) is None
+    assert conteudo.ler_cnpjs(NF.replace(b'/Encoding /WinAnsiEncoding',
+                                         b'/Encoding << /Differences [46 /comma] >>')) is None
+    assert conteudo.ler_cnpjs(NF.replace(b'/Filter /FlateDecode', b'/Filter /LZWDecode')) is None
+    assert conteudo.ler_cnpjs(NF, teto_bytes=16) is None
+    assert conteudo.ler_cnpjs(b'nada') is None
+
+
+def test_cnpj_que_depende_da_juncao_dos_pedacos():
+    stream = zlib.compress(b'BT (16.707.848/) Tj (0001-95) Tj ET')
+    dados = NF[:NF.index(b'<< /Length')] + b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream) + \
+        stream + b'\nendstream\nendobj\n' + NF[NF.index(b'xref'):]
+    assert conteudo.ler_cnpjs(dados) is None
+
+
+def test_pedacos_de_texto():
+    stream = rb"q 1 0 0 1 0 0 cm BT /F1 9 Tf (a\(b\)\101) Tj [(c) -120 <2d31>] TJ 10 TL (d) ' ET Q BT (e) Tj ET"
+    assert list(conteudo.pedacos_de_texto(stream)) == ['a(b)A', 'c', '-1', 'd', 'e']
+    with pytest.raises(ValueError):
+        list(conteudo.pedacos_de_texto(b'BT (sem fim'))
+
+
+def test_extrair_dados_pelo_atalho(tmp_path):
+    caminho = tmp_path / 'nf.pdf'
+    caminho.write_bytes(NF)
+    rapido = extrair_dados(str(caminho), limite_cnpjs=2)
+    completo = extrair_dados(str(caminho))
+    assert rapido['leitura'] == 'rapida' and not rapido['completo']
+    assert completo['leitura'] == 'pypdf2' and completo['completo']
+    assert rapido['cnpjs'] == completo['cnpjs']
+    assert rapido['campos']['numero_nf'] == completo['campos']['numero_nf'] == ['20030']
@@ -0,0 +1,129 @@
+import json
+import os
+
+from leitor.colocacao import Colocador
+from leitor.diario import DIARIO_PADRAO, ColocadorDiario, Diario
+
+DOCUMENTO = {'caminho': 'a.pdf', 'nome': 'a.pdf', 'tamanho': 3, 'cnpjs': ['16.707.848/0001-95'], 'status': 'sem_cnpj'}
+
+
+def _registros(caminho):
+    with open(caminho, encoding='utf-8') as f:
+        return [json.loads(linha) for linha in f]
+
+
+def test_leitura_retomada_se_o_arquivo_nao_mudou(tmp_path):
+    pdf = tmp_path / 'a.pdf'
+    pdf.write_bytes(b'pdf')
+    caminho = tmp_path / 'saida' / '.diario.jsonl'
+    diario = Diario(str(caminho))
+    diario.lido(str(pdf), DOCUMENTO, 2)
+    diario.fechar()
+
+    diario = Diario(str(caminho), retomar=True)
+    assert diario.documento(str(pdf), 2) == DOCUMENTO
+    assert diario.documento(str(pdf), 1) == DOCUMENTO
+    assert diario.documento(str(pdf), 3) is None  # a leitura antiga parou antes
+    assert diario.documento(str(pdf), None) is None
+    pdf.write_bytes(b'outro pdf')
+    assert diario.documento(str(pdf), 2) is None
+    diario.fechar()
+
+
+def test_sem_retomar_comeca_do_zero(tmp_path):
+    caminho = tmp_path / '.diario.jsonl'
+    diario = Diario(str(caminho))
+    diario.iniciar('a', 'b', 'copia')
+    diario.fechar()
+    diario = Diario(str(caminho))
+    assert diario.colocados == {} and diario.leituras == {}
+    diario.fechar(concluido=True)
+    assert not caminho.exists()
+
+
+def test_linha_cortada_na_queda(tmp_path):
+    caminho = tmp_path / '.diario.jsonl'
+    diario = Diario(str(caminho))
+    diario.concluir('a', 'b', 'copia')
+    diario.fechar()
+    with open(caminho, 'a', encoding='utf-8') as f:
+        f.write('{"op": "fim", "origem": "c", "des')
+    assert Diario(str(caminho), retomar=True).colocados == {('a', 'b'): 'copia'}
+
+
+def test_colocacao_interrompida_desfeita(tmp_path):
+    origem, destino = tmp_path / 'a.pdf', tmp_path / 'saida' / 'a.pdf'
+    origem.write_bytes(b'completo')
+    destino.parent.mkdir()
+    destino.write_bytes(b'compl')  # cópia cortada pela queda
+    caminho = tmp_path / '.diario.jsonl'
+    diario = Diario(str(caminho))
+    diario.iniciar(str(origem), str(destino), 'copia')
+    diario.fechar()
+
+    diario = Diario(str(caminho), retomar=True)
+    assert diario.desfeitos == 1 and not diario.avancados
+    assert not destino.exists()
+    colocador = ColocadorDiario(Colocador('copia'), diario)
+    colocador.colocar(str(origem), str(destino))
+    assert destino.read_bytes() == b'completo'
+    assert colocador.retomados == 0
+    diario.fechar()
+
+
+def test_mover_interrompido_levado_adiante(tmp_path):
+    origem, destino = tmp_path / 'a.pdf', tmp_path / 'b.pdf'
+    destino.write_bytes(b'movido')  # a origem já foi apagada
+    caminho = tmp_path / '.diario.jsonl'
+    diario = Diario(str(caminho))
+    diario.iniciar(str(origem), str(destino), 'mover')
+    diario.fechar()
+
+    diario = Diario(str(caminho), retomar=True)
+    assert diario.avancados == [(str(origem), str(destino))]
+    assert diario.colocados[(str(origem), str(destino))] == 'mover'
+    diario.fechar()
+    assert _registros(caminho)[-1] == {'op': 'fim', 'origem': str(origem), 'destino': str(destino), 'modo': 'mover'}
+    assert destino.read_bytes() == b'movido'
+
+
+def test_colocador_pula_o_que_ja_foi_colocado(tmp_path):
+    origem, destino = tmp_path / 'a.pdf', tmp_path / 'saida'
+    origem.write_bytes(b'pdf')
+    destino.mkdir()
+    caminho = tmp_path / '.diario.jsonl'
+    diario = Diario(str(caminho))
+    colocador = ColocadorDiario(Colocador('copia'), diario)
+    assert colocador.modo == 'copia'
+    assert colocador.colocar(str(origem), str(destino)) == 'copia'
+    diario.fechar()
+
+    diario = Diario(str(caminho), retomar=True)
+    colocador = ColocadorDiario(Colocador('copia'), diario)
+    assert colocador.colocar(str(origem), str(destino)) == 'copia'
+    assert colocador.estatisticas()['retomados'] == 1
+    os.remove(destino / 'a.pdf')  # destino apagado depois da queda: coloca de novo
+    colocador.colocar(str(origem), str(destino))
+    assert (destino / 'a.pdf').read_bytes() == b'pdf'
+    assert colocador.retomados == 1
+    diario.fechar(concluido=True)
+
+
+class _ColocadorFalho(Colocador):
+    def colocar(self, origem, destino):
+        if os.path.basename(origem) == 'MARINO - 3.pdf':
+            raise PermissionError(13, 'sem permissão', destino)
+        return super().colocar(origem, destino)
+
+
+def test_diario_fica_quando_uma_colocacao_falha(condominiais, corpus, monkeypatch):
+    monkeypatch.setattr(condominiais, '__file__', str(corpus / 'main.py'))
+    monkeypatch.setattr(condominiais, 'Colocador', _ColocadorFalho)
+    assert condominiais.main(['--sem-cache']) == 1
+    saida = corpus / 'ORGANIZADOS'
+    assert (saida / DIARIO_PADRAO).exists()
+
+    monkeypatch.setattr(condominiais, 'Colocador', Colocador)
+    assert condominiais.main(['--sem-cache', '--retomar']) == 0
+    assert not (saida / DIARIO_PADRAO).exists()
+    assert os.listdir(saida / 'NF_36108122000143') == ['MARINO - 3.pdf']
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from leitor.distribuido import Arrendamento, FilaCompartilhada
+
+
+def _dono(caminho):
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)['dono']
+
+
+def _expirar(caminho, segundos=3600):
+    antes = os.stat(caminho).st_mtime - segundos
+    os.utime(caminho, (antes, antes))
+
+
+@pytest.fixture
+def filas(tmp_path):
+    return [FilaCompartilhada(str(tmp_path), prazo=5, dono=f'maquina:{i}') for i in range(3)]
+
+
+def test_arrendamento_exclusivo_e_liberado(filas):
+    a, b, _ = filas
+    arrendamento = a.arrendar('000000')
+    assert isinstance(arrendamento, Arrendamento)
+    assert b.arrendar('000000') is None
+    with arrendamento:
+        assert not arrendamento.perdido
+    assert not os.path.exists(arrendamento.caminho)
+    assert b.arrendar('000000') is not None
+
+
+def test_arrendamento_expirado_e_tomado(filas):
+    a, b, _ = filas
+    antigo = a.arrendar('000000')
+    _expirar(antigo.caminho)
+    novo = b.arrendar('000000')
+    assert novo is not None and _dono(novo.caminho) == b.dono
+    assert not [nome for nome in os.listdir(os.path.dirname(novo.caminho)) if '.expirado.' in nome]
+
+
+def test_tomada_atrasada_nao_derruba_arrendamento_novo(filas):
+    a, b, c = filas
+    caminho = a.arrendar('000000').caminho
+    _expirar(caminho)
+    visto_por_b = os.stat(caminho)  # b vê o arrendamento expirado de a...
+    assert c.arrendar('000000') is not None  # ...mas c toma antes e cria um novo
+    assert not b._tomar_expirado(caminho, visto_por_b)
+    assert _dono(caminho) == c.dono
+    assert b.arrendar('000000') is None
+    assert sorted(os.listdir(os.path.dirname(caminho))) == sorted(
+        ['000000.lease'] + [f'relogio.{fila.dono.replace(":", "_")}' for fila in (b, c)])
+
+
+def test_dono_lento_perde_o_arrendamento(tmp_path):
+    a = FilaCompartilhada(str(tmp_path), prazo=0.3, dono='a')
+    arrendamento = a.arrendar('000000')
+    with arrendamento:
+        with open(arrendamento.caminho, 'w', encoding='utf-8') as f:
+            json.dump({'dono': 'b'}, f)  # outro trabalhador tomou
+        time.sleep(0.5)
+        assert arrendamento.perdido
+    assert _dono(arrendamento.caminho) == 'b'  # o arrendamento de outro não é apagado na saída
+
+
+def test_fila_completa(filas):
+    a, b, _ = filas
+    chamadas = []
+
+    def itens():
+        chamadas.append(1)
+        return range(25)
+
+    assert a.preparar(itens, tamanho=10) == 3
+    assert b.preparar(itens, tamanho=10) == 3
+    assert len(chamadas) == 1
+    assert a.pendentes() == [0, 1, 2]
+    assert a.trabalhar(sum) == 3
+    assert b.trabalhar(sum) == 0
+    assert list(b.resultados()) == [45, 145, 110]
+    assert a.juntar(lambda resultados: {'total': sum(resultados)}) == {'total': 300}
+    assert b.juntar(lambda resultados: pytest.fail('só um trabalhador junta')) is None
+    with open(os.path.join(a.diretorio, 'concluido.json'), encoding='utf-8') as f:
+        assert json.load(f) == {'total': 300, 'dono': a.dono}
+
+
+def test_trabalhadores_em_paralelo(filas):
+    filas[0].preparar(lambda: range(100), tamanho=7)
+    concluidos = [0] * len(filas)
+
+    def trabalhar(i):
+        concluidos[i] = filas[i].trabalhar(lambda itens: [item * 2 for item in itens])
+
+    threads = [threading.Thread(target=trabalhar, args=(i,)) for i in range(len(filas))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(concluidos) == 15
+    assert [item for lote in filas[1].resultados() for item in lote] == [item * 2 for item in range(100)]
@@ -0,0 +1,81 @@
+import importlib.util
+import os
+import shutil
+import sys
+from collections import Counter
+
+import pytest
+
+from leitor import cnpj, extracao
+from leitor.documentos import (STATUS_OK, Documento, TabelaDocumentos, agrupar_por_segundo_cnpj, documento_de_dict,
+                               sem_segundo_cnpj)
+
+PRESTADOR = '16.707.848/0001-95'
+TOMADOR_A = '49.865.378/0001-47'
+TOMADOR_B = '36.108.122/0001-43'
+DV_ERRADO = '36.108.122/0001-44'
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _doc(nome, *cnpjs, pasta='BOLETOS', valores=()):
+    return Documento(os.path.join(pasta, nome), nome, 100, tuple(cnpjs), STATUS_OK, valores=tuple(valores))
+
+
+def test_tabela_agrupa_por_chave_inteira():
+    docs = [_doc('a.pdf', PRESTADOR, TOMADOR_A), _doc('b.pdf', PRESTADOR, DV_ERRADO, TOMADOR_B),
+            _doc('c.pdf', PRESTADOR), _doc('d.pdf', PRESTADOR, TOMADOR_A.replace('.', ''), pasta='OUTRA'),
+            Documento('x.zip::y/e.pdf', 'e.pdf', 1, (), 'erro', erro='falhou')]
+    tabela = TabelaDocumentos(docs)
+    assert len(tabela) == 5
+    assert tabela.agrupar() == {cnpj.chave(TOMADOR_A): [0, 3]}
+    assert tabela.sem_cnpj() == [1, 2, 4]
+    assert list(tabela.terceiros) == [cnpj.INVALIDO, cnpj.chave(TOMADOR_B), cnpj.INVALIDO, cnpj.INVALIDO,
+                                      cnpj.INVALIDO]
+    assert [tabela.caminho(linha) for linha in range(5)] == [doc.caminho for doc in docs]
+    assert tabela.erros == {4: 'falhou'}
+    assert tabela.memoria() > 0
+    assert agrupar_por_segundo_cnpj(docs) == {cnpj.chave(TOMADOR_A): ['a.pdf', 'd.pdf']}
+    assert sem_segundo_cnpj(docs) == ['b.pdf', 'c.pdf', 'e.pdf']
+
+
+def test_tabela_em_varios_lotes(monkeypatch):
+    monkeypatch.setattr(TabelaDocumentos, 'LOTE', 2)
+    docs = [_doc(f'{i}.pdf', PRESTADOR, TOMADOR_A if i % 2 else DV_ERRADO) for i in range(5)]
+    tabela = TabelaDocumentos(docs[:3])
+    tabela.adicionar(docs[3:])
+    assert tabela.agrupar() == {cnpj.chave(TOMADOR_A): [1, 3]}
+    assert tabela.pastas == ['BOLETOS']
+
+
+def test_documento_de_dict():
+    doc = _doc('n.pdf', PRESTADOR, TOMADOR_A, pasta='NOTA_FISCAL', valores=['38.011,41'])
+    assert documento_de_dict({**doc._asdict(), 'cnpjs': list(doc.cnpjs), 'valores': ['38.011,41']}) == doc
+
+
+def test_cada_pdf_e_lido_uma_vez_por_execucao(tmp_path, monkeypatch):
+    pytest.importorskip('tqdm')
+    pytest.importorskip('colorama')
+    # Algumas NFs reais e uma sem segundo CNPJ (vazia), no leiaute de CONDOMINIAIS
+    base = tmp_path / 'CONDOMINIAIS'
+    for pasta in ('BOLETOS', 'NOTA_FISCAL'):
+        (base / pasta).mkdir(parents=True)
+    nfs = os.path.join(RAIZ, 'CONDOMINIAIS', 'NOTA_FISCAL')
+    for nome in sorted(os.listdir(nfs))[:3]:
+        shutil.copy(os.path.join(nfs, nome), base / 'NOTA_FISCAL' / nome)
+    (base / 'NOTA_FISCAL' / 'VAZIA.pdf').write_bytes(b'')
+    lidos = Counter()
+    resumir_pdf = extracao.resumir_pdf
+
+    def contar(caminho, *args, **kwargs):
+        lidos[os.path.basename(caminho)] += 1
+        return resumir_pdf(caminho, *args, **kwargs)
+
+    monkeypatch.setattr(extracao, 'resumir_pdf', contar)
+    spec = importlib.util.spec_from_file_location('condominiais_main', os.path.join(RAIZ, 'CONDOMINIAIS', 'main.py'))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    monkeypatch.setattr(modulo, '__file__', str(base / 'main.py'))
+    monkeypatch.setattr(sys, 'argv', ['main.py', '--sem-cache'])
+    modulo.main()
+    assert lidos == {nome: 1 for nome in os.listdir(base / 'NOTA_FISCAL')}
+    assert os.listdir(base / 'ORGANIZADOS' / 'NFs_SEM_CNPJ_IDENTIFICADO') == ['VAZIA.pdf']
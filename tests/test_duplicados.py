@@ -0,0 +1,121 @@
+import csv
+import os
+import zipfile
+
+import pytest
+
+from leitor import duplicados
+from leitor.colocacao import Colocador
+from leitor.duplicados import ColocadorDuplicatas, detectar, escrever_relatorio, hash_parcial, mapa_originais
+
+
+@pytest.fixture
+def entrada(tmp_path):
+    pasta = tmp_path / 'entrada'
+    pasta.mkdir()
+    conteudo = b'%PDF ' + bytes(range(256)) * 1024
+    (pasta / 'boleto.pdf').write_bytes(conteudo)
+    (pasta / 'boleto_copia.pdf').write_bytes(conteudo)
+    (pasta / 'boleto copia.pdf').write_bytes(conteudo)
+    # Mesmo tamanho, início e fim iguais, diferença só no meio: o hash parcial não separa
+    meio = bytearray(conteudo)
+    meio[len(meio) // 2] ^= 0xFF
+    (pasta / 'meio.pdf').write_bytes(bytes(meio))
+    (pasta / 'outro.pdf').write_bytes(b'%PDF outro')
+    with zipfile.ZipFile(pasta / 'pacote.zip', 'w') as z:
+        z.writestr('dentro.pdf', conteudo)
+    return pasta
+
+
+def _caminhos(pasta, *nomes):
+    return [str(pasta / nome) for nome in nomes]
+
+
+def test_hash_parcial(entrada):
+    boleto, meio = _caminhos(entrada, 'boleto.pdf', 'meio.pdf')
+    assert hash_parcial(boleto) == hash_parcial(meio)
+    assert hash_parcial(boleto) == hash_parcial(f"{entrada / 'pacote.zip'}::dentro.pdf")
+    assert hash_parcial(boleto, bloco=10 ** 7) != hash_parcial(meio, bloco=10 ** 7)
+
+
+def test_detectar_identicos(entrada):
+    caminhos = _caminhos(entrada, 'boleto.pdf', 'meio.pdf', 'boleto_copia.pdf', 'outro.pdf', 'boleto copia.pdf')
+    membro = f"{entrada / 'pacote.zip'}::dentro.pdf"
+    encontradas = detectar(caminhos + [membro])
+    assert [(d.caminho, d.original, d.criterio) for d in encontradas] == [
+        (caminhos[2], caminhos[0], 'bytes'), (caminhos[4], caminhos[0], 'bytes'), (membro, caminhos[0], 'bytes')]
+    assert mapa_originais(encontradas)[os.path.abspath(caminhos[2])] == os.path.abspath(caminhos[0])
+
+
+def test_detectar_por_texto(entrada, monkeypatch):
+    # Todos com o mesmo texto; só os que não são idênticos em bytes entram pelo critério de texto
+    monkeypatch.setattr(duplicados, 'hash_texto', lambda caminho, cache=None: 'mesmo texto')
+    caminhos = _caminhos(entrada, 'boleto.pdf', 'boleto_copia.pdf', 'meio.pdf', 'outro.pdf')
+    encontradas = detectar(caminhos, texto=True)
+    assert [(os.path.basename(d.caminho), d.criterio) for d in encontradas] == [
+        ('boleto_copia.pdf', 'bytes'), ('meio.pdf', 'texto'), ('outro.pdf', 'texto')]
+    assert {d.original for d in encontradas} == {caminhos[0]}
+
+
+def _pdf_imagem(pixels: bytes) -> bytes:
+    """PDF de uma página só com uma imagem em tons de cinza, sem texto (como uma NF digitalizada)"""
+    objetos = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /XObject << /Im1 4 0 R >> >> '
+        b'/Contents 5 0 R >>',
+        b'<< /Type /XObject /Subtype /Image /Width %d /Height 1 /ColorSpace /DeviceGray /BitsPerComponent 8 '
+        b'/Length %d >>\nstream\n' % (len(pixels), len(pixels)) + pixels + b'\nendstream',
+        b'<< /Length 33 >>\nstream\nq 595 0 0 842 0 0 cm /Im1 Do Q\n\nendstream',
+    ]
+    saida = bytearray(b'%PDF-1.4\n')
+    posicoes = []
+    for numero, objeto in enumerate(objetos, 1):
+        posicoes.append(len(saida))
+        saida += b'%d 0 obj\n' % numero + objeto + b'\nendobj\n'
+    xref = len(saida)
+    saida += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objetos) + 1)
+    saida += b''.join(b'%010d 00000 n \n' % p for p in posicoes)
+    saida += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objetos) + 1, xref)
+    return bytes(saida)
+
+
+def test_pdfs_sem_texto_nao_sao_duplicatas_por_texto(tmp_path):
+    pytest.importorskip('PyPDF2')
+    primeira, segunda = tmp_path / 'VICTA 01.pdf', tmp_path / 'VICTA 12.pdf'
+    primeira.write_bytes(_pdf_imagem(bytes(range(0, 256, 4))))
+    segunda.write_bytes(_pdf_imagem(bytes(range(255, 0, -4))))
+    assert duplicados.hash_texto(str(primeira)) is None
+    assert detectar([str(primeira), str(segunda)], texto=True) == []
+
+
+def test_escrever_relatorio(entrada, tmp_path):
+    encontradas = detectar(_caminhos(entrada, 'boleto.pdf', 'boleto_copia.pdf'))
+    caminho = escrever_relatorio(encontradas, str(tmp_path / 'relatorios' / 'duplicatas.csv'))
+    with open(caminho, encoding='utf-8') as f:
+        linhas = list(csv.reader(f, delimiter=';'))
+    assert linhas[0] == ['arquivo', 'original', 'criterio', 'tamanho']
+    assert linhas[1][2:] == ['bytes', str(os.path.getsize(entrada / 'boleto.pdf'))]
+
+
+@pytest.mark.parametrize('acao', duplicados.ACOES)
+def test_colocador_duplicatas(entrada, tmp_path, acao):
+    destino = tmp_path / 'destino'
+    destino.mkdir()
+    original, copia = _caminhos(entrada, 'boleto.pdf', 'boleto_copia.pdf')
+    colocador = ColocadorDuplicatas(Colocador('copia'), mapa_originais(detectar([original, copia])), acao)
+    assert colocador.colocar(original, str(destino)) == 'copia'
+    usado = colocador.colocar(copia, str(destino))
+    alvo = destino / 'boleto_copia.pdf'
+    estatisticas = colocador.estatisticas()
+    if acao == 'pular':
+        assert usado is None and not alvo.exists() and estatisticas['duplicatas_puladas'] == 1
+    elif acao == 'linkar':
+        assert usado == 'hardlink' and os.path.samefile(copia, alvo) and estatisticas['hardlink'] == 1
+    else:
+        assert usado == 'copia' and estatisticas['copia'] == 2 and not os.path.samefile(copia, alvo)
+
+
+def test_acao_invalida():
+    with pytest.raises(ValueError, match='inválida'):
+        ColocadorDuplicatas(Colocador('copia'), {}, 'apagar')
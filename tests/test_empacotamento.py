@@ -0,0 +1,118 @@
+import hashlib
+import io
+import json
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from benchmarks.corpus import pdf_texto
+from leitor import empacotamento
+from leitor.empacotamento import INDICE, ColocadorPacotes
+
+
+@pytest.fixture
+def entrada(tmp_path):
+    pasta = tmp_path / 'entrada'
+    pasta.mkdir()
+    for nome in ('a.pdf', 'b.pdf', 'c.pdf'):
+        (pasta / nome).write_bytes(pdf_texto([f'documento {nome}']) + b'x' * (3 * empacotamento.BLOCO // 2))
+    return pasta
+
+
+def _conteudo(caminho, formato):
+    """{nome: bytes} de todos os membros do pacote"""
+    if formato == 'zip':
+        with zipfile.ZipFile(caminho) as pacote:
+            return {nome: pacote.read(nome) for nome in pacote.namelist()}
+    with tarfile.open(caminho) as pacote:
+        return {m.name: pacote.extractfile(m).read() for m in pacote.getmembers()}
+
+
+def _colocar(colocador, entrada, destino, *nomes):
+    for nome in nomes:
+        colocador.colocar(str(entrada / nome), str(destino / nome))
+
+
+@pytest.mark.parametrize('formato', empacotamento.FORMATOS)
+def test_ida_e_volta(tmp_path, entrada, formato):
+    saida = tmp_path / 'ORGANIZADOS'
+    colocador = ColocadorPacotes(formato)
+    _colocar(colocador, entrada, saida / '16707848000195', 'a.pdf', 'b.pdf')
+    colocador.colocar_pasta(str(entrada), str(saida / 'OUTROS'))
+    assert not saida.exists()  # nada é gravado antes de fechar()
+    resumo, falhas = colocador.fechar()
+    assert falhas == [] and (resumo.pacotes, resumo.arquivos) == (2, 5)
+    assert sorted(os.listdir(saida)) == [f'16707848000195.{formato}', f'OUTROS.{formato}']
+
+    membros = _conteudo(saida / f'16707848000195.{formato}', formato)
+    assert sorted(membros) == ['a.pdf', 'b.pdf', INDICE]
+    indice = json.loads(membros[INDICE])
+    assert indice['pacote'] == '16707848000195'
+    for entrada_indice in indice['arquivos']:
+        dados = (entrada / entrada_indice['nome']).read_bytes()
+        assert membros[entrada_indice['nome']] == dados
+        assert entrada_indice['tamanho'] == len(dados)
+        assert entrada_indice['sha256'] == hashlib.sha256(dados).hexdigest()
+        assert entrada_indice['origem'] == str(entrada / entrada_indice['nome'])
+    assert resumo.bytes_gravados == sum(os.path.getsize(entrada / n) for n in ('a.pdf', 'b.pdf', 'a.pdf', 'b.pdf', 'c.pdf'))
+    assert colocador.estatisticas()['pacote'] == 5
+
+
+def test_pacote_substituido_de_uma_vez(tmp_path, entrada, monkeypatch):
+    saida = tmp_path / 'ORGANIZADOS'
+    saida.mkdir()
+    (saida / 'CNPJ.zip').write_bytes(b'pacote antigo')
+    trocas = []
+    substituir = os.replace
+    monkeypatch.setattr(empacotamento.os, 'replace', lambda de, para: (trocas.append((de, para)), substituir(de, para)))
+    colocador = ColocadorPacotes('zip')
+    _colocar(colocador, entrada, saida / 'CNPJ', 'a.pdf')
+    colocador.fechar()
+    assert trocas == [(f"{saida / 'CNPJ.zip'}.tmp", str(saida / 'CNPJ.zip'))]
+    assert sorted(_conteudo(saida / 'CNPJ.zip', 'zip')) == ['a.pdf', INDICE]
+    assert os.listdir(saida) == ['CNPJ.zip']
+
+
+class _Quebrado(io.BytesIO):
+    """Entrega o primeiro bloco e falha na leitura seguinte, como um disco com erro"""
+
+    def read(self, n=-1):
+        if self.tell():
+            raise OSError('erro de leitura')
+        return super().read(n)
+
+
+@pytest.mark.parametrize('formato', empacotamento.FORMATOS)
+def test_falha_descarta_o_pacote(tmp_path, entrada, formato, monkeypatch):
+    abrir = empacotamento.pacotes.abrir
+
+    def abrir_com_falha(caminho):
+        if os.path.basename(caminho) == 'b.pdf':
+            with abrir(caminho) as f:
+                return _Quebrado(f.read())
+        return abrir(caminho)
+
+    monkeypatch.setattr(empacotamento.pacotes, 'abrir', abrir_com_falha)
+    saida = tmp_path / 'ORGANIZADOS'
+    saida.mkdir()
+    (saida / f'RUIM.{formato}').write_bytes(b'pacote da execucao anterior')
+    colocador = ColocadorPacotes(formato)
+    _colocar(colocador, entrada, saida / 'RUIM', 'a.pdf', 'b.pdf', 'c.pdf')
+    _colocar(colocador, entrada, saida / 'BOM', 'c.pdf')
+    resumo, falhas = colocador.fechar()
+
+    assert falhas[0] == (str(entrada / 'b.pdf'), 'erro de leitura')
+    assert sorted(origem for origem, _ in falhas) == [str(entrada / n) for n in ('a.pdf', 'b.pdf', 'c.pdf')]
+    assert (resumo.pacotes, resumo.arquivos) == (1, 1)
+    assert resumo.bytes_gravados == os.path.getsize(entrada / 'c.pdf')
+    # O pacote antigo fica intacto e não sobra arquivo temporário
+    assert (saida / f'RUIM.{formato}').read_bytes() == b'pacote da execucao anterior'
+    assert sorted(os.listdir(saida)) == [f'BOM.{formato}', f'RUIM.{formato}']
+    assert sorted(_conteudo(saida / f'BOM.{formato}', formato)) == ['c.pdf', INDICE]
+
+
+def test_formato_invalido():
+    with pytest.raises(ValueError, match='inválido'):
+        ColocadorPacotes('rar')
@@ -0,0 +1,173 @@
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from leitor import extracao
+from leitor.cache import cache_do_processo
+from leitor.extracao import (MemoriaExcedida, abrir_mapeado, extract_cnpjs, extrair_dados, iterar_cnpjs,
+                             iterar_cnpjs_por_pagina, iterar_textos_paginas, n_esimo_cnpj, resumir_pdfs)
+
+PyPDF2 = pytest.importorskip('PyPDF2')
+
+PRESTADOR = '16.707.848/0001-95'
+# Um boleto e algumas NFs reais do repositório (a leitura completa de um boleto leva ~0,7 s)
+CONDOMINIAIS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'CONDOMINIAIS')
+AMOSTRA = [os.path.join(CONDOMINIAIS, pasta, nome) for pasta, quantidade in (('BOLETOS', 1), ('NOTA_FISCAL', 4))
+           for nome in sorted(os.listdir(os.path.join(CONDOMINIAIS, pasta)))[:quantidade]]
+# Três NFs reais de uma página: o CNPJ do prestador e, em seguida, o do tomador
+NFS = {'ANIMALE COMERCIO & SERVICOS LTDA - 20204.pdf': '05.032.158/0001-67',
+       'AQUARIUS RESIDENCE - 20030.pdf': '50.803.446/0001-22',
+       'ARTIZ MEIRELES - 20153.pdf': '55.092.418/0001-68'}
+TOMADORES = list(NFS.values())
+TEXTO = f'CPF/CNPJ{PRESTADOR}FAUSTO CABRAL CPF/CNPJ{TOMADORES[0]}60411-180 x {TOMADORES[1]}9'
+
+
+@pytest.fixture
+def pdf_paginas(tmp_path):
+    """PDF de três páginas, com o CNPJ do prestador e o de um tomador em cada uma"""
+    escritor = PyPDF2.PdfWriter()
+    for nome in NFS:
+        escritor.add_page(PyPDF2.PdfReader(os.path.join(CONDOMINIAIS, 'NOTA_FISCAL', nome)).pages[0])
+    caminho = tmp_path / 'tres.pdf'
+    with open(caminho, 'wb') as f:
+        escritor.write(f)
+    return str(caminho)
+
+
+@pytest.mark.parametrize('limite', [None, 2])
+def test_processos_dao_o_mesmo_resultado_da_leitura_serial(tmp_path, limite):
+    quebrado = tmp_path / 'quebrado.pdf'
+    quebrado.write_bytes(b'%PDF-1.4 sem objetos')
+    caminhos = AMOSTRA + [str(quebrado), str(tmp_path / 'nao.pdf')]
+
+    def compactos(workers):
+        return [(r.cnpjs, r.paginas, r.erro) for r in resumir_pdfs(caminhos, workers, limite_cnpjs=limite)]
+
+    serial = compactos(1)
+    assert compactos(3) == serial
+    assert all(len(cnpjs) > 1 and erro is None for cnpjs, _, erro in serial[:-2])
+    assert all(erro for _, _, erro in serial[-2:])
+
+
+@pytest.mark.parametrize('corte', range(0, len(TEXTO), 5))
+def test_cnpjs_por_pagina_igual_ao_texto_inteiro(corte):
+    # Cortes em várias posições, inclusive no meio de um CNPJ
+    paginas = [TEXTO[:corte], TEXTO[corte:corte + 20], TEXTO[corte + 20:]]
+    esperados = extract_cnpjs(''.join(paginas))
+    assert [c for achados in iterar_cnpjs_por_pagina(paginas) for c in achados] == esperados
+    assert list(iterar_cnpjs(paginas)) == esperados
+
+
+def test_cnpj_quebrado_entre_paginas():
+    paginas = ['fim da página 1 ', PRESTADOR[:6], PRESTADOR[6:], ' e mais']
+    assert list(iterar_cnpjs_por_pagina(paginas)) == [[], [], [PRESTADOR], []]
+
+
+def test_para_na_pagina_do_n_esimo_cnpj(pdf_paginas, monkeypatch):
+    monkeypatch.setattr(extracao, 'LEITURA_RAPIDA', False)
+    dados = extrair_dados(pdf_paginas, limite_cnpjs=3)
+    assert len(dados['paginas']) == 2 and not dados['completo']
+    assert dados['cnpjs'] == [PRESTADOR, TOMADORES[0], PRESTADOR, TOMADORES[1]]  # a página inteira
+    completo = extrair_dados(pdf_paginas)
+    assert completo['completo'] and completo['total_paginas'] == 3
+    assert completo['cnpjs'] == [c for tomador in TOMADORES for c in (PRESTADOR, tomador)]
+    assert n_esimo_cnpj(pdf_paginas, 2) == TOMADORES[0]
+    assert n_esimo_cnpj(pdf_paginas, 6) == TOMADORES[2]
+    assert n_esimo_cnpj(pdf_paginas, 7) is None
+
+
+def test_limite_de_cnpjs_nos_processos(pdf_paginas, monkeypatch):
+    monkeypatch.setattr(extracao, 'LEITURA_RAPIDA', False)
+    # Com o limite cada processo para na segunda das três páginas
+    parciais = list(resumir_pdfs([pdf_paginas] * 4, workers=2, limite_cnpjs=3))
+    assert all(r.cnpjs == (PRESTADOR, TOMADORES[0], PRESTADOR, TOMADORES[1]) for r in parciais)
+    completos = list(resumir_pdfs([pdf_paginas] * 4, workers=2))
+    assert all(len(r.cnpjs) == 6 and r.paginas == 3 for r in completos)
+
+
+def test_resumir_pdfs_com_cache(pdf_paginas, tmp_path):
+    cache = str(tmp_path / 'cache.sqlite3')
+    primeiro, erro = resumir_pdfs([pdf_paginas, str(tmp_path / 'nao.pdf')], cache_path=cache, limite_cnpjs=2)
+    assert primeiro.cnpjs[:2] == (PRESTADOR, TOMADORES[0]) and primeiro.erro is None
+    assert erro.erro and erro.cnpjs == ()
+    (segundo,) = resumir_pdfs([pdf_paginas], cache_path=cache, limite_cnpjs=2)
+    assert segundo.leitura == 'cache' and segundo.cnpjs == primeiro.cnpjs
+
+
+def _pid_da_conexao(cache_path):
+    return cache_do_processo(cache_path)._pid, os.getpid()
+
+
+def test_processos_nao_usam_a_conexao_do_pai(pdf_paginas, tmp_path):
+    cache = str(tmp_path / 'cache.sqlite3')
+    cache_do_processo(cache).estatisticas()  # o processo principal abre a conexão antes do fork
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for dono, pid in executor.map(_pid_da_conexao, [cache] * 4):
+            assert dono == pid
+    resumos = list(resumir_pdfs([pdf_paginas] * 6, workers=2, cache_path=cache, limite_cnpjs=2))
+    assert all(r.erro is None and r.cnpjs[:2] == (PRESTADOR, TOMADORES[0]) for r in resumos)
+    assert cache_do_processo(cache).estatisticas()['entradas'] == 1
+
+
+class _Pagina:
+    def __init__(self, texto):
+        self.texto = texto
+
+    def extract_text(self):
+        return self.texto
+
+
+class _Leitor:
+    def __init__(self, textos):
+        self.pages = [_Pagina(texto) for texto in textos]
+
+
+def test_leitor_sem_cache_de_objetos():
+    # O cache de objetos resolvidos é interno ao PyPDF2 e pode não existir
+    assert list(iterar_textos_paginas(_Leitor(['a', None]), liberar=True)) == ['a', '']
+
+
+def test_objetos_liberados_a_cada_pagina():
+    leitor = _Leitor(['a', 'b'])
+    leitor.resolved_objects = {(1, 0): 'objeto'}
+    for _ in iterar_textos_paginas(leitor, liberar=True):
+        assert leitor.resolved_objects == {}
+        leitor.resolved_objects[(2, 0)] = 'outro'
+
+
+def test_teto_de_memoria(monkeypatch):
+    leituras = iter([100, 150, 10 ** 6])
+    monkeypatch.setattr(extracao, '_memoria_anonima', lambda: next(leituras))
+    paginas = iterar_textos_paginas(_Leitor(['a', 'b', 'c']), teto_bytes=1000)
+    assert next(paginas) == 'a'
+    with pytest.raises(MemoriaExcedida, match='página 2'):
+        next(paginas)
+
+
+def test_memoria_ilegivel_no_meio_da_leitura(monkeypatch):
+    leituras = iter([100, None, 200])
+    monkeypatch.setattr(extracao, '_memoria_anonima', lambda: next(leituras))
+    assert list(iterar_textos_paginas(_Leitor(['a', 'b']), teto_bytes=1000)) == ['a', 'b']
+
+
+def test_leitura_mapeada(pdf_paginas, tmp_path):
+    with abrir_mapeado(pdf_paginas) as stream:
+        assert isinstance(stream, mmap.mmap)
+        with open(pdf_paginas, 'rb') as f:
+            assert stream[:] == f.read()
+    vazio = tmp_path / 'vazio.pdf'
+    vazio.write_bytes(b'')
+    with abrir_mapeado(str(vazio)) as stream:
+        assert stream.read() == b''
+
+
+def test_pdf_acima_do_teto_nao_afeta_os_outros(pdf_paginas, monkeypatch):
+    monkeypatch.setattr(extracao, 'LEITURA_RAPIDA', False)
+    # O primeiro PDF cresce 2 MB na primeira página; o segundo não cresce
+    leituras = iter([0, 2 * 2 ** 20] + [0] * 4)
+    monkeypatch.setattr(extracao, '_memoria_anonima', lambda: next(leituras))
+    grande, pequeno = resumir_pdfs([pdf_paginas, pdf_paginas], memoria_mb=1)
+    assert 'teto de memória excedido na página 1' in grande.erro and grande.cnpjs == ()
+    assert pequeno.erro is None and len(pequeno.cnpjs) == 6
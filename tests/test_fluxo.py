@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+
+import pytest
+
+from leitor.colocacao import Colocador
+from leitor.documentos import agrupar_por_segundo_cnpj, sem_segundo_cnpj
+from leitor.fluxo import ColocacaoEmFundo, em_segundo_plano, mapear_em_processos
+
+
+def _quadrado(x):
+    time.sleep(0.002 * (x % 3))  # lotes terminam fora de ordem
+    return x * x
+
+
+def _arvore(pasta):
+    """{caminho relativo: bytes} de todos os arquivos abaixo da pasta"""
+    arquivos = {}
+    for raiz, _, nomes in os.walk(pasta):
+        for nome in nomes:
+            caminho = os.path.join(raiz, nome)
+            with open(caminho, 'rb') as f:
+                arquivos[os.path.relpath(caminho, pasta)] = f.read()
+    return arquivos
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_mapear_mantem_a_ordem(workers):
+    itens = list(range(50))
+
+    def pular(x):
+        return x % 7 == 0
+
+    saida = list(mapear_em_processos(_quadrado, iter(itens), workers, pular=pular, lote=2))
+    assert [item for item, _ in saida] == itens
+    assert [resultado for _, resultado in saida] == [None if pular(x) else x * x for x in itens]
+
+
+def test_mapear_limita_o_trabalho_em_andamento():
+    em_voo, lote = 2, 3
+    puxados = 0
+    diferencas = []
+
+    def entrada():
+        nonlocal puxados
+        for x in range(60):
+            puxados += 1
+            yield x
+
+    for entregues, _ in enumerate(mapear_em_processos(_quadrado, entrada(), 2, em_voo=em_voo, lote=lote), 1):
+        diferencas.append(puxados - entregues)
+        time.sleep(0.001)  # consumidor mais lento que os processos
+    assert len(diferencas) == 60
+    assert max(diferencas) <= (em_voo + 1) * lote
+
+
+def test_em_segundo_plano_repassa_o_erro_depois_dos_itens():
+    def produtor():
+        yield 1
+        yield 2
+        raise ValueError('listagem falhou')
+
+    recebidos = []
+    with pytest.raises(ValueError, match='listagem falhou'):
+        for item in em_segundo_plano(produtor(), tamanho=1):
+            recebidos.append(item)
+    assert recebidos == [1, 2]
+
+
+def test_colocacao_em_fundo(tmp_path):
+    origem, destino = tmp_path / 'origem', tmp_path / 'destino'
+    origem.mkdir()
+    destino.mkdir()
+    for i in range(20):
+        (origem / f'{i}.pdf').write_bytes(b'%PDF ' + bytes([i]))
+    colocacao = ColocacaoEmFundo(Colocador('copia'), threads=4, tamanho=2)
+    for i in range(20):
+        colocacao.colocar(str(origem / f'{i}.pdf'), str(destino / f'{i}.pdf'))
+    colocacao.colocar(str(origem / 'ausente.pdf'), str(destino / 'ausente.pdf'))
+    resumo = colocacao.concluir()
+    assert resumo.arquivos == 21 and len(resumo.falhas) == 1 and resumo.falhas[0][0].endswith('ausente.pdf')
+    assert _arvore(destino) == {f'{i}.pdf': b'%PDF ' + bytes([i]) for i in range(20)}
+
+
+class _ColocadorQuebrado(Colocador):
+    def estatisticas(self):
+        raise RuntimeError('estatísticas indisponíveis')
+
+
+@pytest.mark.parametrize('itens', [0, 50])
+def test_colocacao_em_fundo_repassa_o_erro_da_thread(tmp_path, itens):
+    erros = []
+
+    def executar():
+        colocacao = ColocacaoEmFundo(_ColocadorQuebrado('copia'), threads=1, tamanho=1)
+        try:
+            for i in range(itens):  # bem mais que o tamanho da fila
+                colocacao.colocar(str(tmp_path / f'{i}.pdf'), str(tmp_path / f'{i}-copia.pdf'))
+            colocacao.concluir()
+        except RuntimeError as e:
+            erros.append(e)
+
+    thread = threading.Thread(target=executar, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), 'colocar() ficou esperando pela thread morta'
+    assert [str(e) for e in erros] == ['estatísticas indisponíveis']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_fluxo_igual_ao_processamento_em_fases(condominiais, corpus, workers):
+    boletos_dir, nfs_dir = str(corpus / 'BOLETOS'), str(corpus / 'NOTA_FISCAL')
+    boletos = condominiais.scan_documents(boletos_dir, 'boletos', workers)
+    nfs = condominiais.scan_documents(nfs_dir, 'notas fiscais', workers)
+    condominiais.organize_files_by_second_cnpj(
+        agrupar_por_segundo_cnpj(boletos), agrupar_por_segundo_cnpj(nfs), str(corpus / 'FASES'),
+        boletos_dir, nfs_dir, sem_segundo_cnpj(nfs), Colocador('copia'))
+
+    resultado = condominiais.organize_pipeline(boletos_dir, nfs_dir, str(corpus / 'FLUXO'), workers=workers,
+                                               colocador=Colocador('copia'), threads=2)
+    assert _arvore(corpus / 'FLUXO') == _arvore(corpus / 'FASES')
+    assert len(_arvore(corpus / 'FLUXO')) == 6  # o boleto sem NF não é colocado
+    assert (resultado['com_boletos'], resultado['apenas_nfs'], resultado['nfs_sem_cnpj']) == (1, 1, 2)
+    assert resultado['boletos_sem_nf'] == 1 and resultado['colocacao'].falhas == []
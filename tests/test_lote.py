@@ -0,0 +1,94 @@
+import errno
+import os
+import shutil
+import threading
+from collections import Counter
+
+import pytest
+
+from leitor import lote
+from leitor.colocacao import Colocador
+from leitor.lote import colocar_em_lote, criar_pastas
+
+
+class _ColocadorInstavel(Colocador):
+    """Falha as primeiras vezes em cada origem listada em erros: {nome: [OSError, ...]}"""
+
+    def __init__(self, erros):
+        super().__init__('copia')
+        self.erros = erros
+        self.chamadas = Counter()
+        self.trava = threading.Lock()
+
+    def colocar(self, origem, destino):
+        nome = os.path.basename(origem)
+        with self.trava:
+            self.chamadas[nome] += 1
+            pendentes = self.erros.get(nome)
+            erro = pendentes.pop(0) if pendentes else None
+        if erro is not None:
+            raise erro
+        return super().colocar(origem, destino)
+
+
+@pytest.fixture
+def pares(tmp_path):
+    origem, destino = tmp_path / 'origem', tmp_path / 'destino'
+    origem.mkdir()
+    destino.mkdir()
+    for nome in ('a.pdf', 'b.pdf', 'c.pdf', 'd.pdf'):
+        (origem / nome).write_bytes(b'%PDF ' + nome.encode())
+    return [(str(origem / nome), str(destino / nome)) for nome in ('a.pdf', 'b.pdf', 'c.pdf', 'd.pdf')]
+
+
+def test_criar_pastas_uma_vez_cada(tmp_path, monkeypatch):
+    criadas = []
+    makedirs = os.makedirs
+    monkeypatch.setattr(lote.os, 'makedirs', lambda pasta: (criadas.append(pasta), makedirs(pasta)))
+    (tmp_path / 'existente').mkdir()
+    pastas = [str(tmp_path / nome) for nome in ('x', 'y', 'x', 'existente', 'y', 'x', 'z')]
+    assert criar_pastas(pastas) == 3
+    assert sorted(criadas) == sorted(set(pastas))
+    assert all((tmp_path / nome).is_dir() for nome in ('x', 'y', 'z'))
+    assert criar_pastas(iter(pastas)) == 0
+
+
+def test_colocar_em_lote(pares):
+    colocador = Colocador('copia')
+    resumo = colocar_em_lote(colocador, iter(pares), threads=2)
+    assert (resumo.arquivos, resumo.retentativas, resumo.falhas) == (4, 0, [])
+    assert resumo.bytes_copiados == sum(os.path.getsize(origem) for origem, _ in pares)
+    for origem, destino in pares:
+        with open(origem, 'rb') as f, open(destino, 'rb') as g:
+            assert f.read() == g.read()
+    assert '4 arquivo(s)' in resumo.texto() and '0 falha(s)' in resumo.texto()
+
+
+def test_novas_tentativas_para_erros_passageiros(pares):
+    # b.pdf falha duas vezes e passa na terceira; c.pdf falha em todas as tentativas
+    erros = {'b.pdf': [OSError(errno.EIO, 'E/S'), OSError(errno.ETIMEDOUT, 'tempo esgotado')],
+             'c.pdf': [OSError(errno.EIO, 'E/S')] * 3}
+    colocador = _ColocadorInstavel(erros)
+    resumo = colocar_em_lote(colocador, pares, threads=3, tentativas=3, espera=0)
+    assert colocador.chamadas == {'a.pdf': 1, 'b.pdf': 3, 'c.pdf': 3, 'd.pdf': 1}
+    assert resumo.retentativas == 4
+    assert resumo.falhas == [(pares[2][0], '[Errno 5] E/S')]
+    assert os.path.exists(pares[1][1]) and not os.path.exists(pares[2][1])
+
+
+def test_erros_permanentes_nao_sao_repetidos(pares):
+    erros = {'a.pdf': [PermissionError(errno.EACCES, 'sem permissão')], 'd.pdf': [ValueError('nome inválido')]}
+    colocador = _ColocadorInstavel(erros)
+    resumo = colocar_em_lote(colocador, pares, threads=2, espera=0)
+    assert colocador.chamadas['a.pdf'] == 1 and colocador.chamadas['d.pdf'] == 1
+    assert resumo.retentativas == 0
+    assert sorted(resumo.falhas) == [(pares[0][0], '[Errno 13] sem permissão'), (pares[3][0], 'nome inválido')]
+    assert resumo.arquivos == 4 and '2 falha(s)' in resumo.texto()
+
+
+def test_erro_sem_errno_e_permanente(pares):
+    erros = {'b.pdf': [shutil.SameFileError('mesmo arquivo')]}
+    colocador = _ColocadorInstavel(erros)
+    resumo = colocar_em_lote(colocador, pares, threads=2, espera=0)
+    assert colocador.chamadas['b.pdf'] == 1 and resumo.retentativas == 0
+    assert resumo.falhas == [(pares[1][0], 'mesmo arquivo')]
@@ -0,0 +1,129 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from leitor.colocacao import Colocador
+from leitor.manifesto import ColocadorIncremental, Manifesto
+
+
+@pytest.fixture
+def entrada(tmp_path):
+    pasta = tmp_path / 'entrada'
+    pasta.mkdir()
+    for nome in ('a.pdf', 'b.pdf'):
+        (pasta / nome).write_bytes(f'%PDF {nome}'.encode())
+    return pasta
+
+
+def _manifesto(tmp_path):
+    return Manifesto(str(tmp_path / 'saida' / '.manifesto.json'))
+
+
+def test_alterado_por_tamanho_mtime_e_hash(tmp_path, entrada):
+    manifesto = _manifesto(tmp_path)
+    a = str(entrada / 'a.pdf')
+    assert manifesto.alterado(a)
+    manifesto.atualizar(a, dados={'cnpjs': []})
+    manifesto.salvar()
+
+    manifesto = _manifesto(tmp_path)
+    assert not manifesto.alterado(a)
+    assert manifesto.registro(a)['dados'] == {'cnpjs': []}
+
+    os.utime(a, ns=(0, os.stat(a).st_mtime_ns + 10 ** 9))  # só o mtime mudou: o hash decide
+    manifesto = _manifesto(tmp_path)
+    assert not manifesto.alterado(a)
+    assert manifesto.registro(a)['dados'] == {'cnpjs': []}
+
+    (entrada / 'a.pdf').write_bytes(b'%PDF outro conteudo')
+    manifesto = _manifesto(tmp_path)
+    assert manifesto.alterado(a)
+    assert 'dados' not in manifesto.registro(a)  # os dados antigos não valem para o conteúdo novo
+
+
+def test_colocador_incremental(tmp_path, entrada):
+    destino = tmp_path / 'saida' / 'grupo'
+    destino.mkdir(parents=True)
+    a = str(entrada / 'a.pdf')
+
+    manifesto = _manifesto(tmp_path)
+    colocador = ColocadorIncremental(Colocador('copia'), manifesto)
+    assert colocador.colocar(a, str(destino)) == 'copia'
+    manifesto.salvar()
+
+    manifesto = _manifesto(tmp_path)
+    colocador = ColocadorIncremental(Colocador('copia'), manifesto)
+    assert colocador.colocar(a, str(destino)) == 'inalterado'
+    assert colocador.estatisticas()['inalterados'] == 1
+
+    # O arquivo mudou de grupo: a versão antiga sai do destino
+    outro = tmp_path / 'saida' / 'outro'
+    outro.mkdir()
+    assert colocador.colocar(a, str(outro)) == 'copia'
+    assert not (destino / 'a.pdf').exists() and (outro / 'a.pdf').exists()
+
+    # Destino apagado à mão: coloca de novo
+    os.remove(outro / 'a.pdf')
+    manifesto = _manifesto(tmp_path)
+    assert ColocadorIncremental(Colocador('copia'), manifesto).colocar(a, str(outro)) == 'copia'
+
+
+def test_remover_ausentes(tmp_path, entrada):
+    destino = tmp_path / 'saida'
+    destino.mkdir()
+    manifesto = _manifesto(tmp_path)
+    colocador = ColocadorIncremental(Colocador('copia'), manifesto)
+    for nome in ('a.pdf', 'b.pdf'):
+        colocador.colocar(str(entrada / nome), str(destino))
+    fora = tmp_path / 'outra_pasta' / 'c.pdf'  # fora do prefixo
+    fora.parent.mkdir()
+    fora.write_bytes(b'%PDF c')
+    manifesto.atualizar(str(fora), destino=None)
+
+    os.remove(entrada / 'b.pdf')
+    removidos = manifesto.remover_ausentes([str(entrada / 'a.pdf')], prefixo=str(entrada))
+    assert removidos == [str(entrada / 'b.pdf')]
+    assert not (destino / 'b.pdf').exists() and (destino / 'a.pdf').exists()
+    assert str(fora) in manifesto.arquivos
+
+
+def test_destino_compartilhado_so_sai_sem_nenhuma_entrada(tmp_path, entrada):
+    # "VICTA 01.pdf" e "VICTA 12.pdf" viram o mesmo "VICTA.pdf" quando a nomeação tira os números
+    saida = tmp_path / 'saida'
+    saida.mkdir()
+    for nome in ('VICTA 01.pdf', 'VICTA 12.pdf'):
+        (entrada / nome).write_bytes(f'%PDF {nome}'.encode())
+    manifesto = _manifesto(tmp_path)
+    colocador = ColocadorIncremental(Colocador('copia'), manifesto)
+    for nome in ('VICTA 01.pdf', 'VICTA 12.pdf'):
+        colocador.colocar(str(entrada / nome), str(saida / 'VICTA.pdf'))
+
+    os.remove(entrada / 'VICTA 01.pdf')
+    manifesto.remover_ausentes([str(entrada / 'VICTA 12.pdf')], prefixo=str(entrada))
+    assert (saida / 'VICTA.pdf').exists()
+
+    # VICTA 12 muda de grupo: o destino antigo só sai porque ninguém mais aponta para ele
+    outro = saida / 'outro'
+    outro.mkdir()
+    (entrada / 'VICTA 03.pdf').write_bytes(b'%PDF 03')
+    colocador.colocar(str(entrada / 'VICTA 03.pdf'), str(saida / 'VICTA.pdf'))
+    colocador.colocar(str(entrada / 'VICTA 12.pdf'), str(outro / 'VICTA.pdf'))
+    assert (saida / 'VICTA.pdf').read_bytes() == b'%PDF 03'
+    manifesto.remover_ausentes([str(entrada / 'VICTA 12.pdf')], prefixo=str(entrada))
+    assert not (saida / 'VICTA.pdf').exists() and (outro / 'VICTA.pdf').exists()
+
+
+def test_colocacoes_em_paralelo(tmp_path, entrada):
+    saida = tmp_path / 'saida'
+    saida.mkdir()
+    nomes = [f'{i}.pdf' for i in range(200)]
+    for nome in nomes:
+        (entrada / nome).write_bytes(f'%PDF {nome}'.encode())
+    manifesto = _manifesto(tmp_path)
+    colocador = ColocadorIncremental(Colocador('copia'), manifesto)
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda nome: colocador.colocar(str(entrada / nome), str(saida)), nomes))
+    manifesto.salvar()
+    manifesto = _manifesto(tmp_path)
+    assert all(manifesto.registro(str(entrada / nome))['destino'] == str(saida / nome) for nome in nomes)
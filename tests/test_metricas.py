@@ -0,0 +1,40 @@
+import json
+
+from leitor import metricas
+from leitor.metricas import Metricas, finalizar
+
+
+def test_latencia_e_mais_lentos():
+    m = Metricas(limite_lentos=2)
+    for caminho, segundos in (('a.pdf', 0.003), ('b.pdf', 0.2), ('c.pdf', 30.0), ('d.pdf', 0.02)):
+        m.registrar_arquivo(caminho, segundos, tempos=[('texto', segundos / 2)])
+    assert m.arquivos == 4 and sum(m.faixas) == 4 and m.faixas[-1] == 1
+    assert m.mais_lentos() == [(30.0, 'c.pdf'), (0.2, 'b.pdf')]
+    assert m.etapas['extracao']['chamadas'] == 4 and m.etapas['extracao.texto']['chamadas'] == 4
+
+
+def test_exportar_json_e_prometheus(tmp_path):
+    m = Metricas()
+    with m.etapa('listagem'):
+        pass
+    m.contar('erros')
+    m.incorporar('colocacao', {'copia': 3})
+    m.registrar_arquivo('a.pdf', 0.07)
+    dados = json.loads(open(m.exportar(str(tmp_path / 'm.json')), encoding='utf-8').read())
+    assert dados['contadores'] == {'erros': 1, 'colocacao_copia': 3}
+    assert dados['latencia']['faixas']['0.1'] == 1 and dados['etapas']['listagem']['chamadas'] == 1
+    texto = open(m.exportar(str(tmp_path / 'm.prom')), encoding='utf-8').read()
+    assert 'leitor_arquivo_segundos_bucket{le="0.05"} 0' in texto
+    assert 'leitor_arquivo_segundos_bucket{le="+Inf"} 1' in texto
+    assert 'leitor_eventos_total{nome="erros"} 1' in texto
+
+
+def test_finalizar(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(metricas, 'METRICAS', Metricas())
+    metricas.METRICAS.registrar_arquivo('lento.pdf', 2.0)
+    finalizar(lentos=1, arquivo=str(tmp_path / 'saida' / 'm.json'))
+    saida = capsys.readouterr().out
+    assert 'lento.pdf' in saida and 'Métricas gravadas em' in saida
+    assert (tmp_path / 'saida' / 'm.json').exists()
+    finalizar(lentos=0)
+    assert 'gravadas' not in capsys.readouterr().out
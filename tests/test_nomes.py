@@ -0,0 +1,118 @@
+import os
+import random
+import re
+
+import pytest
+
+from leitor import nomes
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# As regras de antes da gramática (Aut.nome_pasta/nome_arquivo e os _extrair_* de OrganizadorDocumentos)
+
+def pasta_antiga(arquivo):
+    return ' '.join(' '.join(arquivo.replace('_', ' ').split('-')[1:-1]).split())
+
+
+def destino_antigo(arquivo):
+    partes = arquivo.split('-')
+    return f'{partes[0]}-{partes[-1]}'
+
+
+def empresa_antiga(arquivo):
+    nome_limpo = re.sub(r'[^a-zA-Z0-9 ]', ' ', os.path.splitext(arquivo)[0])
+    partes = [p for p in nome_limpo.split() if not p.isdigit()]
+    return ' '.join(partes[:2]).strip() if partes else 'OUTROS'
+
+
+def numero_final_antigo(arquivo):
+    numeros = re.findall(r'\d+', arquivo)
+    return numeros[-1] if numeros else '0000'
+
+
+def sem_numeros_antigo(arquivo):
+    return re.sub(r'\d+$', '', os.path.splitext(arquivo)[0]).strip()
+
+
+def _listagem(pasta):
+    caminho = os.path.join(RAIZ, 'CONDOMINIAIS', pasta)
+    return sorted(os.listdir(caminho)) if os.path.isdir(caminho) else []
+
+
+BORDAS = [
+    '', '-', '--', '---', 'a', 'a-b', 'a-b-c', '.pdf', '-.pdf', 'sem traço.pdf', '1234.pdf', '2025.PDF',
+    '17-04-2025 - SINGULAR FACILITIES SERVICE S.A - GIARDINI RESIDENZA - 10240042.pdf',
+    '06-05-2025_-_SINGULAR_FACILITIES_SERVICE_S.A_-_ROOFTOP_CANUTO_1000_-_10325325.pdf',
+    '17-04-2025 - SINGULAR FACILITIES SERVICE S.A - EDIFICIO SÃO-JOSÉ - 10240042.pdf',
+    '17-04-2025 - CEDENTE - SACADO - 123.txt', '17-04-2025 - CEDENTE - SACADO - ABC.pdf',
+    'ASSOCIACAO DUNAS VILLAGE CLUBE-20172.pdf', 'ASSOCIACAO EDUCACIONAL CEARENSE - AEC - 20202.pdf',
+    'ANIMALE COMERCIO & SERVICOS LTDA - 20204.pdf', 'JOSÉ 12ab ab12 - 7.pdf', 'nota 12 - 0034.pdf',
+    'NOME - 20030 .pdf', 'NOME - 20030.pdf.bak', 'NOME_-_20030.pdf', '  NOME  -  20030.pdf', 'NOME -20030',
+]
+
+
+def _aleatorios(quantidade, semente=5):
+    rng = random.Random(semente)
+    alfabeto = 'AB ab0123456789-_.É&'
+    saida = []
+    for _ in range(quantidade):
+        nome = ''.join(rng.choice(alfabeto) for _ in range(rng.randrange(0, 30)))
+        saida.append(nome + rng.choice(['', '.pdf', '.PDF', '.txt']))
+    return saida
+
+
+NOMES = BORDAS + _listagem('BOLETOS') + _listagem('NOTA_FISCAL') + _aleatorios(3000)
+
+
+@pytest.mark.parametrize('arquivo', NOMES[:len(BORDAS)])
+def test_bordas(arquivo):
+    boleto, nota = nomes.nome_boleto(arquivo), nomes.nome_nota(arquivo)
+    assert (boleto.pasta, boleto.destino) == (pasta_antiga(arquivo), destino_antigo(arquivo))
+    assert (nota.empresa, nota.numero_final, nota.sem_numeros) == \
+        (empresa_antiga(arquivo), numero_final_antigo(arquivo), sem_numeros_antigo(arquivo))
+
+
+def test_nomes_derivados_iguais_aos_antigos():
+    assert [(n.pasta, n.destino) for n in nomes.nomes_boletos(NOMES)] == \
+        [(pasta_antiga(a), destino_antigo(a)) for a in NOMES]
+    assert [(n.empresa, n.numero_final, n.sem_numeros) for n in nomes.nomes_notas(NOMES)] == \
+        [(empresa_antiga(a), numero_final_antigo(a), sem_numeros_antigo(a)) for a in NOMES]
+
+
+def test_campos_do_boleto():
+    nome = nomes.nome_boleto('06-05-2025_-_SINGULAR_FACILITIES_SERVICE_S.A_-_ROOFTOP_CANUTO_1000_-_10325325.pdf')
+    assert nome.data == '06-05-2025'
+    assert nome.cedente == 'SINGULAR FACILITIES SERVICE S.A'
+    assert nome.sacado == 'ROOFTOP CANUTO 1000'
+    assert nome.numero == '10325325'
+    # Como sempre, a pasta mantém o mês e o ano, e o destino, o '_' antes do número
+    assert nome.pasta == '05 2025 SINGULAR FACILITIES SERVICE S.A ROOFTOP CANUTO 1000'
+    assert nome.destino == '06-_10325325.pdf'
+
+
+def test_campos_do_boleto_com_traco_no_sacado():
+    nome = nomes.nome_boleto('17-04-2025 - SINGULAR FACILITIES SERVICE S.A - EDIFICIO SÃO-JOSÉ - 10240042.pdf')
+    assert (nome.cedente, nome.sacado, nome.numero) == \
+        ('SINGULAR FACILITIES SERVICE S.A', 'EDIFICIO SÃO-JOSÉ', '10240042')
+
+
+@pytest.mark.parametrize('arquivo', ['sem traço.pdf', '17-04-2025 - CEDENTE - SACADO - ABC.pdf', 'a-b'])
+def test_boleto_fora_da_gramatica(arquivo):
+    nome = nomes.nome_boleto(arquivo)
+    assert (nome.data, nome.cedente, nome.sacado, nome.numero) == (None, None, None, None)
+
+
+def test_campos_da_nota():
+    nome = nomes.nome_nota('ASSOCIACAO EDUCACIONAL CEARENSE - AEC - 20202.pdf')
+    assert (nome.nome, nome.numero) == ('ASSOCIACAO EDUCACIONAL CEARENSE - AEC', '20202')
+    assert nome.empresa == 'ASSOCIACAO EDUCACIONAL'
+    assert nome.sem_numeros == 'ASSOCIACAO EDUCACIONAL CEARENSE - AEC -'
+    assert nomes.nome_nota('ASSOCIACAO DUNAS VILLAGE CLUBE-20172.pdf').numero == '20172'
+    assert nomes.nome_nota('LEIA-ME.txt').numero is None
+
+
+def test_memoizado():
+    arquivo = '17-04-2025 - CEDENTE - SACADO - 99.pdf'
+    assert nomes.nome_boleto(arquivo) is nomes.nome_boleto(arquivo)
+    assert nomes.nomes_notas([arquivo])[0] is nomes.nome_nota(arquivo)
@@ -0,0 +1,22 @@
+import pytest
+
+from leitor.organizadores import OrganizadorDocumentosPorRelacao
+
+
+@pytest.mark.parametrize('modo', ['copia', 'mover'])
+def test_relacao_com_varias_notas(tmp_path, modo, capsys):
+    # Um boleto parecido com duas notas: a pasta do boleto vai para as duas relações
+    boletos, notas, destino = tmp_path / 'BOLETOS', tmp_path / 'NOTA_FISCAL', tmp_path / 'ORGANIZADOS'
+    for pasta, nome in ((boletos, 'SOLAR PALMEIRAS'), (notas, 'SOLAR PALMEIRAS'),
+                        (notas, 'EDIFICIO SOLAR DAS PALMEIRAS')):
+        (pasta / nome).mkdir(parents=True)
+        (pasta / nome / 'doc.pdf').write_bytes(f'%PDF {pasta.name} {nome}'.encode())
+    OrganizadorDocumentosPorRelacao(str(boletos), str(notas), str(destino), modo).organizar()
+    assert 'Erro' not in capsys.readouterr().out
+    relacoes = sorted(p.name for p in destino.iterdir())
+    assert relacoes == ['SOLAR PALMEIRAS_EDIFICIO SOLAR DAS PALMEIRAS', 'SOLAR PALMEIRAS_SOLAR PALMEIRAS']
+    for relacao in relacoes:
+        nota = relacao.split('_', 1)[1]
+        assert (destino / relacao / 'BOLETOS' / 'doc.pdf').read_bytes() == b'%PDF BOLETOS SOLAR PALMEIRAS'
+        assert (destino / relacao / 'NOTAS_FISCAIS' / 'doc.pdf').read_bytes() == f'%PDF NOTA_FISCAL {nota}'.encode()
+    assert (boletos / 'SOLAR PALMEIRAS').exists() == (modo == 'copia')
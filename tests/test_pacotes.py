@@ -0,0 +1,89 @@
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from benchmarks.corpus import pdf_texto
+from leitor import pacotes
+
+PDF_A = pdf_texto(['documento A', '16.707.848/0001-95'])
+PDF_B = pdf_texto(['documento B'] * 50)
+
+
+def _tar(caminho, membros, modo):
+    with tarfile.open(caminho, modo) as tar:
+        for nome, dados in membros.items():
+            info = tarfile.TarInfo(nome)
+            info.size = len(dados)
+            tar.addfile(info, io.BytesIO(dados))
+
+
+@pytest.fixture
+def pasta(tmp_path):
+    (tmp_path / 'solto.pdf').write_bytes(PDF_A)
+    (tmp_path / 'leia.txt').write_text('não é PDF')
+    with zipfile.ZipFile(tmp_path / 'lote.zip', 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('x/a.pdf', PDF_A)
+        z.writestr('x/y/b.PDF', PDF_B)
+        z.writestr('x/notas.txt', 'ignorado')
+        z.writestr('../fora.pdf', PDF_A)
+    _tar(tmp_path / 'notas.tar.gz', {'x/y/c.pdf': PDF_B, 'd.pdf': PDF_A, '/absoluto.pdf': PDF_A}, 'w:gz')
+    (tmp_path / 'quebrado.zip').write_bytes(b'PK nada')
+    return tmp_path
+
+
+def test_listar_pdfs(pasta, capsys):
+    encontrados = dict(pacotes.listar_pdfs(str(pasta)))
+    zip_, tar = str(pasta / 'lote.zip'), str(pasta / 'notas.tar.gz')
+    assert encontrados == {
+        'solto.pdf': str(pasta / 'solto.pdf'),
+        'a.pdf': f'{zip_}::x/a.pdf',
+        'b.PDF': f'{zip_}::x/y/b.PDF',
+        'c.pdf': f'{tar}::x/y/c.pdf',
+        'd.pdf': f'{tar}::d.pdf',
+    }
+    assert 'quebrado.zip' in capsys.readouterr().out
+
+
+def test_listar_com_e_sem_filtro(pasta):
+    nomes = [nome for nome, _ in pacotes.listar(str(pasta))]
+    assert 'leia.txt' in nomes and 'a.pdf' in nomes
+    nomes = [nome for nome, _ in pacotes.listar(str(pasta), lambda nome: nome.endswith('.txt'))]
+    assert 'solto.pdf' not in nomes and 'leia.txt' in nomes and 'c.pdf' in nomes
+
+
+@pytest.mark.parametrize('membro, dados', [('lote.zip::x/a.pdf', PDF_A), ('lote.zip::x/y/b.PDF', PDF_B),
+                                           ('notas.tar.gz::x/y/c.pdf', PDF_B), ('solto.pdf', PDF_A)])
+def test_abrir_tamanho_existe(pasta, membro, dados):
+    caminho = str(pasta / membro)
+    with pacotes.abrir(caminho) as f:
+        assert f.read() == dados
+    assert pacotes.tamanho(caminho) == len(dados)
+    assert pacotes.existe(caminho)
+    assert pacotes.estado(caminho)[0] == len(dados)
+
+
+def test_membro_ausente(pasta):
+    caminho = f"{pasta / 'lote.zip'}::x/nao.pdf"
+    assert not pacotes.existe(caminho)
+    assert not pacotes.existe(f"{pasta / 'nao.zip'}::a.pdf")
+    with pytest.raises(FileNotFoundError):
+        pacotes.tamanho(caminho)
+    assert not pacotes.existe(f"{pasta / 'lote.zip'}::../fora.pdf")
+
+
+def test_pacote_alterado_e_reaberto(pasta):
+    zip_ = pasta / 'lote.zip'
+    assert pacotes.tamanho(f'{zip_}::x/a.pdf') == len(PDF_A)
+    with zipfile.ZipFile(zip_, 'w') as z:
+        z.writestr('x/a.pdf', PDF_B)
+    os.utime(zip_, ns=(0, os.stat(zip_).st_mtime_ns + 10 ** 9))
+    assert pacotes.tamanho(f'{zip_}::x/a.pdf') == len(PDF_B)
+
+
+def test_separar_e_eh_pacote():
+    assert pacotes.separar('pasta/a.pdf') is None
+    assert pacotes.separar('p.zip::x\\a.pdf') == ('p.zip', 'x/a.pdf')
+    assert pacotes.eh_pacote('A.TGZ') and pacotes.eh_pacote('b.tar.xz') and not pacotes.eh_pacote('c.pdf')
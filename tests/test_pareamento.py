@@ -0,0 +1,63 @@
+import os
+from datetime import date
+
+from leitor.boleto import montar_linha
+from leitor.documentos import STATUS_OK, Documento
+from leitor.pareamento import parear, valor_em_centavos
+
+PRESTADOR = '16.707.848/0001-95'
+TOMADOR_A = '49.865.378/0001-47'
+TOMADOR_B = '36.108.122/0001-43'
+DV_ERRADO = '36.108.122/0001-44'
+VENCIMENTO = date(2025, 5, 6)
+
+
+def _doc(nome, *cnpjs, pasta='BOLETOS', valores=(), linhas=()):
+    return Documento(os.path.join(pasta, nome), nome, 100, tuple(cnpjs), STATUS_OK,
+                     valores=tuple(valores), linhas_digitaveis=tuple(linhas))
+
+
+def _boleto(nome, tomador, centavos, campo_livre='0001015000001139081100720'):
+    linha = montar_linha('274', centavos, VENCIMENTO, campo_livre)
+    return _doc(nome, PRESTADOR, tomador, linhas=['00000.00000 00000.000000 00000.000000 0 00000000000000', linha])
+
+
+def _nf(nome, tomador, *valores):
+    return _doc(nome, PRESTADOR, tomador, pasta='NOTA_FISCAL', valores=valores)
+
+
+def test_parear():
+    boletos = [
+        _boleto('par.pdf', TOMADOR_A, 3801141),
+        _boleto('sem_nf.pdf', TOMADOR_A, 100),
+        _boleto('dv_errado.pdf', DV_ERRADO, 2206305),
+        _doc('sem_linha.pdf', PRESTADOR, TOMADOR_B),
+        _boleto('ambiguo.pdf', TOMADOR_B, 5000),
+    ]
+    nfs = [
+        _nf('a.pdf', TOMADOR_A, '38.011,41', '38.011,41', '1.000,00'),
+        _nf('dv_errado.pdf', DV_ERRADO, '22.063,05'),
+        _nf('b1.pdf', TOMADOR_B, '50,00'),
+        _nf('b2.pdf', TOMADOR_B, '50,00'),
+    ]
+    resultado = parear(boletos, nfs, referencia=VENCIMENTO)
+    assert [(par.boleto, par.nf, par.cnpj, par.valor_centavos, par.vencimento) for par in resultado.pares] == \
+        [('par.pdf', 'a.pdf', TOMADOR_A, 3801141, VENCIMENTO)]
+    assert resultado.ambiguos == ['ambiguo.pdf']
+    assert resultado.boletos_sem_nf == ['sem_nf.pdf', 'dv_errado.pdf', 'sem_linha.pdf']
+    assert resultado.nfs_sem_boleto == ['dv_errado.pdf', 'b1.pdf', 'b2.pdf']
+
+
+def test_nf_disputada_por_boletos_diferentes():
+    boletos = [_boleto('1.pdf', TOMADOR_A, 3801141), _boleto('2.pdf', TOMADOR_A, 3801141, '9' * 25),
+               _boleto('copia.pdf', TOMADOR_B, 100), _boleto('copia_2.pdf', TOMADOR_B, 100)]
+    nfs = [_nf('a.pdf', TOMADOR_A, '38.011,41'), _nf('b.pdf', TOMADOR_B, '1,00')]
+    resultado = parear(boletos, nfs, referencia=VENCIMENTO)
+    assert resultado.ambiguos == ['1.pdf', '2.pdf']
+    # Cópias do mesmo boleto (mesmo código de barras) não disputam a NF
+    assert [(par.boleto, par.nf) for par in resultado.pares] == [('copia.pdf', 'b.pdf'), ('copia_2.pdf', 'b.pdf')]
+
+
+def test_valor_em_centavos():
+    assert valor_em_centavos('41.200,22') == 4120022
+    assert valor_em_centavos('0,50') == 50
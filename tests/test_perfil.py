@@ -0,0 +1,43 @@
+import pstats
+import threading
+import time
+
+from leitor.perfil import Perfilador
+
+
+def _ocupar(segundos):
+    fim = time.perf_counter() + segundos
+    while time.perf_counter() < fim:
+        sum(range(1000))
+
+
+def _trabalho_da_thread():
+    _ocupar(0.15)
+
+
+def test_perfil_inclui_as_outras_threads(tmp_path, capsys):
+    prefixo = str(tmp_path / 'perfis' / 'perfil')
+    with Perfilador(prefixo, intervalo=0.002, alocacoes=None) as perfilador:
+        thread = threading.Thread(target=_trabalho_da_thread, name='trabalhador-teste')
+        thread.start()
+        _ocupar(0.05)
+        thread.join()
+
+    assert perfilador.arquivos == [f'{prefixo}.pstats', f'{prefixo}.collapsed']
+    funcoes = {funcao for _, _, funcao in pstats.Stats(f'{prefixo}.pstats').stats}
+    assert {'_trabalho_da_thread', '_ocupar'} <= funcoes
+    pilhas = open(f'{prefixo}.collapsed', encoding='utf-8').read().splitlines()
+    assert any(p.startswith('thread trabalhador-teste;') and '_trabalho_da_thread' in p for p in pilhas)
+    assert any(p.startswith('thread MainThread;') for p in pilhas)
+    assert not any('amostrador-perfil' in p for p in pilhas)
+    assert 'Perfil gravado em' in capsys.readouterr().out
+    assert threading.getprofile() is None
+
+
+def test_alocacoes(tmp_path, capsys):
+    prefixo = str(tmp_path / 'perfil')
+    with Perfilador(prefixo, alocacoes=5):
+        dados = [bytes(1000) for _ in range(1000)]
+    assert len(dados) == 1000
+    relatorio = open(f'{prefixo}.alocacoes.txt', encoding='utf-8').read()
+    assert relatorio.startswith('Memória rastreada') and 'test_perfil.py' in relatorio
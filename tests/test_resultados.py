@@ -0,0 +1,113 @@
+import csv
+import json
+import os
+import shutil
+
+import pytest
+
+from leitor import resultados as res
+from leitor.colocacao import Colocador
+from leitor.empacotamento import ColocadorPacotes
+
+A, B = '49865378000147', '36108122000143'
+BOLETO_A = '01-04-2025 - SINGULAR FACILITIES SERVICE S.A - SOLAR - 101.pdf'
+BOLETO_C = '01-04-2025 - SINGULAR FACILITIES SERVICE S.A - DUNAS - 102.pdf'
+
+# O que o corpus da conftest deve produzir
+PASTAS = [
+    [A, res.CNPJ, '1', '2', '0'],
+    [f'NF_{B}', res.APENAS_NF, '0', '1', '0'],
+    ['NFs_SEM_CNPJ_IDENTIFICADO', res.SEM_CNPJ, '0', '2', '0'],
+]
+PENDENCIAS = [
+    ['boleto', BOLETO_C, res.BOLETO_SEM_NF],
+    ['colocacao', 'MARINO - 3.pdf', res.FALHA_COLOCACAO],
+    ['nf', 'TORRE - 4.pdf', res.CNPJ_INVALIDO],
+    ['nf', 'VILLA - 5.pdf', res.SEM_SEGUNDO_CNPJ],
+]
+
+
+def _ler_csv(caminho):
+    with open(caminho, encoding='utf-8') as f:
+        return list(csv.reader(f, delimiter=';'))
+
+
+def _conferir(saida):
+    relatorio = _ler_csv(saida / 'relatorio.csv')
+    assert relatorio[0] == ['pasta', 'categoria', 'boletos', 'nfs', 'avulsos']
+    assert relatorio[1:] == sorted(PASTAS)
+    pendencias = _ler_csv(saida / 'pendencias.csv')
+    assert pendencias[0] == ['tipo', 'arquivo', 'motivo'] and sorted(pendencias[1:]) == PENDENCIAS
+    with open(saida / 'relatorio.json', encoding='utf-8') as f:
+        dados = json.load(f)
+    assert dados['totais'] == {
+        'pastas_cnpj': 1, 'pastas_apenas_nf': 1, 'pastas_sem_cnpj': 1, 'boletos': 1, 'nfs': 5,
+        'pendencias_boleto_sem_nf': 1, 'pendencias_falha_colocacao': 1, 'pendencias_cnpj_invalido': 1,
+        'pendencias_sem_segundo_cnpj': 1}
+    assert [[p['pasta'], p['categoria'], str(p['boletos']), str(p['nfs']), str(p['avulsos'])]
+            for p in dados['pastas']] == sorted(PASTAS)
+    assert sorted([p['tipo'], p['arquivo'], p['motivo']] for p in dados['pendencias']) == PENDENCIAS
+    assert 'metricas' in dados
+
+
+def test_resultados():
+    relatorio = res.Resultados()
+    relatorio.colocado(A, res.CNPJ, 'boletos', 2)
+    relatorio.colocado(A, res.CNPJ, 'nfs')
+    relatorio.colocado(A, res.CNPJ, 'nfs')
+    relatorio.colocado('SEM_TERCER_CNPJ', res.TERCEIRO_CNPJ, 'avulsos')
+    relatorio.pendente('avulso', 'x.pdf', res.SEM_TERCEIRO_CNPJ)
+    relatorio.pendente('nf', 'y.pdf', res.ERRO_LEITURA)
+    assert relatorio.totais() == {'pastas_cnpj': 1, 'pastas_terceiro_cnpj': 1, 'boletos': 2, 'nfs': 2,
+                                  'avulsos': 1, 'pendencias_sem_terceiro_cnpj': 1, 'pendencias_erro_leitura': 1}
+    dados = relatorio.para_dict()
+    assert 'metricas' not in dados
+    assert dados['pastas'][0] == {'pasta': A, 'categoria': res.CNPJ, 'boletos': 2, 'nfs': 2, 'avulsos': 0}
+
+
+class _ColocadorFalho(Colocador):
+    """Não consegue gravar a NF do CNPJ B (erro permanente, sem novas tentativas)"""
+
+    def colocar(self, origem, destino):
+        if os.path.basename(origem) == 'MARINO - 3.pdf':
+            raise PermissionError(13, 'sem permissão', destino)
+        return super().colocar(origem, destino)
+
+
+def test_relatorio_da_execucao(condominiais, corpus, monkeypatch):
+    monkeypatch.setattr(condominiais, '__file__', str(corpus / 'main.py'))
+    monkeypatch.setattr(condominiais, 'Colocador', _ColocadorFalho)
+    condominiais.main(['--sem-cache'])
+    saida = corpus / 'ORGANIZADOS'
+    _conferir(saida)
+    assert sorted(os.listdir(saida / A)) == sorted([BOLETO_A, 'SOLAR - 1.pdf', 'SOLAR - 2.pdf'])
+    assert not os.listdir(saida / f'NF_{B}')
+
+
+def test_relatorio_da_fila_compartilhada(condominiais, corpus, tmp_path, monkeypatch):
+    # Na junção da fila a falha vem do pacote: o pacote NF_<B> é descartado
+    adicionar = ColocadorPacotes._adicionar
+
+    def adicionar_com_falha(self, pacote, nome, origem):
+        if nome == 'MARINO - 3.pdf':
+            raise OSError('erro de leitura')
+        return adicionar(self, pacote, nome, origem)
+
+    monkeypatch.setattr(ColocadorPacotes, '_adicionar', adicionar_com_falha)
+    monkeypatch.setattr(condominiais, '__file__', str(corpus / 'main.py'))
+    condominiais.main(['--sem-cache', '--fila', str(tmp_path / 'fila'), '--lote', '2', '--pacotes', 'zip'])
+    saida = corpus / 'ORGANIZADOS'
+    _conferir(saida)
+    assert sorted(os.listdir(saida)) == sorted([f'{A}.zip', 'NFs_SEM_CNPJ_IDENTIFICADO.zip', 'pendencias.csv',
+                                                'relatorio.csv', 'relatorio.json'])
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_fila_e_execucao_dao_o_mesmo_relatorio(condominiais, corpus, tmp_path, monkeypatch, workers):
+    monkeypatch.setattr(condominiais, '__file__', str(corpus / 'main.py'))
+    condominiais.main(['--sem-cache', '--workers', str(workers)])
+    saida = corpus / 'ORGANIZADOS'
+    esperados = [_ler_csv(saida / 'relatorio.csv'), sorted(_ler_csv(saida / 'pendencias.csv'))]
+    shutil.rmtree(saida)
+    condominiais.main(['--sem-cache', '--workers', str(workers), '--fila', str(tmp_path / 'fila')])
+    assert [_ler_csv(saida / 'relatorio.csv'), sorted(_ler_csv(saida / 'pendencias.csv'))] == esperados
@@ -0,0 +1,86 @@
+import difflib
+import random
+import re
+import string
+
+import pytest
+
+from leitor import semelhanca
+from leitor.semelhanca import IndiceNomes, normalizar, relacionar
+
+NOMES = [
+    'CONDOMINIO RESIDENCIAL AQUARIUS',
+    'Cond. Residencial Aquarius',
+    'EDIFICIO SOLAR DAS PALMEIRAS',
+    'SOLAR PALMEIRAS',
+    'ASSOCIACAO DOS MORADORES',
+    'Singular Servicos',
+    'SINGULAR',
+]
+
+
+def _antiga(nome, outros, limiar=0.6):
+    """A regra de antes do índice: contido ou SequenceMatcher.ratio() acima do limiar"""
+    def norm(texto):
+        return re.sub(r'[^a-zA-Z0-9]', '', texto).lower()
+
+    alvo = norm(nome)
+    aceitos = set()
+    for i, outro in enumerate(outros):
+        n = norm(outro)
+        if alvo in n or n in alvo or difflib.SequenceMatcher(None, alvo, n).ratio() > limiar:
+            aceitos.add(i)
+    return aceitos
+
+
+def _aleatorios(quantidade, semente):
+    sorteio = random.Random(semente)
+    base = ['condominio', 'residencial', 'edificio', 'solar', 'jardim', 'aquarius', 'palmeiras', 'torre']
+    return [' '.join(sorteio.sample(base, sorteio.randint(1, 3))) + ' ' +
+            ''.join(sorteio.choices(string.ascii_uppercase, k=sorteio.randint(0, 3)))
+            for _ in range(quantidade)]
+
+
+@pytest.mark.parametrize('com_numpy', [False, True])
+def test_compativel_igual_a_regra_antiga(com_numpy, monkeypatch):
+    if com_numpy:
+        pytest.importorskip('numpy')
+        monkeypatch.setattr(semelhanca, 'MINIMO_NUMPY', 0)
+    else:
+        monkeypatch.setattr(semelhanca, '_numpy', lambda quantidade: None)
+    outros = NOMES + _aleatorios(250, 1)
+    indice = IndiceNomes(outros)
+    for nome in NOMES + _aleatorios(30, 2):
+        candidatos = indice.compativeis(nome)
+        assert {c.indice for c in candidatos} == _antiga(nome, outros), nome
+        assert [c.pontuacao for c in candidatos] == sorted((c.pontuacao for c in candidatos), reverse=True)
+
+
+def test_contido_vale_um():
+    (primeiro, *_) = IndiceNomes(NOMES).compativeis('singular')
+    assert primeiro.pontuacao == 1.0 and normalizar(primeiro.nome).startswith('singular')
+
+
+@pytest.mark.parametrize('com_numpy', [False, True])
+def test_ngramas(com_numpy, monkeypatch):
+    if com_numpy:
+        pytest.importorskip('numpy')
+        monkeypatch.setattr(semelhanca, 'MINIMO_NUMPY', 0)
+    else:
+        monkeypatch.setattr(semelhanca, '_numpy', lambda quantidade: None)
+    indice = IndiceNomes(NOMES)
+    melhores = indice.semelhantes('condominio aquarius', k=2)
+    assert len(melhores) <= 2
+    assert melhores[0].nome == 'CONDOMINIO RESIDENCIAL AQUARIUS'
+    assert all(0 < c.pontuacao <= 1.0 for c in melhores)
+    assert indice.semelhantes('qqqqzzzz') == []
+    assert indice.semelhantes(NOMES[2], k=1)[0].pontuacao == pytest.approx(1.0)
+
+
+def test_relacionar():
+    resultado = relacionar(['SOLAR DAS PALMEIRAS'], NOMES)
+    assert [c.nome for c in resultado['SOLAR DAS PALMEIRAS']][:2] == ['EDIFICIO SOLAR DAS PALMEIRAS', 'SOLAR PALMEIRAS']
+    assert len(relacionar(['SINGULAR'], NOMES, k=1)['SINGULAR']) == 1
+    assert relacionar(['SINGULAR'], NOMES, modo='ngramas', k=3)['SINGULAR'][0].nome == 'SINGULAR'
+    with pytest.raises(ValueError, match='inválido'):
+        relacionar(['x'], NOMES, modo='fonetico')